@@ -0,0 +1,36 @@
+"""AircraftDatabase.batch_lookup_aircraft against the memory-mapped registry"""
+import pytest
+
+from src.services.aircraft_db import AircraftDatabase
+from src.services.aircraft_registry import AircraftRegistry
+from synthetic import hex_codes
+
+
+@pytest.fixture(scope="module")
+def aircraft_db(registry_path):
+    db = AircraftDatabase(redis_service=None, cache_config={'cache_size': 100000})
+    db.registry = AircraftRegistry(registry_path)
+    db.aircraft_db = None
+    return db
+
+
+def bench_batch_lookup_cold(benchmark, aircraft_db, aircraft_count):
+    """Every hex misses the LRU cache and is resolved from the registry"""
+    codes = hex_codes(aircraft_count)
+
+    def setup():
+        aircraft_db.aircraft_cache.entries.clear()
+        return (codes,), {}
+
+    results = benchmark.pedantic(aircraft_db.batch_lookup_aircraft, setup=setup, rounds=10)
+    assert results[codes[0]]['registration']
+
+
+def bench_batch_lookup_cached(benchmark, aircraft_db, aircraft_count):
+    """Steady state: every hex is already in the LRU cache"""
+    codes = hex_codes(aircraft_count)
+    aircraft_db.aircraft_cache.entries.clear()
+    aircraft_db.batch_lookup_aircraft(codes)
+
+    results = benchmark(aircraft_db.batch_lookup_aircraft, codes)
+    assert results[codes[0]]['registration']
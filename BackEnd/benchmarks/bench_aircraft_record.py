@@ -0,0 +1,45 @@
+"""Pydantic Aircraft model vs AircraftRecord on the collection hot path
+
+Each round builds one cycle of aircraft from collector rows and serializes
+it; the memory retained by the built objects is recorded in extra_info.
+"""
+import dataclasses
+import tracemalloc
+
+import pytest
+
+from src.models.aircraft import Aircraft, AircraftRecord
+from synthetic import aircraft_records
+
+
+def model_dump(aircraft: Aircraft) -> dict:
+    return aircraft.model_dump()
+
+
+def record_to_dict(record: AircraftRecord) -> dict:
+    return record.to_dict()
+
+
+def retained_kib(build, rows) -> float:
+    """Memory held by one cycle of built objects"""
+    tracemalloc.start()
+    objects = [build(**row) for row in rows]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return round(retained / 1024, 1)
+
+
+@pytest.mark.parametrize("build,serialize", [
+    (Aircraft, model_dump),
+    (AircraftRecord, record_to_dict),
+], ids=["pydantic", "record"])
+def bench_build_and_serialize(benchmark, aircraft_count, build, serialize):
+    rows = [dataclasses.asdict(record) for record in aircraft_records(aircraft_count)]
+
+    def cycle():
+        return [serialize(build(**row)) for row in rows]
+
+    serialized = benchmark.pedantic(cycle, rounds=5, warmup_rounds=1)
+    assert len(serialized) == aircraft_count
+    benchmark.extra_info['retained_kib'] = retained_kib(build, rows)
@@ -0,0 +1,55 @@
+"""DataBlender: blending collector batches and helicopter identification"""
+import itertools
+import time
+
+import pytest
+
+from src.services.blender import DataBlender
+from src.models.aircraft_batch import AircraftBatch
+from synthetic import aircraft_records, dump1090_response, opensky_response
+
+_regions = itertools.count()
+
+
+@pytest.fixture(scope="module")
+def blender():
+    return DataBlender([], redis_service=None)
+
+
+def _batches(aircraft_count: int, now: float):
+    dump1090 = AircraftBatch.from_dump1090(dump1090_response(aircraft_count, now=now)['aircraft'], now)
+    opensky = AircraftBatch.from_opensky(opensky_response(aircraft_count // 2, now=now)['states'], now)
+    return dump1090, opensky
+
+
+def bench_blend_cold(benchmark, blender, aircraft_count):
+    """First cycle of a region: every aircraft is new"""
+    now = time.time()
+    dump1090, opensky = _batches(aircraft_count, now)
+
+    def setup():
+        return ([], dump1090, opensky), {'region': f"cold-{next(_regions)}", 'now': now}
+
+    blended = benchmark.pedantic(blender.blend_aircraft_data, setup=setup, rounds=5)
+    assert len(blended) >= aircraft_count
+
+
+def bench_blend_steady(benchmark, blender, aircraft_count):
+    """Later cycle: every aircraft reports a newer message and is merged"""
+    region = f"steady-{next(_regions)}"
+    start = time.time()
+    blender.blend_aircraft_data([], *_batches(aircraft_count, start), region=region, now=start)
+    cycles = itertools.count(1)
+
+    def setup():
+        now = start + next(cycles)
+        return ([], *_batches(aircraft_count, now)), {'region': region, 'now': now}
+
+    blended = benchmark.pedantic(blender.blend_aircraft_data, setup=setup, rounds=5)
+    assert len(blended) >= aircraft_count
+
+
+def bench_identify_helicopters(benchmark, blender, aircraft_count):
+    records = aircraft_records(aircraft_count)
+    helicopters = benchmark(blender.identify_helicopters, records)
+    assert 0 < len(helicopters) < aircraft_count
@@ -0,0 +1,41 @@
+"""Collector conversion: raw upstream JSON -> distance-filtered, sorted AircraftBatch"""
+import pytest
+
+from src.collectors.dump1090 import Dump1090Collector
+from src.collectors.http_client import HttpClientManager
+from src.collectors.opensky import OpenSkyCollector
+from synthetic import CENTER_LAT, CENTER_LON, dump1090_response, opensky_response
+
+REGION = {"center": {"lat": CENTER_LAT, "lon": CENTER_LON}, "radius_miles": 150}
+
+
+@pytest.fixture(scope="module")
+def dump1090_collector():
+    return Dump1090Collector({"type": "dump1090", "url": "http://localhost:8080"}, REGION, HttpClientManager())
+
+
+@pytest.fixture(scope="module")
+def opensky_collector():
+    return OpenSkyCollector({"type": "opensky", "url": "https://opensky-network.org/api/states/all"}, REGION,
+                            HttpClientManager())
+
+
+def bench_dump1090_convert(benchmark, dump1090_collector, aircraft_count):
+    data = dump1090_response(aircraft_count)
+
+    def convert():
+        return dump1090_collector.add_distance_and_filter(dump1090_collector._convert_dump1090_data(data))
+
+    batch = benchmark(convert)
+    assert 0 < len(batch) <= aircraft_count
+
+
+def bench_opensky_convert(benchmark, opensky_collector, aircraft_count):
+    data = opensky_response(aircraft_count)
+
+    def convert():
+        return opensky_collector.add_distance_and_filter(opensky_collector._convert_opensky_data(data),
+                                                         filter_radius=False)
+
+    batch = benchmark(convert)
+    assert len(batch) == aircraft_count
@@ -0,0 +1,111 @@
+"""SecurityMiddleware rate limiting: token bucket vs. the old per-IP timestamp lists
+
+Each round replays one second of traffic at 10k req/s (virtual clock) spread
+over a fixed set of client IPs, against a warmed-up limiter. The Redis-backed
+limiter runs against fakeredis, or a real Redis via BENCH_REDIS_URL.
+"""
+import asyncio
+import os
+import random
+import time
+from collections import defaultdict
+
+import fakeredis
+import pytest
+import redis.asyncio as redis_async
+
+from src.middleware.rate_limiter import RedisRateLimiter, TokenBucketLimiter
+
+REQUESTS_PER_SECOND = 10000
+RATE_LIMIT = 1000
+WINDOW = 60
+WARMUP_SECONDS = 6
+
+
+class TimestampListLimiter:
+    """Reference copy of the list-per-IP limiter SecurityMiddleware used before"""
+
+    def __init__(self, window: float = WINDOW):
+        self.window = window
+        self.request_counts = defaultdict(list)
+
+    def check(self, key: str, limit: int, now: float):
+        self.request_counts[key] = [t for t in self.request_counts[key] if now - t < self.window]
+        if len(self.request_counts[key]) >= limit:
+            return False
+        self.request_counts[key].append(now)
+        # _add_rate_limit_headers rescanned the list for X-RateLimit-Remaining
+        remaining = limit - len([t for t in self.request_counts[key] if now - t < self.window])
+        return remaining >= 0
+
+
+def traffic(client_count: int, seed: int = 42):
+    """One second of (client_ip, offset) pairs at REQUESTS_PER_SECOND"""
+    rng = random.Random(seed)
+    ips = [f"203.0.{i // 256}.{i % 256}" for i in range(client_count)]
+    return [(rng.choice(ips), i / REQUESTS_PER_SECOND) for i in range(REQUESTS_PER_SECOND)]
+
+
+def replay(limiter, requests, start: float):
+    for ip, offset in requests:
+        limiter.check(ip, RATE_LIMIT, start + offset)
+
+
+@pytest.mark.parametrize("client_count", [10, 100, 10000], ids=lambda count: f"clients={count}")
+@pytest.mark.parametrize("limiter_cls", [TokenBucketLimiter, TimestampListLimiter],
+                         ids=["token_bucket", "timestamp_lists"])
+def bench_rate_limit_10k_rps(benchmark, limiter_cls, client_count):
+    requests = traffic(client_count)
+    limiter = limiter_cls(WINDOW)
+    for second in range(WARMUP_SECONDS):
+        replay(limiter, requests, float(second))
+
+    clock = iter(range(WARMUP_SECONDS, 10 ** 6))
+    benchmark.pedantic(lambda: replay(limiter, requests, float(next(clock))), rounds=5, iterations=1)
+    benchmark.extra_info['requests_per_round'] = REQUESTS_PER_SECOND
+
+
+def bench_idle_client_eviction(benchmark):
+    """100k one-off clients: the bucket limiter's memory stays bounded by the window"""
+    requests = [(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", i / REQUESTS_PER_SECOND) for i in range(100000)]
+
+    def run():
+        limiter = TokenBucketLimiter(WINDOW)
+        replay(limiter, requests, 0.0)
+        # Everything is idle a window later; the next request sweeps them out
+        limiter.check("198.51.100.1", RATE_LIMIT, WINDOW + 10.0)
+        return limiter
+
+    limiter = benchmark.pedantic(run, rounds=3, iterations=1)
+    assert limiter.get_stats()['tracked_clients'] == 1
+
+
+class _RedisHandle:
+    """Stands in for RedisService: the limiter only needs async_client"""
+
+    def __init__(self):
+        url = os.getenv("BENCH_REDIS_URL")
+        self.async_client = (redis_async.Redis.from_url(url, decode_responses=True) if url
+                             else fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+@pytest.mark.parametrize("client_count", [10, 1000], ids=lambda count: f"clients={count}")
+def bench_redis_limiter_latency(benchmark, client_count):
+    """Per-request cost of the shared limiter, p50/p99 recorded in extra_info"""
+    requests = traffic(client_count)[:2000]
+    latencies = []
+
+    async def run():
+        limiter = RedisRateLimiter(_RedisHandle(), {'key_prefix': f"bench:{time.time()}:"})
+        for ip, _ in requests:
+            start = time.perf_counter()
+            await limiter.acheck(ip, RATE_LIMIT, WINDOW)
+            latencies.append(time.perf_counter() - start)
+        return limiter
+
+    limiter = benchmark.pedantic(lambda: asyncio.run(run()), rounds=3, iterations=1)
+    latencies.sort()
+    benchmark.extra_info['p50_ms'] = round(latencies[len(latencies) // 2] * 1000, 4)
+    benchmark.extra_info['p99_ms'] = round(latencies[int(len(latencies) * 0.99)] * 1000, 4)
+    benchmark.extra_info.update(limiter.get_stats())
+    assert limiter.get_stats()['fallbacks'] == 0
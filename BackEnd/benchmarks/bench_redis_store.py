@@ -0,0 +1,77 @@
+"""RedisService.store_region_data against fakeredis (or a real Redis via BENCH_REDIS_URL)
+
+BENCH_REDIS_URL must name a dedicated, empty database (e.g. redis://localhost:6379/15);
+the benchmark refuses to run on a database that already holds keys and afterwards
+deletes only the keys it wrote.
+"""
+import dataclasses
+import itertools
+import os
+
+import pytest
+
+from src.services.redis_service import RedisService
+from src.services.replay_engine import FakeRedisService
+from synthetic import aircraft_records
+
+REGION = "bench"
+LOCATION = {'name': "Benchmark", 'lat': 32.35, 'lon': -95.30}
+# Everything store_region_data writes for REGION
+WRITTEN_KEYS = (f"{REGION}:*", "aircraft_live:*", f"track:{REGION}:*")
+
+
+@pytest.fixture
+def service_factory():
+    services = []
+
+    def create(storage_mode: str, snapshot_codec: str = "json") -> RedisService:
+        options = dict(storage_mode=storage_mode, snapshot_codec=snapshot_codec, track_config={'enabled': False})
+        url = os.getenv("BENCH_REDIS_URL")
+        if not url:
+            return FakeRedisService(**options)
+
+        service = RedisService(redis_url=url, **options)
+        if service.redis_client is None:
+            pytest.fail(f"Could not connect to BENCH_REDIS_URL {url}")
+        if service.redis_client.dbsize():
+            pytest.fail(f"BENCH_REDIS_URL {url} is not empty - point it at a dedicated database")
+        services.append(service)
+        return service
+
+    yield create
+
+    for service in services:
+        for pattern in WRITTEN_KEYS:
+            keys = list(service.redis_client.scan_iter(match=pattern, count=1000))
+            if keys:
+                service.redis_client.unlink(*keys)
+
+
+def moved(records, cycle: int):
+    """Copies of records that moved since the previous cycle, as live aircraft do"""
+    step = cycle * 0.001
+    return [dataclasses.replace(record, lat=record.lat + step, lon=record.lon + step) for record in records]
+
+
+@pytest.mark.parametrize("storage_mode,snapshot_codec", [
+    ("snapshot", "json"),
+    ("snapshot", "json-zlib"),
+    ("snapshot", "msgpack"),
+    ("snapshot", "msgpack-zstd"),
+    ("delta", "json"),
+])
+def bench_store_region_data(benchmark, service_factory, aircraft_count, storage_mode, snapshot_codec):
+    service = service_factory(storage_mode, snapshot_codec)
+    records = aircraft_records(aircraft_count)
+    helicopters = [record for record in records if record.icao_aircraft_class.startswith('H')]
+    cycles = itertools.count(1)
+
+    def setup():
+        # Delta mode only writes changed aircraft, so every round gets new positions
+        cycle_records = moved(records, next(cycles))
+        cycle_helicopters = [record for record in cycle_records if record.icao_aircraft_class.startswith('H')]
+        return (REGION, cycle_records, cycle_helicopters, LOCATION), {}
+
+    stored = benchmark.pedantic(service.store_region_data, setup=setup, rounds=5, warmup_rounds=1)
+    assert stored['aircraft_count'] == aircraft_count
+    assert service.get_region_data(REGION, "choppers")['aircraft_count'] == len(helicopters)
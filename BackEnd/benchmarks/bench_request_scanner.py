@@ -0,0 +1,70 @@
+"""Suspicious request detection: single-pass RequestScanner vs. the old per-pattern loops
+
+Each round scans a batch of realistic (clean) API requests plus a few probes,
+with the shipped signatures and with a large synthetic signature list.
+"""
+import random
+
+import pytest
+
+from src.middleware.request_scanner import DEFAULT_RULES, RequestScanner
+
+BATCH = 5000
+SCANNERS = ["nikto", "sqlmap", "nmap", "masscan"]
+
+
+def legacy_is_suspicious(patterns, path: str, query: str, user_agent: str):
+    """Reference copy of the check SecurityMiddleware used before"""
+    path = path.lower()
+    query = query.lower()
+    for pattern in patterns:
+        if pattern in path or pattern in query:
+            return f"Suspicious pattern detected: {pattern}"
+    user_agent = user_agent.lower()
+    if any(scanner in user_agent for scanner in SCANNERS):
+        return f"Vulnerability scanner detected: {user_agent}"
+    return None
+
+
+def synthetic_rules(count: int, seed: int = 3):
+    """The shipped signatures plus `count` random path signatures"""
+    rng = random.Random(seed)
+    words = {f"/{''.join(rng.choice('abcdefghijklmnopqrstuvwxyz_-.') for _ in range(rng.randrange(5, 14)))}"
+             for _ in range(count)}
+    return {'request': DEFAULT_RULES['request'] + sorted(words), 'user_agent': list(DEFAULT_RULES['user_agent'])}
+
+
+def requests_batch(seed: int = 11):
+    rng = random.Random(seed)
+    agents = [
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+        "Amazon CloudFront",
+    ]
+    batch = []
+    for i in range(BATCH):
+        if i % 100 == 0:
+            batch.append(("/.env", "", "curl/8.0"))
+        elif i % 100 == 1:
+            batch.append(("/api/v1/etex/flights", "", "sqlmap/1.7"))
+        else:
+            region = rng.choice(["etex", "socal"])
+            batch.append((f"/api/v1/{region}/{rng.choice(['flights', 'choppers', 'stream'])}",
+                          rng.choice(["", "format=json", f"since={rng.randrange(10 ** 9)}"]), rng.choice(agents)))
+    return batch
+
+
+@pytest.mark.parametrize("extra_signatures", [0, 500], ids=lambda count: f"signatures=+{count}")
+@pytest.mark.parametrize("implementation", ["single_pass", "legacy_loops"])
+def bench_scan_requests(benchmark, implementation, extra_signatures):
+    rules = synthetic_rules(extra_signatures)
+    batch = requests_batch()
+    if implementation == "single_pass":
+        scanner = RequestScanner(rules)
+        check = scanner.scan
+    else:
+        patterns = rules['request']
+        check = lambda path, query, user_agent: legacy_is_suspicious(patterns, path, query, user_agent)
+
+    flagged = benchmark(lambda: sum(1 for request in batch if check(*request)))
+    assert flagged == 2 * BATCH // 100
@@ -0,0 +1,98 @@
+"""Request throughput of /flights through SecurityMiddleware: pure ASGI vs. BaseHTTPMiddleware
+
+Requests are driven straight through the ASGI app (no server or sockets), so
+the difference between the variants is the middleware's own per-request cost.
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.middleware.security import SecurityMiddleware
+from synthetic import aircraft_records
+
+REQUESTS_PER_ROUND = 2000
+CLIENT_COUNT = 50
+AIRCRAFT_COUNT = 200
+
+
+class LegacySecurityMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware dispatch SecurityMiddleware used before, sharing its checks"""
+
+    def __init__(self, app, **kwargs):
+        super().__init__(app)
+        self.checks = SecurityMiddleware(None, **kwargs)
+
+    async def dispatch(self, request, call_next):
+        checks = self.checks
+        client_ip = checks._get_client_ip(request.scope, request.headers)
+        is_cloudfront = checks._is_cloudfront_ip(client_ip)
+        result = await checks._check_rate_limit(client_ip, request.url.path, is_cloudfront)
+        if not result.allowed:
+            return JSONResponse(status_code=429, content={"detail": "Too many requests. Please try again later."})
+        if checks._is_suspicious_request(request.url.path, request.url.query, request.headers.get("User-Agent", "")):
+            return JSONResponse(status_code=404, content={"detail": "Not found"})
+
+        response = await call_next(request)
+        for name, value in checks._response_headers([], result):
+            response.headers[name.decode()] = value.decode()
+        return response
+
+
+def flights_app(middleware):
+    app = FastAPI()
+    payload = json.dumps({
+        "region": "etex",
+        "aircraft_count": AIRCRAFT_COUNT,
+        "aircraft": [record.to_dict() for record in aircraft_records(AIRCRAFT_COUNT)]
+    }).encode()
+
+    @app.get("/api/v1/{region}/flights")
+    async def flights(region: str):
+        # Same shape as the real endpoint: a pre-serialized snapshot from the response cache
+        return Response(content=payload, media_type="application/json")
+
+    if middleware is not None:
+        app.add_middleware(middleware, rate_limit_requests=10 ** 9, rate_limit_window=60)
+    return app
+
+
+async def drive(app, count: int):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent.append(message["status"])
+
+    for i in range(count):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "https", "path": "/api/v1/etex/flights", "raw_path": b"/api/v1/etex/flights",
+            "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"api.choppertracker.com"), (b"user-agent", b"Mozilla/5.0"),
+                        (b"x-forwarded-for", f"198.51.100.{i % CLIENT_COUNT}".encode())],
+            "client": ("10.0.0.1", 40000), "server": ("10.0.0.2", 8000),
+        }
+        await app(scope, receive, send)
+    return sent
+
+
+@pytest.mark.parametrize("middleware", [None, LegacySecurityMiddleware, SecurityMiddleware],
+                         ids=["no_middleware", "base_http_middleware", "pure_asgi"])
+def bench_flights_throughput(benchmark, middleware):
+    app = flights_app(middleware)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(drive(app, 10))
+        statuses = benchmark.pedantic(lambda: loop.run_until_complete(drive(app, REQUESTS_PER_ROUND)),
+                                      rounds=5, iterations=1)
+    finally:
+        loop.close()
+    benchmark.extra_info['requests_per_round'] = REQUESTS_PER_ROUND
+    assert statuses == [200] * REQUESTS_PER_ROUND
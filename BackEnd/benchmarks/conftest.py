@@ -0,0 +1,62 @@
+"""
+Benchmark suite for the collect -> blend -> enrich -> store cycle
+
+Run from BackEnd/:
+    pytest benchmarks                                  # all sizes, results saved
+    BENCH_SIZES=100,1000 pytest benchmarks             # quick run
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:15%
+
+Every run is autosaved under benchmarks/results/ (named after the current
+commit), so --benchmark-compare checks the working tree against the last
+saved run on this machine.
+"""
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def bench_sizes():
+    sizes = os.getenv("BENCH_SIZES")
+    return [int(size) for size in sizes.split(",")] if sizes else list(DEFAULT_SIZES)
+
+
+def pytest_configure(config):
+    # Keep results next to the suite regardless of the working directory
+    storage = getattr(config.option, "benchmark_storage", None)
+    if storage in (None, "file://./.benchmarks"):
+        config.option.benchmark_storage = f"file://{RESULTS_DIR}"
+
+
+def pytest_generate_tests(metafunc):
+    if "aircraft_count" in metafunc.fixturenames:
+        metafunc.parametrize("aircraft_count", bench_sizes(), ids=lambda size: f"n={size}")
+
+
+@pytest.fixture(autouse=True, scope="session")
+def quiet_logging():
+    """Per-aircraft/per-cycle logging would dominate the timings"""
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(scope="session")
+def registry_path(tmp_path_factory):
+    """Synthetic memory-mapped aircraft registry covering the largest size"""
+    from src.services.aircraft_registry import write_registry
+    from synthetic import registry_entries
+
+    path = tmp_path_factory.mktemp("registry") / "aircraftRegistry.bin"
+    keys, records = registry_entries(max(bench_sizes()))
+    write_registry(path, keys, records)
+    return path
@@ -0,0 +1,104 @@
+"""
+Synthetic aircraft generators for the benchmark suite
+
+Every generator is seeded, so a given size always produces the same traffic
+and results stay comparable between commits.
+"""
+import random
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from src.models.aircraft import AircraftRecord
+from src.services.aircraft_db import AIRCRAFT_INFO_FIELDS, pack_aircraft_info
+
+CENTER_LAT = 32.3513
+CENTER_LON = -95.3011
+SPREAD_DEG = 2.0
+HELICOPTER_SHARE = 0.05
+
+
+def hex_codes(count: int, seed: int = 42) -> List[str]:
+    """Distinct lowercase ICAO hex codes"""
+    rng = random.Random(seed)
+    return [f"{key:06x}" for key in rng.sample(range(0xA00000, 0xAFFFFF), count)]
+
+
+def dump1090_response(count: int, seed: int = 42, now: float = None) -> dict:
+    """A dump1090/tar1090 aircraft.json response"""
+    rng = random.Random(seed)
+    now = time.time() if now is None else now
+    aircraft = []
+    for hex_code in hex_codes(count, seed):
+        aircraft.append({
+            "hex": hex_code,
+            "flight": f"UAL{rng.randrange(9999):<4}",
+            "lat": CENTER_LAT + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            "lon": CENTER_LON + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            "alt_baro": rng.randrange(0, 40000),
+            "alt_geom": rng.randrange(0, 40000),
+            "gs": rng.uniform(80, 500),
+            "track": rng.uniform(0, 360),
+            "baro_rate": rng.uniform(-2000, 2000),
+            "squawk": "1200",
+            "seen": rng.uniform(0, 10),
+            "seen_pos": rng.uniform(0, 10),
+            "rssi": rng.uniform(-30, -5),
+            "messages": rng.randrange(10000)
+        })
+    return {"now": now, "messages": count * 100, "aircraft": aircraft}
+
+
+def opensky_response(count: int, seed: int = 7, now: float = None) -> dict:
+    """An OpenSky /states/all response"""
+    rng = random.Random(seed)
+    now = int(time.time() if now is None else now)
+    states = []
+    for hex_code in hex_codes(count, seed):
+        states.append([
+            hex_code, f"SWA{rng.randrange(9999):<4}", "United States", now - 2, now - 1,
+            CENTER_LON + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            CENTER_LAT + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            rng.uniform(0, 12000), False, rng.uniform(40, 250), rng.uniform(0, 360),
+            rng.uniform(-10, 10), None, rng.uniform(0, 12000), "1200", False, 0
+        ])
+    return {"time": now, "states": states}
+
+
+def aircraft_records(count: int, seed: int = 42) -> List[AircraftRecord]:
+    """Blended, enriched aircraft records (HELICOPTER_SHARE of them rotorcraft)"""
+    rng = random.Random(seed)
+    records = []
+    for hex_code in hex_codes(count, seed):
+        helicopter = rng.random() < HELICOPTER_SHARE
+        records.append(AircraftRecord(
+            hex=hex_code,
+            flight=f"N{rng.randrange(99999)}",
+            lat=CENTER_LAT + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            lon=CENTER_LON + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            alt_baro=rng.randrange(0, 40000),
+            gs=rng.uniform(80, 500),
+            track=rng.uniform(0, 360),
+            squawk="1200",
+            seen=rng.uniform(0, 10),
+            distance_miles=round(rng.uniform(0, 150), 1),
+            data_source="dump1090",
+            registration=f"N{rng.randrange(99999)}",
+            model="EC135" if helicopter else "B737",
+            operator="Synthetic Air",
+            typecode="EC35" if helicopter else "B737",
+            icao_aircraft_class="H2T" if helicopter else "L2J"
+        ))
+    return records
+
+
+def registry_entries(count: int, seed: int = 42) -> Tuple[np.ndarray, List[str]]:
+    """Integer ICAO keys and packed records for a synthetic aircraft registry"""
+    codes = hex_codes(count, seed)
+    info = dict.fromkeys(AIRCRAFT_INFO_FIELDS, "")
+    records = [
+        pack_aircraft_info({**info, 'registration': f"N{i}", 'model': "B737", 'icaoAircraftClass': "L2J"})
+        for i in range(count)
+    ]
+    return np.array([int(code, 16) for code in codes], dtype=np.uint32), records
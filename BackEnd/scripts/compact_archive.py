@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Compact the snapshot archive: merge each finished hour's part files into one
+time-sorted Parquet file. The collector does this automatically when an hour
+rolls over; run this after a crash or restart left parts behind. Each hour
+is flocked while it is compacted, so this is safe beside a running collector.
+"""
+
+import argparse
+import sys
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.loader import load_config
+from src.services.snapshot_archive import PYARROW_AVAILABLE, SnapshotArchive
+from src.utils.logging_config import setup_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact archived snapshot segments into one file per hour")
+    parser.add_argument("--path", type=Path, default=None, help="Archive root (default: global.archive.path)")
+    parser.add_argument("--before", type=datetime.fromisoformat, default=None,
+                        help="Only compact hours before this ISO time (default: the current hour)")
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+
+    if not PYARROW_AVAILABLE:
+        logger.error("❌ pyarrow is not installed - cannot compact the archive")
+        return 1
+
+    archive_config = dict(load_config().global_config.archive)
+    if args.path is not None:
+        archive_config['path'] = str(args.path)
+    archive = SnapshotArchive(archive_config)
+
+    before = args.before
+    if before is not None and before.tzinfo is None:
+        before = before.replace(tzinfo=timezone.utc)
+
+    logger.info(f"🗜️ Compacting snapshot archive in {archive.path}")
+    hours = archive.compact(before)
+    logger.info(f"✅ Compacted {hours} archive hours")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
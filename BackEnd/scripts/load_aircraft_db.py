@@ -2,8 +2,12 @@
 """
 Utility script to manually load aircraft database into Redis
 This can be run to force-reload the aircraft database on AWS
+
+With --build-registry it instead compiles aircraftDatabase.csv into the
+memory-mapped binary registry (aircraftRegistry.bin) used for lookups.
 """
 
+import argparse
 import sys
 import logging
 from pathlib import Path
@@ -11,18 +15,50 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.services.aircraft_db import AircraftDatabase
-from src.services.redis_service import RedisService
+from src.services.aircraft_db import AircraftDatabase, REDIS_META_KEY, REGISTRY_FILENAME, build_registry
+from src.services.container import container
 from src.utils.logging_config import setup_logging
 
+DEFAULT_CSV = Path(__file__).parent.parent / "config" / "aircraftDatabase.csv"
+
+
+def build(csv_file: Path, output_file: Path) -> int:
+    logger = logging.getLogger(__name__)
+    
+    if not csv_file.exists():
+        logger.error(f"❌ Aircraft database CSV not found: {csv_file}")
+        return 1
+    
+    logger.info(f"🔨 Building aircraft registry from {csv_file}")
+    records = build_registry(csv_file, output_file)
+    if records == 0:
+        logger.error("❌ No aircraft records written")
+        return 1
+    
+    size_mb = output_file.stat().st_size / (1024 * 1024)
+    logger.info(f"✅ Wrote {records} aircraft records to {output_file} ({size_mb:.1f} MB)")
+    return 0
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Load the aircraft database into Redis or build the binary registry")
+    parser.add_argument("--build-registry", action="store_true",
+                        help="Compile the CSV into a memory-mapped binary registry instead of loading Redis")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV, help="Aircraft database CSV")
+    parser.add_argument("--output", type=Path, default=None,
+                        help=f"Registry output path (default: {REGISTRY_FILENAME} next to the CSV)")
+    args = parser.parse_args()
+    
     setup_logging()
     logger = logging.getLogger(__name__)
     
+    if args.build_registry:
+        return build(args.csv, args.output or args.csv.with_name(REGISTRY_FILENAME))
+    
     logger.info("🔄 Manual aircraft database loader started")
     
     # Initialize Redis service
-    redis_service = RedisService()
+    redis_service = container.redis_service
     if not redis_service.redis_client:
         logger.error("❌ Redis connection failed - cannot load database")
         return 1
@@ -31,8 +67,10 @@ def main():
     aircraft_db = AircraftDatabase(redis_service)
     
     # Check if database is loaded
-    if aircraft_db.aircraft_db is not None:
-        logger.info(f"✅ Aircraft database loaded with {len(aircraft_db.aircraft_db)} records")
+    if aircraft_db.registry is not None or aircraft_db.aircraft_db is not None:
+        source = "binary registry" if aircraft_db.registry is not None else "CSV"
+        records = len(aircraft_db.registry) if aircraft_db.registry is not None else len(aircraft_db.aircraft_db)
+        logger.info(f"✅ Aircraft database loaded from {source} with {records} records")
         
         # Force import to Redis
         logger.info("🚀 Force importing to Redis...")
@@ -40,8 +78,9 @@ def main():
         
         # Verify Redis has the data
         if redis_service.redis_client:
-            aircraft_keys = redis_service.redis_client.keys("aircraft_db:*")
-            logger.info(f"✅ Redis now contains {len(aircraft_keys)} aircraft records")
+            meta = redis_service.redis_client.hgetall(REDIS_META_KEY)
+            logger.info(f"✅ Redis now contains {meta.get('records', 0)} aircraft records "
+                       f"in {meta.get('buckets', 0)} buckets")
         
         logger.info("🎉 Aircraft database loading completed successfully")
         return 0
@@ -51,4 +90,4 @@ def main():
 
 if __name__ == "__main__":
     exit_code = main()
-    sys.exit(exit_code)
\ No newline at end of file
+    sys.exit(exit_code)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Refresh the bundled offline copy of CloudFront's IP ranges
+(config/cloudfront-ip-ranges.json) from AWS's published ip-ranges.json.
+
+Run before building an image so tasks that cannot reach AWS at startup still
+start with current ranges. Pass a previously downloaded ip-ranges.json to
+work offline.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.middleware.ip_ranges import AWS_IP_RANGES_URL, BUNDLED_PATH, IPRangeMatcher, filter_ip_ranges, service_prefixes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update the bundled CloudFront IP ranges")
+    parser.add_argument("source", nargs="?", type=Path, help="Local ip-ranges.json (default: download)")
+    parser.add_argument("--output", type=Path, default=BUNDLED_PATH, help="Bundled ranges file to write")
+    args = parser.parse_args()
+
+    if args.source:
+        ip_ranges = json.loads(args.source.read_text())
+    else:
+        response = httpx.get(AWS_IP_RANGES_URL, timeout=30)
+        response.raise_for_status()
+        ip_ranges = response.json()
+
+    cloudfront = filter_ip_ranges(ip_ranges)
+    if not cloudfront['prefixes']:
+        print("❌ No CLOUDFRONT entries found", file=sys.stderr)
+        return 1
+
+    args.output.write_text(json.dumps(cloudfront, indent=2) + "\n")
+    matcher = IPRangeMatcher(service_prefixes(cloudfront))
+    print(f"✅ Wrote {len(cloudfront['prefixes'])} IPv4 / {len(cloudfront['ipv6_prefixes'])} IPv6 prefixes "
+          f"({len(matcher)} merged ranges, syncToken {cloudfront['syncToken']}) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
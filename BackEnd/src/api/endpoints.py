@@ -1,28 +1,35 @@
 import csv
 import io
+import time
 import uuid
 import logging
 from pathlib import Path
-from typing import Dict, List
-from fastapi import APIRouter, HTTPException, Response, Header, Request
-from fastapi.responses import PlainTextResponse
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, Header, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from ..services.redis_service import RedisService
 from ..services.collector_service import CollectorService
 from ..services.api_key_service import ApiKeyService
 from ..services.aws_cost_service import AWSCostService
-from ..models.aircraft import AircraftResponse
+from ..services.response_cache import ResponseCache
+from ..services.container import get_redis_service, get_response_cache, get_snapshot_archive
+from ..services.snapshot_archive import SnapshotArchive
+from ..models.aircraft import Aircraft, AircraftResponse
 from ..models.api_key import BulkAircraftRequest, BulkAircraftResponse
 from ..config.loader import load_config
 from ..version import VERSION_INFO
 
 router = APIRouter()
-redis_service = RedisService()
 api_key_service = ApiKeyService()
 logger = logging.getLogger(__name__)
 
+ARCHIVE_DEFAULT_LIMIT = 10000
+ARCHIVE_MAX_LIMIT = 100000
+ARCHIVE_MAX_RANGE_HOURS = 24
+
 # Initialize AWS Cost Service (optional, requires AWS permissions)
 try:
     aws_cost_service = AWSCostService()
@@ -91,9 +98,9 @@ def format_tabular_data(data: Dict) -> str:
 
 
 @router.get("/status")
-async def get_status() -> Dict:
+async def get_status(redis_service: RedisService = Depends(get_redis_service)) -> Dict:
     """Get system status and health information with security monitoring"""
-    from ..main import collector_service, cloudwatch_service
+    from ..main import collector_service, cloudwatch_service, request_scanner
     
     # Get Redis status
     redis_status = redis_service.get_system_status()
@@ -105,7 +112,7 @@ async def get_status() -> Dict:
             # Get data from Redis to see what sources are actively reporting
             for region_name in collector_service.region_collectors.keys():
                 # Check for recent data from each source
-                flights_data = redis_service.get_region_data(region_name, "flights")
+                flights_data = await redis_service.aget_region_data(region_name, "flights")
                 if flights_data and flights_data.get("aircraft"):
                     # Analyze data sources from aircraft
                     sources_in_region = set()
@@ -169,6 +176,7 @@ async def get_status() -> Dict:
         "security": {
             "recent_events": security_events,
             "cloudwatch_alarms": cloudwatch_alarms,
+            "scanner": request_scanner.get_stats(),
             "security_headers_enabled": True,
             "rate_limiting_enabled": True,
             "rate_limit_config": {
@@ -224,21 +232,48 @@ async def get_regions() -> RegionsResponse:
         raise HTTPException(status_code=500, detail=f"Error loading configuration: {str(e)}")
 
 
-@router.get("/{region}/flights")
-async def get_region_flights(region: str) -> Dict:
-    """Get all flights for a region in JSON format"""
-    data = redis_service.get_region_data(region, "flights")
+# Collector refreshes every ~15s; let CloudFront/browsers reuse a snapshot briefly
+SNAPSHOT_CACHE_CONTROL = "public, max-age=5, stale-while-revalidate=10"
+
+
+async def snapshot_response(region: str, data_type: str, request: Request, not_found: str,
+                            response_cache: ResponseCache) -> Response:
+    """Serve a stored region snapshot as cached JSON bytes, compressed when accepted"""
+    payload = await response_cache.get(region, data_type)
     
-    if not data:
-        raise HTTPException(status_code=404, detail=f"No flight data found for region: {region}")
+    if payload is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    
+    body, encoding = payload.encoded(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": payload.etag(encoding),
+        "Cache-Control": SNAPSHOT_CACHE_CONTROL,
+        "Vary": "Accept-Encoding"
+    }
+    if payload.last_modified_header:
+        headers["Last-Modified"] = payload.last_modified_header
+    
+    if payload.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=headers)
     
-    return data
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/{region}/flights")
+async def get_region_flights(region: str, request: Request,
+                             response_cache: ResponseCache = Depends(get_response_cache)) -> Response:
+    """Get all flights for a region in JSON format"""
+    return await snapshot_response(region, "flights", request, f"No flight data found for region: {region}",
+                                   response_cache)
 
 
 @router.get("/{region}/flights/tabular", response_class=PlainTextResponse)
-async def get_region_flights_tabular(region: str) -> str:
+async def get_region_flights_tabular(region: str, redis_service: RedisService = Depends(get_redis_service)) -> str:
     """Get all flights for a region in CSV format"""
-    data = redis_service.get_region_data(region, "flights")
+    data = await redis_service.aget_region_data(region, "flights")
     
     if not data:
         raise HTTPException(status_code=404, detail=f"No flight data found for region: {region}")
@@ -247,20 +282,104 @@ async def get_region_flights_tabular(region: str) -> str:
 
 
 @router.get("/{region}/choppers")
-async def get_region_helicopters(region: str) -> Dict:
+async def get_region_helicopters(region: str, request: Request,
+                                 response_cache: ResponseCache = Depends(get_response_cache)) -> Response:
     """Get helicopters only for a region in JSON format"""
-    data = redis_service.get_region_data(region, "choppers")
+    return await snapshot_response(region, "choppers", request, f"No helicopter data found for region: {region}",
+                                   response_cache)
+
+
+@router.get("/{region}/stream")
+async def stream_region(region: str, type: str = "flights") -> StreamingResponse:
+    """Server-Sent Events feed: an initial snapshot, then aircraft deltas after each collection cycle"""
+    from ..main import collector_service
     
-    if not data:
-        raise HTTPException(status_code=404, detail=f"No helicopter data found for region: {region}")
+    if type not in ("flights", "choppers"):
+        raise HTTPException(status_code=400, detail="type must be 'flights' or 'choppers'")
     
-    return data
+    if not collector_service or region not in collector_service.region_collectors:
+        raise HTTPException(status_code=404, detail=f"Region not found or not enabled: {region}")
+    
+    return StreamingResponse(
+        collector_service.broadcaster.subscribe(region, type),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.get("/{region}/aircraft/{hex_code}/track")
+async def get_aircraft_track(region: str, hex_code: str, minutes: Optional[float] = None,
+                             redis_service: RedisService = Depends(get_redis_service)) -> Dict:
+    """Get the recorded position history (oldest first) of one aircraft in a region"""
+    if minutes is not None and minutes <= 0:
+        raise HTTPException(status_code=400, detail="minutes must be positive")
+    
+    since = time.time() - minutes * 60 if minutes is not None else None
+    points = await redis_service.aget_aircraft_track(region, hex_code, since)
+    
+    if not points:
+        raise HTTPException(status_code=404, detail=f"No track found for aircraft {hex_code} in region: {region}")
+    
+    return {
+        "region": region,
+        "hex": hex_code.lower(),
+        "point_count": len(points),
+        "points": points
+    }
+
+
+@router.get("/{region}/archive")
+async def query_region_archive(region: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                               bbox: Optional[str] = None, hex: Optional[str] = None,
+                               limit: int = ARCHIVE_DEFAULT_LIMIT,
+                               snapshot_archive: SnapshotArchive = Depends(get_snapshot_archive)) -> Dict:
+    """Query archived aircraft positions by time range and bounding box (min_lat,min_lon,max_lat,max_lon)"""
+    if not snapshot_archive.enabled:
+        raise HTTPException(status_code=503, detail="Snapshot archive is not enabled")
+    
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(hours=1)
+    end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+    start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if end - start > timedelta(hours=ARCHIVE_MAX_RANGE_HOURS):
+        raise HTTPException(status_code=400, detail=f"Time range is limited to {ARCHIVE_MAX_RANGE_HOURS} hours")
+    if not 0 < limit <= ARCHIVE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {ARCHIVE_MAX_LIMIT}")
+    
+    bounds = None
+    if bbox:
+        try:
+            bounds = tuple(float(value) for value in bbox.split(','))
+        except ValueError:
+            bounds = ()
+        if len(bounds) != 4:
+            raise HTTPException(status_code=400, detail="bbox must be min_lat,min_lon,max_lat,max_lon")
+    
+    # Parquet reads are blocking - aquery keeps them off the event loop
+    table = await snapshot_archive.aquery(region, start, end, bounds, hex, limit + 1)
+    rows = table.slice(0, limit).to_pylist()
+    for row in rows:
+        row['t'] = row['t'].isoformat()
+    
+    return {
+        "region": region,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "row_count": len(rows),
+        "truncated": table.num_rows > limit,
+        "aircraft": rows
+    }
 
 
 @router.get("/{region}/choppers/tabular", response_class=PlainTextResponse)
-async def get_region_helicopters_tabular(region: str) -> str:
+async def get_region_helicopters_tabular(region: str, redis_service: RedisService = Depends(get_redis_service)) -> str:
     """Get helicopters only for a region in CSV format"""
-    data = redis_service.get_region_data(region, "choppers")
+    data = await redis_service.aget_region_data(region, "choppers")
     
     if not data:
         raise HTTPException(status_code=404, detail=f"No helicopter data found for region: {region}")
@@ -269,10 +388,10 @@ async def get_region_helicopters_tabular(region: str) -> str:
 
 
 @router.get("/{region}/stats")
-async def get_region_stats(region: str) -> Dict:
+async def get_region_stats(region: str, redis_service: RedisService = Depends(get_redis_service)) -> Dict:
     """Get statistics for a specific region"""
-    flights_data = redis_service.get_region_data(region, "flights")
-    choppers_data = redis_service.get_region_data(region, "choppers")
+    flights_data = await redis_service.aget_region_data(region, "flights")
+    choppers_data = await redis_service.aget_region_data(region, "choppers")
     
     if not flights_data and not choppers_data:
         raise HTTPException(status_code=404, detail=f"No data found for region: {region}")
@@ -293,7 +412,7 @@ async def get_region_stats(region: str) -> Dict:
 
 
 @router.get("/debug/memory")
-async def get_memory_debug() -> Dict:
+async def get_memory_debug(redis_service: RedisService = Depends(get_redis_service)) -> Dict:
     """Debug endpoint to see what's in memory"""
     return {
         "memory_store_keys": list(redis_service.memory_store.keys()),
@@ -542,7 +661,8 @@ async def get_logs(lines: int = 100) -> str:
 @router.post("/aircraft/bulk", response_model=BulkAircraftResponse)
 async def receive_bulk_aircraft_data(
     request: BulkAircraftRequest,
-    x_api_key: str = Header(None, alias="X-API-Key")
+    x_api_key: str = Header(None, alias="X-API-Key"),
+    redis_service: RedisService = Depends(get_redis_service)
 ) -> BulkAircraftResponse:
     """Receive bulk aircraft data from Pi stations
     
@@ -596,9 +716,6 @@ async def receive_bulk_aircraft_data(
                 request_id=request_id
             )
         
-        # Store aircraft data in Redis with station metadata
-        redis_key = f"pi_data:{api_key_service.get_collector_region()}:{request.station_id}"
-        
         # Enrich aircraft data with station information
         enriched_aircraft = []
         for aircraft in request.aircraft:
@@ -612,6 +729,8 @@ async def receive_bulk_aircraft_data(
                     "received_at": datetime.utcnow().isoformat(),
                     "region": api_key_service.get_collector_region()
                 }
+                # Validate once here; the collector reads these back without validation
+                Aircraft(**enriched_aircraft_data)
                 enriched_aircraft.append(enriched_aircraft_data)
                 processed_count += 1
                 
@@ -625,14 +744,17 @@ async def receive_bulk_aircraft_data(
             "station_id": request.station_id,
             "station_name": request.station_name,
             "timestamp": request.timestamp.isoformat(),
+            "received_at": datetime.utcnow().isoformat(),
             "aircraft_count": len(enriched_aircraft),
             "aircraft": enriched_aircraft,
             "metadata": request.metadata or {},
             "request_id": request_id
         }
         
-        # Store with TTL (5 minutes like other flight data)
-        redis_service.store_data(redis_key, station_data, ttl=300)
+        # Store with TTL (5 minutes like other flight data) and index the station as live
+        await redis_service.astore_pi_station_data(
+            api_key_service.get_collector_region(), request.station_id, station_data, ttl=300
+        )
         
         # Note: Pi station data will be picked up by the collector service during its
         # normal collection cycle, where it will be properly blended with OpenSky data
@@ -15,6 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.config.loader import load_config
 from src.services.collector_service import CollectorService
+from src.services.container import container
 from src.utils.logging_config import setup_logging
 
 
@@ -62,6 +63,10 @@ class CollectorCLI:
         except Exception as e:
             logging.error(f"Failed to start collector: {e}")
             return 1
+        finally:
+            if self.collector_service:
+                await self.collector_service.close()
+            await container.aclose()
         
         logging.info("Flight Tracker Collector CLI stopped")
         return 0
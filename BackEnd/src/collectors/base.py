@@ -2,24 +2,66 @@ import math
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 
-from ..models.aircraft import Aircraft
+import numpy as np
+
+from ..models.aircraft_batch import AircraftBatch
+from .http_client import HttpClientManager
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_MILES = 3956
+
+
+def geo_distance_kernel(lats, lons, center_lat: float, center_lon: float,
+                        radius_miles: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Batched Haversine distance, radius mask and sort order in one NumPy pass
+    
+    Missing positions must be passed as NaN. Returns (distances, mask, order):
+    distances in miles (inf where position is missing), a boolean mask of
+    aircraft with a position inside the radius (or any position when no radius
+    is given), and the indices of the masked-in aircraft sorted nearest first.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    
+    lat1 = np.radians(lats)
+    lon1 = np.radians(lons)
+    lat2 = math.radians(center_lat)
+    lon2 = math.radians(center_lon)
+    
+    # Haversine formula over whole columns
+    a = (np.sin((lat2 - lat1) * 0.5) ** 2 +
+         np.cos(lat1) * math.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2)
+    distances = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+    
+    valid = ~np.isnan(distances)
+    distances[~valid] = np.inf
+    
+    mask = valid if radius_miles is None else valid & (distances <= radius_miles)
+    
+    # Stable sort on the rounded distance matches the published distance_miles order
+    candidates = np.flatnonzero(mask)
+    order = candidates[np.argsort(np.round(distances[candidates], 1), kind='stable')]
+    
+    return distances, mask, order
+
 
 class BaseCollector(ABC):
     """Base class for all flight data collectors"""
     
-    def __init__(self, collector_config: dict, region_config: dict):
+    def __init__(self, collector_config: dict, region_config: dict, http_client: HttpClientManager):
         self.config = collector_config
         self.region_config = region_config
         self.name = collector_config.get("name", collector_config["type"])
         self.enabled = collector_config.get("enabled", True)
         self.url = collector_config["url"]
         
+        # Shared connection pool, owned and closed by CollectorService
+        self.http_client = http_client
+        
         # Region center for distance calculations
         self.center_lat = region_config["center"]["lat"]
         self.center_lon = region_config["center"]["lon"]
@@ -35,7 +77,7 @@ class BaseCollector(ABC):
         }
     
     @abstractmethod
-    async def fetch_data(self) -> Optional[List[Aircraft]]:
+    async def fetch_data(self) -> Optional[AircraftBatch]:
         """Fetch aircraft data from the source"""
         pass
     
@@ -67,31 +109,25 @@ class BaseCollector(ABC):
         
         return lat_min, lat_max, lon_min, lon_max
     
-    def add_distance_and_filter(self, aircraft_list: List[Aircraft]) -> List[Aircraft]:
-        """Add distance calculation and filter by radius"""
-        filtered_aircraft = []
+    def add_distance_and_filter(self, batch: AircraftBatch, 
+                                filter_radius: bool = True) -> AircraftBatch:
+        """Add distance, filter by radius and sort nearest first in one vectorized pass"""
+        if not len(batch):
+            return batch
         
-        for aircraft in aircraft_list:
-            if aircraft.lat is None or aircraft.lon is None:
-                continue
-            
-            distance = self.calculate_distance(
-                aircraft.lat, aircraft.lon, 
-                self.center_lat, self.center_lon
-            )
-            
-            if distance <= self.radius_miles:
-                aircraft.distance_miles = round(distance, 1)
-                filtered_aircraft.append(aircraft)
+        distances, _, order = geo_distance_kernel(
+            batch.lat, batch.lon, self.center_lat, self.center_lon,
+            self.radius_miles if filter_radius else None
+        )
         
-        return filtered_aircraft
+        filtered = batch.take(order)
+        filtered.distance = np.round(distances[order], 1).astype(np.float32)
+        return filtered
     
-    def sort_by_distance(self, aircraft_list: List[Aircraft]) -> List[Aircraft]:
+    def sort_by_distance(self, batch: AircraftBatch) -> AircraftBatch:
         """Sort aircraft by distance from center"""
-        return sorted(
-            aircraft_list, 
-            key=lambda a: a.distance_miles if a.distance_miles is not None else float('inf')
-        )
+        distances = np.where(np.isnan(batch.distance), np.inf, batch.distance)
+        return batch.take(np.argsort(distances, kind='stable'))
     
     def update_stats(self, success: bool, aircraft_count: int = 0):
         """Update collector statistics"""
@@ -1,10 +1,11 @@
 import time
 import logging
-from typing import List, Optional
+from typing import Optional
 import httpx
 
 from .base import BaseCollector
-from ..models.aircraft import Aircraft
+from .http_client import HttpClientManager
+from ..models.aircraft_batch import AircraftBatch
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +13,8 @@ logger = logging.getLogger(__name__)
 class Dump1090Collector(BaseCollector):
     """dump1090 ADS-B receiver collector"""
     
-    def __init__(self, collector_config: dict, region_config: dict):
-        super().__init__(collector_config, region_config)
+    def __init__(self, collector_config: dict, region_config: dict, http_client: HttpClientManager):
+        super().__init__(collector_config, region_config, http_client)
         
         # dump1090 typically uses tar1090 format
         if not self.url.endswith('/data/aircraft.json'):
@@ -23,7 +24,7 @@ class Dump1090Collector(BaseCollector):
         
         logger.info(f"dump1090 collector configured for {self.name} at {self.url}")
     
-    async def fetch_data(self) -> Optional[List[Aircraft]]:
+    async def fetch_data(self) -> Optional[AircraftBatch]:
         """Fetch data from dump1090 receiver"""
         if not self.enabled:
             return None
@@ -31,22 +32,18 @@ class Dump1090Collector(BaseCollector):
         fetch_start = time.time()
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self.url)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.http_client.get(self.url, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
             
             fetch_time = time.time() - fetch_start
             
-            # Convert dump1090 data to Aircraft objects
+            # Convert dump1090 data to a columnar batch
             aircraft_list = self._convert_dump1090_data(data)
             
-            # Filter by distance and add distance field
+            # Add distance, filter by radius and sort nearest first
             aircraft_list = self.add_distance_and_filter(aircraft_list)
             
-            # Sort by distance
-            aircraft_list = self.sort_by_distance(aircraft_list)
-            
             self.update_stats(True, len(aircraft_list))
             
             logger.info(f"dump1090 ({self.name}): {len(aircraft_list)} aircraft in {fetch_time:.2f}s")
@@ -63,44 +60,18 @@ class Dump1090Collector(BaseCollector):
             logger.error(f"dump1090 fetch failed: {e}")
             return None
     
-    def _convert_dump1090_data(self, data: dict) -> List[Aircraft]:
-        """Convert dump1090 JSON data to Aircraft objects"""
-        aircraft_list = []
-        
+    def _convert_dump1090_data(self, data: dict, now: Optional[float] = None) -> AircraftBatch:
+        """Convert dump1090 JSON data to a columnar aircraft batch"""
         aircraft_data = data.get('aircraft', [])
         if not aircraft_data:
-            return aircraft_list
+            return AircraftBatch.empty()
         
-        for aircraft_dict in aircraft_data:
-            try:
-                # dump1090 uses named JSON fields
-                aircraft = Aircraft(
-                    hex=aircraft_dict.get('hex', '').upper(),
-                    flight=aircraft_dict.get('flight', '').strip() if aircraft_dict.get('flight') else '',
-                    lat=aircraft_dict.get('lat'),
-                    lon=aircraft_dict.get('lon'),
-                    alt_baro=aircraft_dict.get('alt_baro'),
-                    alt_geom=aircraft_dict.get('alt_geom'),
-                    gs=aircraft_dict.get('gs'),  # Already in knots
-                    track=aircraft_dict.get('track'),
-                    baro_rate=aircraft_dict.get('baro_rate'),  # Already in ft/min
-                    squawk=aircraft_dict.get('squawk'),
-                    on_ground=aircraft_dict.get('on_ground', False),
-                    seen=aircraft_dict.get('seen'),
-                    rssi=aircraft_dict.get('rssi'),  # Signal strength
-                    messages=aircraft_dict.get('messages'),  # Message count
-                    data_source="dump1090"
-                )
-                
-                # Only include aircraft with hex code
-                if aircraft.hex:
-                    aircraft_list.append(aircraft)
-                    
-            except (TypeError, ValueError) as e:
-                logger.debug(f"Failed to parse dump1090 aircraft: {e}")
-                continue
-        
-        return aircraft_list
+        try:
+            # Aircraft without a valid hex code are dropped
+            return AircraftBatch.from_dump1090(aircraft_data, now)
+        except (AttributeError, TypeError, ValueError, OverflowError) as e:
+            logger.error(f"Failed to parse dump1090 aircraft data: {e}")
+            return AircraftBatch.empty()
     
     def get_stats(self) -> dict:
         """Get collector statistics including dump1090-specific info"""
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (installed via httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientManager:
+    """Owns pooled, keep-alive HTTP clients shared by all collectors
+
+    One AsyncClient is kept per host so that every collector polling the
+    same upstream (e.g. OpenSky for several regions) reuses the same
+    TCP/TLS connections instead of handshaking on every fetch.
+    """
+
+    def __init__(self, http_config: Optional[dict] = None):
+        http_config = http_config or {}
+        self.limits = httpx.Limits(
+            max_connections=http_config.get('max_connections', 20),
+            max_keepalive_connections=http_config.get('max_keepalive_connections', 10),
+            keepalive_expiry=http_config.get('keepalive_expiry', 120.0)
+        )
+        self.timeout = http_config.get('timeout', 30.0)
+        self.http2 = http_config.get('http2', True) and HTTP2_AVAILABLE
+
+        if http_config.get('http2', True) and not HTTP2_AVAILABLE:
+            logger.info("HTTP/2 requested but 'h2' package is not installed - using HTTP/1.1")
+
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        """Pool key for a URL (scheme + host + port)"""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    async def get_client(self, url: str) -> httpx.AsyncClient:
+        """Get the shared client for the host serving this URL"""
+        key = self._host_key(url)
+        client = self.clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        async with self._lock:
+            client = self.clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    http2=self.http2
+                )
+                self.clients[key] = client
+                logger.info(f"Opened pooled HTTP client for {key} (http2={self.http2})")
+        return client
+
+    async def get(self, url: str, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """Issue a GET through the pooled client for the URL's host"""
+        client = await self.get_client(url)
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        return await client.get(url, **kwargs)
+
+    async def close(self):
+        """Close all pooled clients"""
+        clients = list(self.clients.values())
+        self.clients.clear()
+
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {e}")
+
+        if clients:
+            logger.info(f"Closed {len(clients)} pooled HTTP clients")
+
+    def get_stats(self) -> Dict:
+        """Get connection pool information"""
+        return {
+            "hosts": list(self.clients.keys()),
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections
+        }
@@ -1,10 +1,11 @@
 import time
 import logging
-from typing import List, Optional
+from typing import Optional
 import httpx
 
 from .base import BaseCollector
-from ..models.aircraft import Aircraft
+from .http_client import HttpClientManager
+from ..models.aircraft_batch import AircraftBatch
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +13,8 @@ logger = logging.getLogger(__name__)
 class OpenSkyCollector(BaseCollector):
     """OpenSky Network API collector"""
     
-    def __init__(self, collector_config: dict, region_config: dict):
-        super().__init__(collector_config, region_config)
+    def __init__(self, collector_config: dict, region_config: dict, http_client: HttpClientManager):
+        super().__init__(collector_config, region_config, http_client)
         
         self.anonymous = collector_config.get("anonymous", True)
         self.username = collector_config.get("username")
@@ -42,7 +43,7 @@ class OpenSkyCollector(BaseCollector):
         logger.info(f"  - Enabled: {self.enabled}")
         logger.info(f"  - Anonymous: {self.anonymous}")
     
-    async def fetch_data(self) -> Optional[List[Aircraft]]:
+    async def fetch_data(self) -> Optional[AircraftBatch]:
         """Fetch data from OpenSky Network API"""
         if not self.enabled:
             return None
@@ -86,44 +87,35 @@ class OpenSkyCollector(BaseCollector):
             
             logger.debug(f"OpenSky request: {params}")
             
-            # Make API request with detailed error handling
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                logger.debug(f"Making OpenSky request to {self.url}")
-                response = await client.get(
-                    self.url,
-                    params=params,
-                    auth=self.auth
-                )
-                logger.debug(f"OpenSky response status: {response.status_code}")
-                
-                response.raise_for_status()
-                
-                # Check for rate limit headers
-                self.credits_remaining = response.headers.get('X-Rate-Limit-Remaining')
-                reset_time = response.headers.get('X-Rate-Limit-Reset')
-                if self.credits_remaining:
-                    self.credits_remaining = int(self.credits_remaining)
-                
-                data = response.json()
+            # Make API request over the pooled keep-alive connection
+            logger.debug(f"Making OpenSky request to {self.url}")
+            response = await self.http_client.get(
+                self.url,
+                timeout=30.0,
+                params=params,
+                auth=self.auth
+            )
+            logger.debug(f"OpenSky response status: {response.status_code} ({response.http_version})")
+            
+            response.raise_for_status()
+            
+            # Check for rate limit headers
+            self.credits_remaining = response.headers.get('X-Rate-Limit-Remaining')
+            reset_time = response.headers.get('X-Rate-Limit-Reset')
+            if self.credits_remaining:
+                self.credits_remaining = int(self.credits_remaining)
+            
+            data = response.json()
             
             # Only update last_request_time on successful requests
             self.last_request_time = current_time
             fetch_time = time.time() - fetch_start
             
-            # Convert OpenSky data to Aircraft objects
+            # Convert OpenSky data to a columnar batch
             aircraft_list = self._convert_opensky_data(data)
             
-            # Add distance calculation (but don't filter - already filtered by bounding box)
-            for aircraft in aircraft_list:
-                if aircraft.lat is not None and aircraft.lon is not None:
-                    distance = self.calculate_distance(
-                        aircraft.lat, aircraft.lon, 
-                        self.center_lat, self.center_lon
-                    )
-                    aircraft.distance_miles = round(distance, 1)
-            
-            # Sort by distance
-            aircraft_list = self.sort_by_distance(aircraft_list)
+            # Add distance and sort (but don't filter - already filtered by bounding box)
+            aircraft_list = self.add_distance_and_filter(aircraft_list, filter_radius=False)
             
             self.update_stats(True, len(aircraft_list))
             
@@ -178,57 +170,18 @@ class OpenSkyCollector(BaseCollector):
             logger.debug(f"OpenSky error details", exc_info=True)
             return None
     
-    def _convert_opensky_data(self, data: dict) -> List[Aircraft]:
-        """Convert OpenSky state vectors to Aircraft objects"""
-        aircraft_list = []
-        
+    def _convert_opensky_data(self, data: dict, now: Optional[float] = None) -> AircraftBatch:
+        """Convert OpenSky state vectors to a columnar aircraft batch"""
         states = data.get('states', [])
         if not states:
-            return aircraft_list
-        
-        for state in states:
-            try:
-                # OpenSky state vector format (array indices)
-                aircraft = Aircraft(
-                    hex=state[0] if state[0] else '',  # icao24
-                    flight=state[1].strip() if state[1] else '',  # callsign
-                    lat=state[6] if state[6] is not None else None,  # latitude
-                    lon=state[5] if state[5] is not None else None,  # longitude
-                    alt_baro=self._meters_to_feet(state[7]) if state[7] is not None else None,  # baro alt
-                    alt_geom=self._meters_to_feet(state[13]) if state[13] is not None else None,  # geo alt
-                    gs=self._ms_to_knots(state[9]) if state[9] is not None else None,  # velocity
-                    track=round(state[10], 1) if state[10] is not None else None,  # true track
-                    baro_rate=self._ms_to_fpm(state[11]) if state[11] is not None else None,  # vertical rate
-                    squawk=state[14] if state[14] else None,  # squawk
-                    on_ground=state[8] if state[8] is not None else False,  # on ground
-                    seen=int(time.time() - state[4]) if state[4] else None,  # time since last contact
-                    data_source="opensky"
-                )
-                
-                # Only include aircraft with position and hex code
-                if aircraft.hex and aircraft.lat is not None and aircraft.lon is not None:
-                    aircraft_list.append(aircraft)
-                    
-            except (IndexError, TypeError, ValueError) as e:
-                logger.debug(f"Failed to parse OpenSky state vector: {e}")
-                continue
+            return AircraftBatch.empty()
         
-        return aircraft_list
-    
-    @staticmethod
-    def _meters_to_feet(meters: float) -> int:
-        """Convert meters to feet"""
-        return int(meters * 3.28084)
-    
-    @staticmethod
-    def _ms_to_knots(ms: float) -> float:
-        """Convert m/s to knots"""
-        return round(ms * 1.94384, 1)
-    
-    @staticmethod
-    def _ms_to_fpm(ms: float) -> float:
-        """Convert m/s to ft/min"""
-        return round(ms * 196.85, 1)
+        try:
+            # Only state vectors with position and hex code are kept
+            return AircraftBatch.from_opensky(states, now)
+        except (IndexError, TypeError, ValueError, OverflowError) as e:
+            logger.error(f"Failed to parse OpenSky state vectors: {e}")
+            return AircraftBatch.empty()
     
     def get_stats(self) -> dict:
         """Get collector statistics including OpenSky-specific info"""
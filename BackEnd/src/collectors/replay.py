@@ -0,0 +1,138 @@
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+from .dump1090 import Dump1090Collector
+from .opensky import OpenSkyCollector
+from .http_client import HttpClientManager
+from ..models.aircraft_batch import AircraftBatch
+
+logger = logging.getLogger(__name__)
+
+Frame = Tuple[float, dict]
+
+
+def _frame_time(data: dict, fallback: Optional[float] = None) -> Optional[float]:
+    """Capture time of a raw response: dump1090 'now' or OpenSky 'time'"""
+    t = data.get('now', data.get('time'))
+    return float(t) if t is not None else fallback
+
+
+def _iter_jsonl(path: Path) -> Iterator[Frame]:
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                logger.warning(f"Skipping bad recording line {path}:{line_number}: {e}")
+                continue
+            # Either {"t": ..., "response": {...}} or a bare response
+            if 'response' in record:
+                yield float(record['t']), record['response']
+            else:
+                t = _frame_time(record)
+                if t is not None:
+                    yield t, record
+
+
+def _iter_directory(path: Path) -> Iterator[Frame]:
+    # e.g. dump1090/readsb history_*.json files, read in capture (mtime) order
+    files = sorted(path.glob("*.json"), key=lambda file: (file.stat().st_mtime, file.name))
+    for file in files:
+        try:
+            with open(file, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping bad recording file {file}: {e}")
+            continue
+        yield _frame_time(data, os.path.getmtime(file)), data
+
+
+class RecordedFeed:
+    """Time-ordered recorded responses of one upstream, read forward as replay time advances
+
+    A recording is a JSONL file (optionally .gz) with one response per line,
+    either wrapped as {"t": <epoch>, "response": {...}} or bare (timestamped
+    by its own dump1090 'now' / OpenSky 'time' field), or a directory of
+    response .json files. Frames are streamed, so a full day of recordings
+    is never held in memory.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._frames = _iter_directory(self.path) if self.path.is_dir() else _iter_jsonl(self.path)
+        self._current: Optional[Frame] = None
+        self._next: Optional[Frame] = next(self._frames, None)
+        self.frames_read = 0
+
+    @property
+    def start_time(self) -> Optional[float]:
+        """Time of the first unread frame"""
+        return self._next[0] if self._next else None
+
+    @property
+    def exhausted(self) -> bool:
+        return self._next is None
+
+    def at(self, t: float) -> Optional[Frame]:
+        """Latest frame recorded at or before t"""
+        while self._next is not None and self._next[0] <= t:
+            self._current = self._next
+            self._next = next(self._frames, None)
+            self.frames_read += 1
+        return self._current
+
+
+class ReplayDump1090Collector(Dump1090Collector):
+    """dump1090 collector serving recorded aircraft.json responses"""
+
+    def __init__(self, collector_config: dict, region_config: dict, feed: RecordedFeed,
+                 clock: Callable[[], float], http_client: HttpClientManager):
+        super().__init__(collector_config, region_config, http_client)
+        self.feed = feed
+        self.clock = clock
+
+    async def fetch_data(self) -> Optional[AircraftBatch]:
+        """Return the recorded response current at replay time"""
+        if not self.enabled:
+            return None
+
+        frame = self.feed.at(self.clock())
+        if frame is None:
+            return None
+
+        t, data = frame
+        aircraft_list = self.add_distance_and_filter(self._convert_dump1090_data(data, now=t))
+        self.update_stats(True, len(aircraft_list))
+        return aircraft_list
+
+
+class ReplayOpenSkyCollector(OpenSkyCollector):
+    """OpenSky collector serving recorded states responses"""
+
+    def __init__(self, collector_config: dict, region_config: dict, feed: RecordedFeed,
+                 clock: Callable[[], float], http_client: HttpClientManager):
+        super().__init__(collector_config, region_config, http_client)
+        self.feed = feed
+        self.clock = clock
+
+    async def fetch_data(self) -> Optional[AircraftBatch]:
+        """Return the recorded response current at replay time"""
+        if not self.enabled:
+            return None
+
+        frame = self.feed.at(self.clock())
+        if frame is None:
+            return None
+
+        t, data = frame
+        aircraft_list = self.add_distance_and_filter(self._convert_opensky_data(data, now=t), filter_radius=False)
+        self.update_stats(True, len(aircraft_list))
+        return aircraft_list
@@ -32,6 +32,11 @@ class GlobalConfig(BaseModel):
     redis: Dict[str, Any] = Field(default_factory=dict)
     logging: Dict[str, Any] = Field(default_factory=dict)
     polling: Dict[str, Any] = Field(default_factory=dict)
+    http: Dict[str, Any] = Field(default_factory=dict)
+    aircraft_db: Dict[str, Any] = Field(default_factory=dict)
+    tracks: Dict[str, Any] = Field(default_factory=dict)
+    archive: Dict[str, Any] = Field(default_factory=dict)
+    rate_limit: Dict[str, Any] = Field(default_factory=dict)
 
 
 class CollectorConfig(BaseModel):
@@ -140,5 +145,6 @@ def get_redis_config() -> Dict[str, Any]:
         "host": os.getenv("REDIS_HOST", "localhost"),
         "port": int(os.getenv("REDIS_PORT", "6379")),
         "db": int(os.getenv("REDIS_DB", "0")),
-        "decode_responses": True
+        "decode_responses": True,
+        "socket_connect_timeout": 5
     }
\ No newline at end of file
@@ -11,10 +11,13 @@ from fastapi.responses import FileResponse, PlainTextResponse, Response
 
 from .config.loader import load_config
 from .services.collector_service import CollectorService
+from .services.container import container, get_rate_limiter
 from .api.endpoints import router
 from .utils.logging_config import setup_logging
 from .version import VERSION_INFO
 from .middleware.security import SecurityMiddleware, CloudWatchAlarmsService
+from .middleware.ip_ranges import CloudFrontIPRanges
+from .middleware.request_scanner import RequestScanner
 # from .mcp import MCPServer  # Temporarily disabled until MCP package is available
 
 
@@ -22,6 +25,8 @@ from .middleware.security import SecurityMiddleware, CloudWatchAlarmsService
 collector_service = None
 security_middleware_instance = None
 cloudwatch_service = CloudWatchAlarmsService()
+cloudfront_ranges = CloudFrontIPRanges()
+request_scanner = RequestScanner()
 # mcp_server = None  # Temporarily disabled
 
 
@@ -41,17 +46,21 @@ async def lifespan(app: FastAPI):
         # Load configuration
         config = load_config()
         
+        # One shared Redis pool for the API, collector and MCP
+        container.configure(config)
+        
         # Initialize collector service
-        collector_service = CollectorService(config)
+        collector_service = CollectorService(config, redis_service=container.redis_service)
         
         # Initialize MCP server with shared services
-        from .services.redis_service import RedisService
-        redis_service = RedisService()
-        # mcp_server = MCPServer(redis_service, collector_service)  # Temporarily disabled
+        # mcp_server = MCPServer(container.redis_service, collector_service)  # Temporarily disabled
         
         # Start background collection task
         collection_task = asyncio.create_task(collector_service.run_continuous())
         
+        # Keep CloudFront edge ranges current from AWS's published ip-ranges.json
+        ip_ranges_task = asyncio.create_task(cloudfront_ranges.run_refresh())
+        
         logging.info("Flight Tracker Collector API started successfully")
         logging.info("MCP server initialized and ready")
         
@@ -63,12 +72,21 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logging.info("Shutting down Flight Tracker Collector API")
+        if 'ip_ranges_task' in locals():
+            ip_ranges_task.cancel()
+            try:
+                await ip_ranges_task
+            except asyncio.CancelledError:
+                pass
         if 'collection_task' in locals():
             collection_task.cancel()
             try:
                 await collection_task
             except asyncio.CancelledError:
                 pass
+        if collector_service:
+            await collector_service.close()
+        await container.aclose()
 
 
 # Create FastAPI app
@@ -96,7 +114,10 @@ app.add_middleware(
 # Add security middleware with rate limiting
 # Note: We can't easily access the middleware instance after adding it this way
 # For now, security events will be logged but not available in status endpoint
-app.add_middleware(SecurityMiddleware, rate_limit_requests=1000, rate_limit_window=60)
+# (limits are shared across tasks through Redis when global.rate_limit.backend is redis)
+app.add_middleware(SecurityMiddleware, rate_limit_requests=1000, rate_limit_window=60,
+                   distributed_limiter=get_rate_limiter, cloudfront_ranges=cloudfront_ranges,
+                   request_scanner=request_scanner)
 
 # Additional CORS handling for preflight requests
 @app.options("/{full_path:path}")
@@ -150,7 +171,9 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    # Still healthy without Redis (memory fallback); the check also retries a lost connection
+    services = await container.health_check()
+    return {"status": "healthy", **services}
 
 
 # MCP endpoints - Temporarily disabled
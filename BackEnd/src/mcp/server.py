@@ -26,6 +26,7 @@ from mcp.types import (
 )
 
 from ..services.redis_service import RedisService
+from ..services.container import container
 from ..services.collector_service import CollectorService
 from .tools import FlightTrackerTools
 from .resources import FlightTrackerResources
@@ -38,7 +39,7 @@ class MCPServer:
     
     def __init__(self, redis_service: RedisService = None, collector_service: CollectorService = None):
         """Initialize MCP server with flight tracker services"""
-        self.redis_service = redis_service or RedisService()
+        self.redis_service = redis_service or container.redis_service
         self.collector_service = collector_service
         self.server = Server("flight-tracker-mcp")
         self.tools = FlightTrackerTools(self.redis_service, self.collector_service)
@@ -273,22 +273,9 @@ class FlightTrackerTools:
         """Get detailed information about a specific aircraft"""
         hex_code = hex_code.lower()
         
-        # Look for aircraft in live data
-        aircraft_key = f"aircraft_live:{hex_code}"
-        aircraft_data = self.redis_service.get_data(aircraft_key)
-        
-        if not aircraft_data:
-            # Search across all regions
-            regions = ["etex"]  # Add more regions as configured
-            for region in regions:
-                flights_data = self.redis_service.get_region_data(region, "flights")
-                if flights_data and flights_data.get("aircraft"):
-                    for aircraft in flights_data["aircraft"]:
-                        if aircraft.get("hex", "").lower() == hex_code:
-                            aircraft_data = aircraft
-                            break
-                if aircraft_data:
-                    break
+        # Look for aircraft in live data (snapshot-mode key or delta-mode region hashes)
+        regions = list(getattr(self.collector_service, 'region_collectors', None) or ["etex"])
+        aircraft_data = self.redis_service.get_live_aircraft(hex_code, regions)
         
         if not aircraft_data:
             return {
@@ -20,7 +20,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.config.loader import load_config
-from src.services.redis_service import RedisService
+from src.services.container import container
 from src.services.collector_service import CollectorService
 from src.mcp.server import MCPServer
 from src.utils.logging_config import setup_logging
@@ -39,7 +39,8 @@ async def main():
         config = load_config()
         
         # Initialize services
-        redis_service = RedisService()
+        container.configure(config)
+        redis_service = container.redis_service
         
         # Optional: Initialize collector service for enhanced functionality
         # Note: In standalone mode, we rely on existing data in Redis
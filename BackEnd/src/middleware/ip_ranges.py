@@ -0,0 +1,198 @@
+"""Compiled IP range matching for CloudFront detection"""
+import asyncio
+import bisect
+import ipaddress
+import json
+import logging
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+AWS_IP_RANGES_URL = "https://ip-ranges.amazonaws.com/ip-ranges.json"
+CLOUDFRONT_SERVICE = "CLOUDFRONT"
+
+# Last download of the published ranges (CLOUDFRONT entries only)
+DEFAULT_CACHE_PATH = "data/ip-ranges/cloudfront.json"
+# Offline copy shipped with the image, used until a download succeeds
+BUNDLED_PATH = Path(__file__).parent.parent.parent / "config" / "cloudfront-ip-ranges.json"
+
+# AWS publishes changes a few times a week; the cache is refreshed once it is older than this
+REFRESH_INTERVAL = 24 * 3600
+# First retry after a failed download; doubles per consecutive failure up to the refresh interval
+RETRY_INTERVAL = 60
+
+
+class IPRangeMatcher:
+    """Set of CIDR blocks compiled into sorted, merged integer ranges
+
+    Lookups parse the address once and bisect the range starts, so the cost
+    stays O(log n) however many blocks are loaded. IPv4-mapped IPv6
+    addresses (::ffff:a.b.c.d) are matched against the IPv4 ranges.
+    """
+
+    def __init__(self, cidrs: Iterable[str] = ()):
+        v4: List[Tuple[int, int]] = []
+        v6: List[Tuple[int, int]] = []
+        for cidr in cidrs:
+            network = ipaddress.ip_network(cidr.strip(), strict=False)
+            ranges = v4 if network.version == 4 else v6
+            ranges.append((int(network.network_address), int(network.broadcast_address)))
+        self.v4_starts, self.v4_ends = self._merge(v4)
+        self.v6_starts, self.v6_ends = self._merge(v6)
+
+    @staticmethod
+    def _merge(ranges: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+        starts: List[int] = []
+        ends: List[int] = []
+        for start, end in sorted(ranges):
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
+
+    def __contains__(self, ip: str) -> bool:
+        try:
+            if ":" in ip:
+                value = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
+                if value >> 32 == 0xFFFF:
+                    return self._match(self.v4_starts, self.v4_ends, value & 0xFFFFFFFF)
+                return self._match(self.v6_starts, self.v6_ends, value)
+            return self._match(self.v4_starts, self.v4_ends,
+                               int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big"))
+        except (OSError, ValueError):
+            # Not an IP address (e.g. "unknown" or a malformed forwarded header)
+            return False
+
+    @staticmethod
+    def _match(starts: List[int], ends: List[int], value: int) -> bool:
+        index = bisect.bisect_right(starts, value) - 1
+        return index >= 0 and value <= ends[index]
+
+    def __len__(self) -> int:
+        return len(self.v4_starts) + len(self.v6_starts)
+
+
+def service_prefixes(ip_ranges: Dict, service: str = CLOUDFRONT_SERVICE) -> List[str]:
+    """IPv4 and IPv6 CIDRs for one service from an AWS ip-ranges.json document"""
+    return ([entry['ip_prefix'] for entry in ip_ranges.get('prefixes', []) if entry.get('service') == service]
+            + [entry['ipv6_prefix'] for entry in ip_ranges.get('ipv6_prefixes', []) if entry.get('service') == service])
+
+
+def filter_ip_ranges(ip_ranges: Dict, service: str = CLOUDFRONT_SERVICE) -> Dict:
+    """Reduce an ip-ranges.json document to one service's entries (same schema)"""
+    return {
+        'syncToken': ip_ranges.get('syncToken'),
+        'createDate': ip_ranges.get('createDate'),
+        'prefixes': [entry for entry in ip_ranges.get('prefixes', []) if entry.get('service') == service],
+        'ipv6_prefixes': [entry for entry in ip_ranges.get('ipv6_prefixes', []) if entry.get('service') == service]
+    }
+
+
+class CloudFrontIPRanges:
+    """CloudFront edge ranges from AWS's published ip-ranges.json
+
+    Loads the disk cache (or the bundled offline copy) synchronously at
+    startup, so matching never waits on the network; run_refresh() keeps the
+    cache current in the background and swaps in a new matcher when AWS
+    publishes changes.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, bundled_path: Path = BUNDLED_PATH,
+                 url: str = AWS_IP_RANGES_URL, refresh_interval: float = REFRESH_INTERVAL,
+                 retry_interval: float = RETRY_INTERVAL):
+        self.cache_path = Path(cache_path or os.getenv("IP_RANGES_CACHE", DEFAULT_CACHE_PATH))
+        self.bundled_path = Path(bundled_path)
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.failures = 0  # Consecutive failed downloads
+        self.sync_token: Optional[str] = None
+        self.source = "none"
+        self.matcher = IPRangeMatcher()
+        self.load()
+
+    def load(self):
+        """Build the matcher from the disk cache, falling back to the bundled copy"""
+        for source, path in (("cache", self.cache_path), ("bundled", self.bundled_path)):
+            if not path.exists():
+                continue
+            try:
+                ip_ranges = json.loads(path.read_text())
+                if not service_prefixes(ip_ranges):
+                    logger.warning(f"⚠️ No CloudFront entries in {path}")
+                    continue
+                self._apply(ip_ranges, source)
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Could not load CloudFront IP ranges from {path}: {e}")
+        logger.error("❌ No CloudFront IP ranges available - CloudFront clients get default rate limits")
+
+    def _apply(self, ip_ranges: Dict, source: str):
+        self.matcher = IPRangeMatcher(service_prefixes(ip_ranges))
+        self.sync_token = ip_ranges.get('syncToken')
+        self.source = source
+        logger.info(f"🌐 Loaded {len(self.matcher)} CloudFront IP ranges ({source}, syncToken {self.sync_token})")
+
+    def contains(self, ip: str) -> bool:
+        """True if ip belongs to a CloudFront edge range"""
+        return ip in self.matcher
+
+    def cache_age(self) -> Optional[float]:
+        """Seconds since the disk cache was written (None if there is no cache)"""
+        try:
+            return time.time() - self.cache_path.stat().st_mtime
+        except OSError:
+            return None
+
+    async def arefresh(self, force: bool = False) -> bool:
+        """Download ip-ranges.json if the cache is stale; returns True if the ranges changed"""
+        age = self.cache_age()
+        if not force and age is not None and age < self.refresh_interval:
+            return False
+        try:
+            async with httpx.AsyncClient(timeout=30) as client:
+                response = await client.get(self.url)
+                response.raise_for_status()
+                ip_ranges = filter_ip_ranges(response.json())
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"⚠️ Failed to download AWS IP ranges, keeping {self.source} copy: {e}")
+            return False
+        if not ip_ranges['prefixes'] and not ip_ranges['ipv6_prefixes']:
+            self.failures += 1
+            logger.warning("⚠️ Downloaded AWS IP ranges contain no CloudFront entries, ignoring")
+            return False
+        self.failures = 0
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(ip_ranges))
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not cache AWS IP ranges at {self.cache_path}: {e}")
+
+        if ip_ranges['syncToken'] == self.sync_token:
+            return False
+        self._apply(ip_ranges, "download")
+        return True
+
+    def next_refresh_delay(self) -> float:
+        """Seconds until the next refresh attempt: retries back off from retry_interval after failures"""
+        if self.failures:
+            return min(self.retry_interval * 2 ** (self.failures - 1), self.refresh_interval)
+        return self.refresh_interval
+
+    async def run_refresh(self):
+        """Refresh now and then whenever the cache goes stale (runs until cancelled)"""
+        while True:
+            await self.arefresh()
+            await asyncio.sleep(self.next_refresh_delay())
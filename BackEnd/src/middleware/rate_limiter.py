@@ -0,0 +1,238 @@
+"""Constant-time per-client rate limiting, locally or shared through Redis"""
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CLIENTS = 100000  # Hard cap on tracked clients (oldest evicted first)
+
+
+@dataclass(slots=True)
+class RateLimitResult:
+    """Outcome of one rate limit check, with the values for X-RateLimit-* headers"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int          # epoch second when the client's bucket is full again
+    retry_after: float  # seconds until the next request would be allowed (0 if allowed)
+
+
+class TokenBucketLimiter:
+    """Token bucket per client, stored as a single float
+
+    Implemented in its GCRA form: instead of a token count and refill time,
+    each client keeps its "theoretical arrival time" (TAT). A request with a
+    limit of N per window costs window/N seconds and is allowed while the TAT
+    stays within one window of now, which is a bucket of N tokens refilling
+    at N per window. Requests to paths with different limits share the
+    client's state and each pays its own cost.
+
+    Clients are kept in least-recently-seen order, so idle clients whose
+    bucket has refilled are evicted from the front in amortized O(1).
+    """
+
+    def __init__(self, window: float = 60, max_clients: int = DEFAULT_MAX_CLIENTS):
+        self.window = float(window)
+        self.max_clients = max_clients
+        self.clients: "OrderedDict[str, float]" = OrderedDict()
+        self.stats = {'allowed': 0, 'limited': 0, 'evicted': 0}
+
+    def check(self, key: str, limit: int, now: Optional[float] = None) -> RateLimitResult:
+        """Count one request from key against a limit of `limit` per window"""
+        now = time.time() if now is None else now
+        cost = self.window / limit
+        clients = self.clients
+
+        tat = clients.get(key, now)
+        if tat < now:
+            tat = now
+        new_tat = tat + cost
+
+        if new_tat - now > self.window:
+            # Over the limit: state is unchanged, retry once one request's worth has drained
+            clients[key] = tat
+            clients.move_to_end(key)
+            self.stats['limited'] += 1
+            retry_after = new_tat - now - self.window
+            return RateLimitResult(False, limit, 0, math.ceil(tat), retry_after)
+
+        clients[key] = new_tat
+        clients.move_to_end(key)
+        self.stats['allowed'] += 1
+        self._evict(now)
+
+        remaining = int((self.window - (new_tat - now)) / cost + 1e-9)
+        return RateLimitResult(True, limit, remaining, math.ceil(new_tat), 0.0)
+
+    def _evict(self, now: float):
+        """Drop least-recently-seen clients whose bucket is full again"""
+        clients = self.clients
+        while clients:
+            key, tat = next(iter(clients.items()))
+            if tat > now and len(clients) <= self.max_clients:
+                break
+            del clients[key]
+            self.stats['evicted'] += 1
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics"""
+        return {'tracked_clients': len(self.clients), **self.stats}
+
+
+# Atomic GCRA step shared by all replicas. Uses the Redis clock so tasks with
+# skewed clocks agree, and optionally reserves extra budget ("lease") that the
+# calling replica may spend locally without another round trip.
+# KEYS[1]: client key; ARGV: cost, window, lease (all seconds)
+# Returns {allowed, tat, now, leased} with floats as full-precision strings.
+GCRA_SCRIPT = """
+local function num(x) return string.format('%.17g', x) end
+local cost = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local lease = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + cost
+if new_tat - now > window then
+  return {0, num(tat), num(now), '0'}
+end
+-- Lease whole requests only, so no charged budget is too small to spend
+local leased = math.floor(math.min(lease, window - (new_tat - now)) / cost + 1e-9) * cost
+if leased < 0 then leased = 0 end
+new_tat = new_tat + leased
+redis.call('SET', KEYS[1], num(new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1)
+return {1, num(new_tat), num(now), num(leased)}
+"""
+
+# Seconds to serve from the local limiter after Redis failed before trying it again
+REDIS_RETRY_INTERVAL = 5
+
+
+class _ClientLease:
+    """Local view of one client's shared bucket"""
+    __slots__ = ('credit', 'expires', 'tat', 'offset', 'blocked_until')
+
+    def __init__(self):
+        self.credit = 0.0          # leased seconds of budget still spendable locally
+        self.expires = 0.0         # local time the lease (and this entry) lapses
+        self.tat = 0.0             # last TAT seen in Redis (Redis clock)
+        self.offset = 0.0          # Redis clock minus local clock
+        self.blocked_until = 0.0   # local time until which the client is known to be limited
+
+
+class RedisRateLimiter:
+    """GCRA limiter whose state lives in Redis so every task enforces one quota
+
+    Same semantics as TokenBucketLimiter, but the TAT per client is updated by
+    an atomic Lua script. To keep Redis off the hot path, a client that is
+    actively sending gets a lease of extra budget with each round trip and
+    spends it locally until it runs out or expires, and a client Redis has
+    limited is rejected locally until its retry time. Leased budget is already
+    charged in Redis, so replicas can only be stricter than the shared quota,
+    never looser.
+
+    acheck() returns None when Redis is unavailable so the caller can fall
+    back to its local limiter.
+    """
+
+    def __init__(self, redis_service, rate_limit_config: Optional[dict] = None):
+        config = rate_limit_config or {}
+        self.redis_service = redis_service
+        self.key_prefix = config.get('key_prefix', 'ratelimit:')
+        # Fraction of the window reserved per round trip for an active client
+        self.lease_fraction = float(config.get('lease_fraction', 0.02))
+        self.lease_ttl = float(config.get('lease_ttl', 1.0))
+        self.timeout = float(config.get('timeout_ms', 50)) / 1000
+        self.max_clients = int(config.get('max_clients', DEFAULT_MAX_CLIENTS))
+        self.leases: "OrderedDict[str, _ClientLease]" = OrderedDict()
+        self.unavailable_until = 0.0
+        self._script = None
+        self._script_client = None
+        self.stats = {'redis_checks': 0, 'lease_hits': 0, 'local_denies': 0, 'fallbacks': 0}
+
+    def _get_script(self):
+        client = self.redis_service.async_client if self.redis_service else None
+        if client is None:
+            return None
+        if client is not self._script_client:
+            self._script = client.register_script(GCRA_SCRIPT)
+            self._script_client = client
+        return self._script
+
+    async def acheck(self, key: str, limit: int, window: float) -> Optional[RateLimitResult]:
+        """Count one request from key against the shared limit; None if Redis is unavailable"""
+        now = time.time()
+        cost = window / limit
+        lease = self.leases.get(key)
+
+        if lease is not None:
+            if now < lease.blocked_until:
+                self.stats['local_denies'] += 1
+                return RateLimitResult(False, limit, 0, math.ceil(lease.tat - lease.offset), lease.blocked_until - now)
+            if lease.credit >= cost and now < lease.expires:
+                lease.credit -= cost
+                self.stats['lease_hits'] += 1
+                return self._result(lease, limit, window, cost, now)
+
+        if now < self.unavailable_until:
+            self.stats['fallbacks'] += 1
+            return None
+        script = self._get_script()
+        if script is None:
+            self.stats['fallbacks'] += 1
+            return None
+
+        # Only clients seen within the lease TTL get a lease; one-off clients cost exactly one request
+        active = lease is not None and now < lease.expires
+        extra = int(window * self.lease_fraction / cost) * cost if active else 0.0
+        try:
+            async with asyncio.timeout(self.timeout):
+                allowed, tat, redis_now, leased = await script(
+                    keys=[f"{self.key_prefix}{key}"], args=[cost, window, extra]
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Redis rate limiter unavailable, using local limits for {REDIS_RETRY_INTERVAL}s: {e!r}")
+            self.unavailable_until = now + REDIS_RETRY_INTERVAL
+            self.stats['fallbacks'] += 1
+            return None
+        self.stats['redis_checks'] += 1
+
+        if lease is None:
+            lease = self.leases[key] = _ClientLease()
+        self.leases.move_to_end(key)
+        lease.tat = float(tat)
+        lease.offset = float(redis_now) - now
+        lease.expires = now + self.lease_ttl
+        lease.credit = float(leased)
+        self._evict(now)
+
+        if not int(allowed):
+            retry_after = lease.tat + cost - float(redis_now) - window
+            lease.blocked_until = now + retry_after
+            return RateLimitResult(False, limit, 0, math.ceil(lease.tat - lease.offset), retry_after)
+        return self._result(lease, limit, window, cost, now)
+
+    def _result(self, lease: _ClientLease, limit: int, window: float, cost: float, now: float) -> RateLimitResult:
+        # Leased credit is already part of the TAT, so add it back for remaining
+        used = lease.tat - (now + lease.offset) - lease.credit
+        remaining = max(0, int((window - used) / cost + 1e-9))
+        return RateLimitResult(True, limit, remaining, math.ceil(lease.tat - lease.offset), 0.0)
+
+    def _evict(self, now: float):
+        """Drop least-recently-checked clients whose lease and block have lapsed"""
+        leases = self.leases
+        while leases:
+            key, lease = next(iter(leases.items()))
+            if (lease.expires > now or lease.blocked_until > now) and len(leases) <= self.max_clients:
+                break
+            del leases[key]
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics"""
+        return {'tracked_clients': len(self.leases), **self.stats}
@@ -0,0 +1,145 @@
+"""Single-pass suspicious request detection"""
+import logging
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Signature file shipped in config/; SECURITY_RULES_FILE overrides it
+DEFAULT_RULES_PATH = Path(__file__).parent.parent.parent / "config" / "security_rules.yaml"
+
+# Used when no rules file can be loaded
+DEFAULT_RULES = {
+    'request': [
+        ".env", ".git", ".aws", "wp-admin", "phpmyadmin", "admin.php",
+        "XDEBUG", "phpstorm", "eval(", "base64", "shell_exec",
+        "../", "..\\", "%2e%2e", "etc/passwd", "proc/self"
+    ],
+    'user_agent': ["nikto", "sqlmap", "nmap", "masscan"]
+}
+
+TARGETS = ('request', 'user_agent')
+
+# Joins path, query and User-Agent into one scanned string; no signature contains it
+SEPARATOR = "\x00"
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation of literal words, factored into a prefix trie
+
+    A flat "a|b|c" alternation retries every signature at every position;
+    sharing prefixes keeps the work per position proportional to the
+    signature length instead of the signature count.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A shorter signature ends here; the greedy ? still prefers the longest one
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+
+    return build(trie)
+
+
+def load_rules(path: Optional[Path] = None) -> Dict[str, List[str]]:
+    """Signature lists per target from the rules YAML (defaults if it is missing or invalid)"""
+    path = Path(path or os.getenv("SECURITY_RULES_FILE", DEFAULT_RULES_PATH))
+    try:
+        with open(path) as f:
+            rules = yaml.safe_load(f) or {}
+        return {target: [str(signature) for signature in rules.get(target) or []] for target in TARGETS}
+    except FileNotFoundError:
+        logger.warning(f"⚠️ Security rules file {path} not found - using built-in signatures")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load security rules from {path}, using built-in signatures: {e}")
+    return DEFAULT_RULES
+
+
+class RequestScanner:
+    """Matches path, query string and User-Agent against all signatures in one regex pass
+
+    Signatures are case-insensitive literals: 'request' ones match anywhere
+    in the path or query string, 'user_agent' ones in the User-Agent. Hits
+    are counted per signature.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None):
+        rules = load_rules() if rules is None else rules
+        # Lowercased signature -> targets it applies to, and the spelling reported in reasons
+        self.targets: Dict[str, set] = {}
+        self.signatures: Dict[str, str] = {}
+        for target in TARGETS:
+            for signature in rules.get(target, []):
+                if not signature:
+                    continue
+                key = signature.lower()
+                self.targets.setdefault(key, set()).add(target)
+                self.signatures.setdefault(key, signature)
+
+        # Text is lowercased before matching; re.IGNORECASE is several times slower on long alternations
+        self.regex = re.compile(trie_pattern(self.targets)) if self.targets else None
+        self.hits: Counter = Counter()
+        self.scanned = 0
+        self.flagged = 0
+        logger.info(f"🛡️ Request scanner compiled with {len(self.targets)} signatures")
+
+    def scan(self, path: str, query: str, user_agent: str) -> Optional[str]:
+        """Reason the request looks suspicious, or None"""
+        self.scanned += 1
+        if self.regex is None:
+            return None
+
+        request_text = f"{path}{SEPARATOR}{query}".lower()
+        user_agent = user_agent.lower()
+        text = f"{request_text}{SEPARATOR}{user_agent}"
+        user_agent_start = len(request_text) + 1
+        search = self.regex.search
+        match = search(text)
+        while match:
+            target = 'user_agent' if match.start() >= user_agent_start else 'request'
+            key = self._signature_for(match.group(), target)
+            if key:
+                self.flagged += 1
+                self.hits[f"{target}:{self.signatures[key]}"] += 1
+                if target == 'user_agent':
+                    return f"Vulnerability scanner detected: {user_agent}"
+                return f"Suspicious pattern detected: {self.signatures[key]}"
+            # Signature for the other part of the request; keep scanning (overlaps included)
+            match = search(text, match.start() + 1)
+        return None
+
+    def _signature_for(self, matched: str, target: str) -> Optional[str]:
+        """Longest signature for target that the match starts with
+
+        The regex prefers the longest signature at a position; when that one
+        belongs to the other target, a shorter one starting there may still apply.
+        """
+        for end in range(len(matched), 0, -1):
+            key = matched[:end]
+            if target in self.targets.get(key, ()):
+                return key
+        return None
+
+    def get_stats(self) -> Dict:
+        """Scan counts and hits per signature, most frequent first"""
+        return {
+            'signatures': len(self.targets),
+            'scanned': self.scanned,
+            'flagged': self.flagged,
+            'hits': dict(self.hits.most_common())
+        }
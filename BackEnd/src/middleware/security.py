@@ -1,70 +1,60 @@
 """Security middleware for Flight Tracker Collector"""
-import time
+import math
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict
-from fastapi import Request, Response, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .ip_ranges import CloudFrontIPRanges
+from .request_scanner import RequestScanner
+from .rate_limiter import RateLimitResult, RedisRateLimiter, TokenBucketLimiter
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityMiddleware(BaseHTTPMiddleware):
-    """Security middleware with rate limiting and security headers"""
+# Added to every response; header names are lowercase bytes as ASGI expects
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"content-security-policy", b"default-src 'self'; script-src 'self' 'unsafe-inline' cdn.jsdelivr.net; style-src 'self' 'unsafe-inline' cdn.jsdelivr.net; img-src 'self' data: fastapi.tiangolo.com"),
+]
+
+# Response headers replaced by this middleware (and the Server header, which is dropped)
+REPLACED_HEADERS = frozenset(
+    [name for name, _ in SECURITY_HEADERS]
+    + [b"server", b"x-ratelimit-limit", b"x-ratelimit-remaining", b"x-ratelimit-reset"]
+)
+
+
+class SecurityMiddleware:
+    """Security middleware with rate limiting and security headers
     
-    def __init__(self, app, rate_limit_requests: int = 100, rate_limit_window: int = 60):
-        super().__init__(app)
+    Plain ASGI middleware: checks run before the app is called and headers are
+    added to the http.response.start message on the way out, so responses
+    (including streaming ones) pass through without being buffered or wrapped
+    in an extra task as BaseHTTPMiddleware does.
+    """
+    
+    def __init__(self, app: ASGIApp, rate_limit_requests: int = 100, rate_limit_window: int = 60,
+                 distributed_limiter: Optional[Callable[[], Optional[RedisRateLimiter]]] = None,
+                 cloudfront_ranges: Optional[CloudFrontIPRanges] = None,
+                 request_scanner: Optional[RequestScanner] = None):
+        self.app = app
         self.rate_limit_requests = rate_limit_requests
         self.rate_limit_window = rate_limit_window  # seconds
-        self.request_counts: Dict[str, List[float]] = defaultdict(list)
+        # O(1) state per client IP; idle clients are evicted once their bucket refills
+        self.rate_limiter = TokenBucketLimiter(rate_limit_window)
+        # Resolves the Redis-backed limiter shared by all tasks (None = local limits only)
+        self.distributed_limiter = distributed_limiter
         self.security_events: List[Dict] = []
         self.max_security_events = 100  # Keep last 100 events
         
-        # CloudFront IP ranges that should be whitelisted for frontend access
-        # These are common CloudFront edge server IP ranges
-        self.cloudfront_ip_ranges = [
-            "3.33.",        # AWS CloudFront (new range)
-            "13.32.",       # AWS CloudFront
-            "13.35.",       # AWS CloudFront
-            "13.54.",       # AWS CloudFront
-            "13.59.",       # AWS CloudFront
-            "13.224.",      # AWS CloudFront
-            "13.225.",      # AWS CloudFront
-            "13.226.",      # AWS CloudFront
-            "13.227.",      # AWS CloudFront
-            "13.228.",      # AWS CloudFront
-            "15.197.",      # AWS CloudFront (new range)
-            "18.64.",       # AWS CloudFront
-            "18.65.",       # AWS CloudFront
-            "18.66.",       # AWS CloudFront
-            "18.67.",       # AWS CloudFront
-            "18.68.",       # AWS CloudFront
-            "52.46.",       # AWS CloudFront
-            "52.84.",       # AWS CloudFront
-            "52.85.",       # AWS CloudFront
-            "54.192.",      # AWS CloudFront
-            "54.230.",      # AWS CloudFront
-            "54.239.",      # AWS CloudFront
-            "54.240.",      # AWS CloudFront
-            "64.252.",      # AWS CloudFront
-            "65.8.",        # AWS CloudFront
-            "65.9.",        # AWS CloudFront
-            "70.132.",      # AWS CloudFront
-            "99.84.",       # AWS CloudFront
-            "99.86.",       # AWS CloudFront
-            "107.131.",     # Common CloudFront range
-            "108.156.",     # AWS CloudFront
-            "108.157.",     # AWS CloudFront
-            "108.158.",     # AWS CloudFront
-            "130.176.",     # AWS CloudFront
-            "143.204.",     # AWS CloudFront
-            "144.220.",     # AWS CloudFront
-            "204.246.",     # AWS CloudFront
-            "205.251.",     # AWS CloudFront
-            "216.137.",     # AWS CloudFront
-        ]
+        # CloudFront edge ranges (AWS ip-ranges.json) that get the higher frontend limits
+        self.cloudfront_ranges = cloudfront_ranges or CloudFrontIPRanges()
         
         # Frontend endpoints that need higher rate limits (requests per minute)
         self.frontend_endpoints = {
@@ -76,32 +66,29 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             "/api/v1/socal/choppers": 600,   # SoCal helicopters
         }
         
-        # Suspicious patterns to detect
-        self.suspicious_patterns = [
-            ".env", ".git", ".aws", "wp-admin", "phpmyadmin", "admin.php",
-            "XDEBUG", "phpstorm", "eval(", "base64", "shell_exec",
-            "../", "..\\", "%2e%2e", "etc/passwd", "proc/self"
-        ]
+        # Suspicious request signatures (config/security_rules.yaml), matched in one pass
+        self.request_scanner = request_scanner or RequestScanner()
     
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope, headers: Headers) -> str:
         """Get client IP address, considering proxy headers"""
         # Check X-Forwarded-For header (from ALB)
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        forwarded_for = headers.get("X-Forwarded-For")
         if forwarded_for:
             # Use the first IP in the chain
             return forwarded_for.split(",")[0].strip()
         
         # Check X-Real-IP header
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("X-Real-IP")
         if real_ip:
             return real_ip
         
         # Fall back to direct connection IP
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
     
     def _is_cloudfront_ip(self, client_ip: str) -> bool:
         """Check if IP address is from CloudFront"""
-        return any(client_ip.startswith(prefix) for prefix in self.cloudfront_ip_ranges)
+        return self.cloudfront_ranges.contains(client_ip)
     
     def _get_rate_limit_for_path(self, path: str, is_cloudfront: bool) -> int:
         """Get appropriate rate limit for the path"""
@@ -109,44 +96,20 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             return self.frontend_endpoints[path]
         return self.rate_limit_requests
     
-    def _is_rate_limited(self, client_ip: str, request_path: str) -> bool:
-        """Check if client IP is rate limited"""
-        now = time.time()
-        
-        # Determine if this is a CloudFront IP and get appropriate rate limit
-        is_cloudfront = self._is_cloudfront_ip(client_ip)
+    async def _check_rate_limit(self, client_ip: str, request_path: str, is_cloudfront: bool) -> RateLimitResult:
+        """Count this request against the client IP's rate limit (shared via Redis when enabled)"""
         rate_limit = self._get_rate_limit_for_path(request_path, is_cloudfront)
-        
-        # Clean old requests outside the window
-        self.request_counts[client_ip] = [
-            req_time for req_time in self.request_counts[client_ip]
-            if now - req_time < self.rate_limit_window
-        ]
-        
-        # Check if over limit
-        if len(self.request_counts[client_ip]) >= rate_limit:
-            return True
-        
-        # Add current request
-        self.request_counts[client_ip].append(now)
-        return False
+        limiter = self.distributed_limiter() if self.distributed_limiter else None
+        if limiter is not None:
+            result = await limiter.acheck(client_ip, rate_limit, self.rate_limit_window)
+            if result is not None:
+                return result
+        # Local limits when Redis is disabled or unreachable
+        return self.rate_limiter.check(client_ip, rate_limit)
     
-    def _is_suspicious_request(self, request: Request) -> Optional[str]:
+    def _is_suspicious_request(self, path: str, query: str, user_agent: str) -> Optional[str]:
         """Check if request contains suspicious patterns"""
-        # Check URL path
-        path = request.url.path.lower()
-        query = str(request.url.query).lower()
-        
-        for pattern in self.suspicious_patterns:
-            if pattern in path or pattern in query:
-                return f"Suspicious pattern detected: {pattern}"
-        
-        # Check for common vulnerability scanners
-        user_agent = request.headers.get("User-Agent", "").lower()
-        if any(scanner in user_agent for scanner in ["nikto", "sqlmap", "nmap", "masscan"]):
-            return f"Vulnerability scanner detected: {user_agent}"
-        
-        return None
+        return self.request_scanner.scan(path, query, user_agent)
     
     def _log_security_event(self, event_type: str, client_ip: str, details: Dict):
         """Log security event for monitoring"""
@@ -169,119 +132,97 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         """Get recent security events for status endpoint"""
         return self.security_events[-limit:]
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with security checks"""
-        client_ip = self._get_client_ip(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        headers = Headers(scope=scope)
+        path = scope["path"]
+        client_ip = self._get_client_ip(scope, headers)
         is_cloudfront = self._is_cloudfront_ip(client_ip)
         
         # Log CloudFront detection for debugging (all API requests for now)
-        if request.url.path.startswith("/api/v1/"):
-            rate_limit = self._get_rate_limit_for_path(request.url.path, is_cloudfront)
-            logger.info(f"API request: {client_ip} -> {request.url.path} (CloudFront: {is_cloudfront}, rate limit: {rate_limit}/min)")
+        if path.startswith("/api/v1/"):
+            rate_limit = self._get_rate_limit_for_path(path, is_cloudfront)
+            logger.info(f"API request: {client_ip} -> {path} (CloudFront: {is_cloudfront}, rate limit: {rate_limit}/min)")
         
         # Skip rate limiting for health checks from internal AWS IPs
-        if request.url.path == "/health" and client_ip.startswith(("172.", "10.")):
-            response = await call_next(request)
-            return self._add_security_headers(response)
+        if path == "/health" and client_ip.startswith(("172.", "10.")):
+            await self.app(scope, receive, self._send_with_headers(send, None))
+            return
         
         # Check rate limiting
-        if self._is_rate_limited(client_ip, request.url.path):
-            is_cloudfront = self._is_cloudfront_ip(client_ip)
-            rate_limit = self._get_rate_limit_for_path(request.url.path, is_cloudfront)
-            
+        rate_limit_result = await self._check_rate_limit(client_ip, path, is_cloudfront)
+        if not rate_limit_result.allowed:
             self._log_security_event(
                 "rate_limit_exceeded",
                 client_ip,
                 {
-                    "path": request.url.path, 
-                    "method": request.method,
+                    "path": path, 
+                    "method": scope["method"],
                     "is_cloudfront": is_cloudfront,
-                    "rate_limit_used": rate_limit,
-                    "user_agent": request.headers.get("User-Agent", "")[:100]
+                    "rate_limit_used": rate_limit_result.limit,
+                    "user_agent": headers.get("User-Agent", "")[:100]
                 }
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={"detail": "Too many requests. Please try again later."},
                 headers={
-                    "Retry-After": str(self.rate_limit_window),
+                    "Retry-After": str(max(1, math.ceil(rate_limit_result.retry_after))),
                     "Access-Control-Allow-Origin": "*",
                     "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, HEAD, PATCH",
                     "Access-Control-Allow-Headers": "*"
                 }
             )
+            await response(scope, receive, send)
+            return
         
         # Check for suspicious requests
-        suspicious_reason = self._is_suspicious_request(request)
+        user_agent = headers.get("User-Agent", "")
+        suspicious_reason = self._is_suspicious_request(path, scope["query_string"].decode("latin-1"), user_agent)
         if suspicious_reason:
             self._log_security_event(
                 "suspicious_request",
                 client_ip,
                 {
-                    "path": request.url.path,
-                    "method": request.method,
+                    "path": path,
+                    "method": scope["method"],
                     "reason": suspicious_reason,
-                    "user_agent": request.headers.get("User-Agent", "")
+                    "user_agent": user_agent
                 }
             )
             
             # Return 404 for suspicious requests to not reveal information
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=404,
                 content={"detail": "Not found"}
             )
+            await response(scope, receive, send)
+            return
         
-        # Process request
-        response = await call_next(request)
-        
-        # Add security headers
-        response = self._add_security_headers(response)
-        
-        # Add rate limit headers
-        response = self._add_rate_limit_headers(response, client_ip, request.url.path)
-        
-        return response
+        # Process request, adding security and rate limit headers as the response starts
+        await self.app(scope, receive, self._send_with_headers(send, rate_limit_result))
     
-    def _add_security_headers(self, response: Response) -> Response:
-        """Add security headers to response"""
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' 'unsafe-inline' cdn.jsdelivr.net; style-src 'self' 'unsafe-inline' cdn.jsdelivr.net; img-src 'self' data: fastapi.tiangolo.com"
-        
-        # Remove server header if present
-        if "Server" in response.headers:
-            del response.headers["Server"]
-        
-        return response
+    def _send_with_headers(self, send: Send, rate_limit_result: Optional[RateLimitResult]) -> Send:
+        """Wrap send to add security (and rate limit) headers to the response start message"""
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = self._response_headers(message.get("headers", ()), rate_limit_result)
+            await send(message)
+        return send_with_headers
     
-    def _add_rate_limit_headers(self, response: Response, client_ip: str, request_path: str) -> Response:
-        """Add rate limit headers to response"""
-        is_cloudfront = self._is_cloudfront_ip(client_ip)
-        rate_limit = self._get_rate_limit_for_path(request_path, is_cloudfront)
-        
-        # Calculate remaining requests for this IP
-        now = time.time()
-        recent_requests = [
-            req_time for req_time in self.request_counts.get(client_ip, [])
-            if now - req_time < self.rate_limit_window
-        ]
-        remaining = max(0, rate_limit - len(recent_requests))
-        
-        # Calculate reset time (when the window resets)
-        if recent_requests:
-            oldest_request = min(recent_requests)
-            reset_time = int(oldest_request + self.rate_limit_window)
-        else:
-            reset_time = int(now + self.rate_limit_window)
-        
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(rate_limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(reset_time)
-        
-        return response
+    def _response_headers(self, raw_headers, rate_limit_result: Optional[RateLimitResult]) -> List:
+        """Response headers with security headers set, Server removed and rate limit headers added"""
+        response_headers = [header for header in raw_headers if header[0].lower() not in REPLACED_HEADERS]
+        response_headers.extend(SECURITY_HEADERS)
+        if rate_limit_result is not None:
+            response_headers.append((b"x-ratelimit-limit", str(rate_limit_result.limit).encode()))
+            response_headers.append((b"x-ratelimit-remaining", str(rate_limit_result.remaining).encode()))
+            response_headers.append((b"x-ratelimit-reset", str(rate_limit_result.reset).encode()))
+        return response_headers
 
 
 class CloudWatchAlarmsService:
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Optional, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
@@ -49,6 +50,128 @@ class Aircraft(BaseModel):
         }
 
 
+def _to_int(value) -> Optional[int]:
+    """Lenient int conversion (dump1090 reports e.g. alt_baro="ground")"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+
+def _to_float(value) -> Optional[float]:
+    """Lenient float conversion"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class AircraftRecord:
+    """Lightweight aircraft record for the collection hot path
+    
+    Carries the same fields as the Aircraft model without pydantic validation.
+    Collectors, DataBlender and RedisService pass these around; the Aircraft
+    model is only used at the API boundary. The duplicate manufacturer alias
+    is a single field here and is serialized under both names.
+    """
+    hex: str
+    flight: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    alt_baro: Optional[int] = None
+    alt_geom: Optional[int] = None
+    gs: Optional[float] = None
+    track: Optional[float] = None
+    baro_rate: Optional[float] = None
+    squawk: Optional[str] = None
+    on_ground: bool = False
+    seen: Optional[float] = None
+    rssi: Optional[float] = None
+    messages: Optional[int] = None
+    distance_miles: Optional[float] = None
+    data_source: str = ""
+    registration: Optional[str] = None
+    model: Optional[str] = None
+    operator: Optional[str] = None
+    manufacturer: Optional[str] = None
+    typecode: Optional[str] = None
+    owner: Optional[str] = None
+    aircraft_type: Optional[str] = None
+    icao_aircraft_class: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "AircraftRecord":
+        """Build a record from a loosely-typed dict (e.g. stored Pi station data)"""
+        hex_code = data.get('hex')
+        if not hex_code:
+            raise ValueError("Aircraft record requires a hex code")
+        
+        return cls(
+            hex=str(hex_code),
+            flight=data.get('flight'),
+            lat=_to_float(data.get('lat')),
+            lon=_to_float(data.get('lon')),
+            alt_baro=_to_int(data.get('alt_baro')),
+            alt_geom=_to_int(data.get('alt_geom')),
+            gs=_to_float(data.get('gs')),
+            track=_to_float(data.get('track')),
+            baro_rate=_to_float(data.get('baro_rate')),
+            squawk=data.get('squawk'),
+            on_ground=bool(data.get('on_ground', False)),
+            seen=_to_float(data.get('seen')),
+            rssi=_to_float(data.get('rssi')),
+            messages=_to_int(data.get('messages')),
+            distance_miles=_to_float(data.get('distance_miles')),
+            data_source=data.get('data_source') or "",
+            registration=data.get('registration'),
+            model=data.get('model'),
+            operator=data.get('operator'),
+            manufacturer=data.get('manufacturer') or data.get('manufacturerName') or data.get('manufacturer_name'),
+            typecode=data.get('typecode'),
+            owner=data.get('owner'),
+            aircraft_type=data.get('aircraft_type'),
+            icao_aircraft_class=data.get('icao_aircraft_class')
+        )
+    
+    def to_dict(self) -> dict:
+        """Serialize with the same keys as Aircraft.dict()"""
+        return {
+            'hex': self.hex,
+            'flight': self.flight,
+            'lat': self.lat,
+            'lon': self.lon,
+            'alt_baro': self.alt_baro,
+            'alt_geom': self.alt_geom,
+            'gs': self.gs,
+            'track': self.track,
+            'baro_rate': self.baro_rate,
+            'squawk': self.squawk,
+            'on_ground': self.on_ground,
+            'seen': self.seen,
+            'rssi': self.rssi,
+            'messages': self.messages,
+            'distance_miles': self.distance_miles,
+            'data_source': self.data_source,
+            'registration': self.registration,
+            'model': self.model,
+            'operator': self.operator,
+            'manufacturer_name': self.manufacturer,
+            'manufacturer': self.manufacturer,
+            'typecode': self.typecode,
+            'owner': self.owner,
+            'aircraft_type': self.aircraft_type,
+            'icao_aircraft_class': self.icao_aircraft_class
+        }
+
+
 class AircraftResponse(BaseModel):
     timestamp: datetime
     aircraft_count: int
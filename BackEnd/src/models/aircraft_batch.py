@@ -0,0 +1,374 @@
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .aircraft import AircraftRecord
+
+# Missing-value sentinels for integer columns (float columns use NaN)
+INT_MISSING = np.iinfo(np.int32).min
+
+# Non-ICAO addresses (TIS-B/ADS-R, reported as "~abc123") are flagged above the 24-bit ICAO range
+NON_ICAO_FLAG = 1 << 24
+
+INT32_MAX = np.iinfo(np.int32).max
+
+# Sources whose records have always been published with upper-case hex (others are lower-case)
+UPPERCASE_HEX_SOURCES = frozenset({'dump1090'})
+
+# Database fields a Pi station may already have filled in, carried through blending unchanged
+ENRICHMENT_FIELDS = ('registration', 'model', 'operator', 'manufacturer', 'typecode',
+                     'owner', 'aircraft_type', 'icao_aircraft_class')
+
+
+def parse_hex(hex_code) -> int:
+    """Parse an ICAO hex string to its integer key, or -1 if invalid"""
+    if not hex_code:
+        return -1
+    try:
+        if hex_code[0] == '~':
+            return int(hex_code[1:], 16) | NON_ICAO_FLAG
+        value = int(hex_code, 16)
+    except (TypeError, ValueError):
+        return -1
+    return value if value < NON_ICAO_FLAG else -1
+
+
+def format_hex(value: int) -> str:
+    """Format an integer ICAO key back to its lowercase hex string (the key format used in Redis)"""
+    if value & NON_ICAO_FLAG:
+        return f"~{value & 0xFFFFFF:06x}"
+    return f"{value:06x}"
+
+
+def _number(value) -> float:
+    """A finite JSON number as float, or NaN for anything else (None, "ground", garbage, inf)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    try:
+        value = float(value)
+    except OverflowError:
+        return math.nan
+    return value if math.isfinite(value) else math.nan
+
+
+def _float_column(values: Iterable, dtype) -> np.ndarray:
+    """Build a float column, mapping None/non-numeric/out-of-range values to NaN"""
+    column = np.array([_number(value) for value in values], dtype=np.float64)
+    if dtype is not np.float64:
+        # Values beyond float32 range would become inf
+        column[np.abs(column) > np.finfo(dtype).max] = np.nan
+    return column.astype(dtype)
+
+
+def _int_column(values: Iterable) -> np.ndarray:
+    """Build an int32 column, mapping None/non-numeric (e.g. "ground")/out-of-range values to INT_MISSING"""
+    column = []
+    for value in values:
+        value = _number(value)
+        column.append(int(value) if abs(value) <= INT32_MAX else INT_MISSING)
+    return np.array(column, dtype=np.int32)
+
+
+def _string(value) -> Optional[str]:
+    """A stripped string field, or None for missing/non-string values"""
+    return value.strip() if isinstance(value, str) else None
+
+
+def _float_to_int_column(values: np.ndarray) -> np.ndarray:
+    """Truncate a float column to int32, keeping NaN as INT_MISSING"""
+    result = np.full(len(values), INT_MISSING, dtype=np.int32)
+    present = ~np.isnan(values) & (np.abs(values) <= INT32_MAX)
+    result[present] = np.trunc(values[present]).astype(np.int32)
+    return result
+
+
+def _floats(column: np.ndarray, decimals: Optional[int] = None) -> List[Optional[float]]:
+    """Column to Python floats with None for NaN"""
+    values = column.astype(np.float64)
+    if decimals is not None:
+        values = np.round(values, decimals)
+    return [None if v != v else v for v in values.tolist()]
+
+
+def _ints(column: np.ndarray) -> List[Optional[int]]:
+    """Column to Python ints with None for INT_MISSING"""
+    return [None if v == INT_MISSING else v for v in column.tolist()]
+
+
+class AircraftBatch:
+    """Struct-of-arrays container for one collection cycle of aircraft
+
+    Numeric fields are stored as parallel typed NumPy columns so distance
+    math, filtering, blending and sorting operate on whole columns. Strings
+    (callsign, squawk and any database fields a Pi station already sent) are
+    kept in object columns and the data source is a small integer index into
+    ``sources``. ``received_at`` is the epoch time
+    of each row's last message (fetch time minus ``seen``).
+    """
+
+    NUMERIC_COLUMNS = {
+        'hex': np.uint32,
+        'lat': np.float64,
+        'lon': np.float64,
+        'alt_baro': np.int32,
+        'alt_geom': np.int32,
+        'gs': np.float32,
+        'track': np.float32,
+        'baro_rate': np.float32,
+        'on_ground': np.bool_,
+        'seen': np.float32,
+        'rssi': np.float32,
+        'messages': np.int32,
+        'distance': np.float32,
+        'received_at': np.float64,
+        'source': np.uint8,
+    }
+    OBJECT_COLUMNS = ('flight', 'squawk') + ENRICHMENT_FIELDS
+    COLUMNS = tuple(NUMERIC_COLUMNS) + OBJECT_COLUMNS
+
+    __slots__ = COLUMNS + ('sources',)
+
+    def __init__(self, sources: Optional[List[str]] = None, **columns):
+        self.sources = list(sources or [])
+        size = len(next(iter(columns.values()))) if columns else 0
+
+        for name, dtype in self.NUMERIC_COLUMNS.items():
+            if name in columns:
+                setattr(self, name, np.asarray(columns[name], dtype=dtype))
+            elif dtype in (np.float32, np.float64):
+                setattr(self, name, np.full(size, np.nan, dtype=dtype))
+            elif dtype is np.int32:
+                setattr(self, name, np.full(size, INT_MISSING, dtype=dtype))
+            else:
+                setattr(self, name, np.zeros(size, dtype=dtype))
+
+        for name in self.OBJECT_COLUMNS:
+            if name in columns:
+                setattr(self, name, np.asarray(columns[name], dtype=object))
+            else:
+                setattr(self, name, np.full(size, None, dtype=object))
+
+    def __len__(self) -> int:
+        return len(self.hex)
+
+    def __repr__(self) -> str:
+        return f"AircraftBatch({len(self)} aircraft, sources={self.sources})"
+
+    @classmethod
+    def empty(cls) -> "AircraftBatch":
+        return cls()
+
+    @classmethod
+    def from_dump1090(cls, aircraft_data: Sequence[dict], now: Optional[float] = None,
+                      source: str = "dump1090") -> "AircraftBatch":
+        """Build a batch straight from the dump1090/tar1090 ``aircraft`` list
+
+        Malformed fields are treated as missing and rows that are not objects
+        or lack a valid hex code are dropped, so one bad row never costs the
+        rest of the cycle.
+        """
+        now = time.time() if now is None else now
+        aircraft_data = [a for a in aircraft_data if isinstance(a, dict)]
+        hex_keys = np.array([parse_hex(a.get('hex')) for a in aircraft_data], dtype=np.int64)
+        keep = np.flatnonzero(hex_keys >= 0)
+        rows = [aircraft_data[i] for i in keep.tolist()]
+
+        alt_baro_raw = [a.get('alt_baro') for a in rows]
+        on_ground = np.array([bool(a.get('on_ground', False)) for a in rows], dtype=np.bool_)
+        # dump1090 reports alt_baro as "ground" for aircraft on the ground
+        on_ground |= np.array([alt == 'ground' for alt in alt_baro_raw], dtype=np.bool_)
+        seen = _float_column((a.get('seen') for a in rows), np.float32)
+
+        return cls(
+            sources=[source],
+            hex=hex_keys[keep],
+            lat=_float_column((a.get('lat') for a in rows), np.float64),
+            lon=_float_column((a.get('lon') for a in rows), np.float64),
+            alt_baro=_int_column(alt_baro_raw),
+            alt_geom=_int_column(a.get('alt_geom') for a in rows),
+            gs=_float_column((a.get('gs') for a in rows), np.float32),
+            track=_float_column((a.get('track') for a in rows), np.float32),
+            baro_rate=_float_column((a.get('baro_rate') for a in rows), np.float32),
+            on_ground=on_ground,
+            seen=seen,
+            rssi=_float_column((a.get('rssi') for a in rows), np.float32),
+            messages=_int_column(a.get('messages') for a in rows),
+            received_at=now - np.nan_to_num(seen.astype(np.float64)),
+            source=np.zeros(len(rows), dtype=np.uint8),
+            flight=[_string(a.get('flight')) or '' for a in rows],
+            squawk=[_string(a.get('squawk')) for a in rows]
+        )
+
+    @classmethod
+    def from_opensky(cls, states: Sequence[list], now: Optional[float] = None,
+                     source: str = "opensky") -> "AircraftBatch":
+        """Build a batch straight from OpenSky state vectors, converting units per column
+
+        Only state vectors with a hex code and position are kept; malformed
+        fields are treated as missing.
+        """
+        now = time.time() if now is None else now
+        states = [s for s in states if isinstance(s, (list, tuple)) and len(s) >= 15]
+
+        hex_keys = np.array([parse_hex(s[0]) for s in states], dtype=np.int64)
+        lat = _float_column((s[6] for s in states), np.float64)
+        lon = _float_column((s[5] for s in states), np.float64)
+        keep = np.flatnonzero((hex_keys >= 0) & ~np.isnan(lat) & ~np.isnan(lon))
+        states = [states[i] for i in keep.tolist()]
+
+        baro_alt_m = _float_column((s[7] for s in states), np.float64)
+        geo_alt_m = _float_column((s[13] for s in states), np.float64)
+        velocity = _float_column((s[9] for s in states), np.float64)
+        true_track = _float_column((s[10] for s in states), np.float64)
+        vertical_rate = _float_column((s[11] for s in states), np.float64)
+        last_contact = _float_column((s[4] for s in states), np.float64)
+
+        # Absurd values overflow to inf during unit conversion and are then dropped as missing
+        with np.errstate(over='ignore'):
+            alt_baro = _float_to_int_column(baro_alt_m * 3.28084)  # meters -> feet
+            alt_geom = _float_to_int_column(geo_alt_m * 3.28084)
+            gs = np.round(velocity * 1.94384, 1)  # m/s -> knots
+            baro_rate = np.round(vertical_rate * 196.85, 1)  # m/s -> ft/min
+
+        return cls(
+            sources=[source],
+            hex=hex_keys[keep],
+            lat=lat[keep],
+            lon=lon[keep],
+            alt_baro=alt_baro,
+            alt_geom=alt_geom,
+            gs=gs,
+            track=np.round(true_track, 1),
+            baro_rate=baro_rate,
+            on_ground=np.array([bool(s[8]) for s in states], dtype=np.bool_),
+            seen=np.trunc(now - last_contact),  # time since last contact
+            received_at=np.where(np.isnan(last_contact), now, last_contact),
+            source=np.zeros(len(states), dtype=np.uint8),
+            flight=[_string(s[1]) or '' for s in states],
+            squawk=[_string(s[14]) or None for s in states]
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[AircraftRecord], now: Optional[float] = None) -> "AircraftBatch":
+        """Build a batch from records (e.g. Pi station data read back from Redis)
+
+        ``seen`` is taken as relative to ``now``.
+        """
+        now = time.time() if now is None else now
+        hex_keys = np.array([parse_hex(r.hex) for r in records], dtype=np.int64)
+        keep = np.flatnonzero(hex_keys >= 0)
+        records = [records[i] for i in keep.tolist()]
+
+        sources: Dict[str, int] = {}
+        source_ids = [sources.setdefault(r.data_source, len(sources)) for r in records]
+        seen = _float_column((r.seen for r in records), np.float32)
+
+        return cls(
+            sources=list(sources),
+            hex=hex_keys[keep],
+            lat=_float_column((r.lat for r in records), np.float64),
+            lon=_float_column((r.lon for r in records), np.float64),
+            alt_baro=_int_column(r.alt_baro for r in records),
+            alt_geom=_int_column(r.alt_geom for r in records),
+            gs=_float_column((r.gs for r in records), np.float32),
+            track=_float_column((r.track for r in records), np.float32),
+            baro_rate=_float_column((r.baro_rate for r in records), np.float32),
+            on_ground=np.array([bool(r.on_ground) for r in records], dtype=np.bool_),
+            seen=seen,
+            rssi=_float_column((r.rssi for r in records), np.float32),
+            messages=_int_column(r.messages for r in records),
+            distance=_float_column((r.distance_miles for r in records), np.float32),
+            received_at=now - np.nan_to_num(seen.astype(np.float64)),
+            source=np.array(source_ids, dtype=np.uint8),
+            flight=[r.flight for r in records],
+            squawk=[r.squawk for r in records],
+            **{field: [getattr(r, field) for r in records] for field in ENRICHMENT_FIELDS}
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["AircraftBatch"]) -> "AircraftBatch":
+        """Concatenate batches, merging their source tables"""
+        batches = [b for b in batches if b is not None]
+        if not batches:
+            return cls()
+        if len(batches) == 1:
+            return batches[0]
+
+        sources: Dict[str, int] = {}
+        source_columns = []
+        for batch in batches:
+            remap = np.array([sources.setdefault(name, len(sources)) for name in batch.sources] or [0],
+                             dtype=np.uint8)
+            source_columns.append(remap[batch.source])
+
+        columns = {name: np.concatenate([getattr(b, name) for b in batches]) for name in cls.COLUMNS}
+        columns['source'] = np.concatenate(source_columns)
+        return cls(sources=list(sources), **columns)
+
+    def take(self, indices) -> "AircraftBatch":
+        """New batch with the rows at ``indices`` (or a boolean mask), in that order"""
+        return AircraftBatch(
+            sources=self.sources,
+            **{name: getattr(self, name)[indices] for name in self.COLUMNS}
+        )
+
+    def has_quality_position(self) -> np.ndarray:
+        """Mask of rows with position, altitude, speed and track"""
+        return (
+            ~np.isnan(self.lat) &
+            ~np.isnan(self.lon) &
+            (self.alt_baro != INT_MISSING) &
+            ~np.isnan(self.gs) &
+            ~np.isnan(self.track)
+        )
+
+    def source_names(self) -> np.ndarray:
+        """Per-row data source names"""
+        return np.array(self.sources or [''], dtype=object)[self.source]
+
+    def hex_codes(self) -> List[str]:
+        """Per-row hex strings"""
+        return [format_hex(value) for value in self.hex.tolist()]
+
+    def output_hex_codes(self) -> List[str]:
+        """Per-row hex strings in the casing each source publishes"""
+        return [hex_code.upper() if source in UPPERCASE_HEX_SOURCES else hex_code
+                for hex_code, source in zip(self.hex_codes(), self.source_names().tolist())]
+
+    def to_records(self) -> List[AircraftRecord]:
+        """Materialize rows as AircraftRecord objects, converting column by column"""
+        columns = zip(
+            self.output_hex_codes(),
+            self.flight.tolist(),
+            _floats(self.lat),
+            _floats(self.lon),
+            _ints(self.alt_baro),
+            _ints(self.alt_geom),
+            _floats(self.gs, 2),
+            _floats(self.track, 2),
+            _floats(self.baro_rate, 1),
+            self.squawk.tolist(),
+            self.on_ground.tolist(),
+            _floats(self.seen, 1),
+            _floats(self.rssi, 1),
+            _ints(self.messages),
+            _floats(self.distance, 1),
+            self.source_names().tolist(),
+            zip(*(getattr(self, field).tolist() for field in ENRICHMENT_FIELDS))
+        )
+        return [
+            AircraftRecord(
+                hex=hex_code, flight=flight, lat=lat, lon=lon, alt_baro=alt_baro,
+                alt_geom=alt_geom, gs=gs, track=track, baro_rate=baro_rate, squawk=squawk,
+                on_ground=on_ground, seen=seen, rssi=rssi, messages=messages,
+                distance_miles=distance, data_source=data_source, **dict(zip(ENRICHMENT_FIELDS, enrichment))
+            )
+            for (hex_code, flight, lat, lon, alt_baro, alt_geom, gs, track, baro_rate,
+                 squawk, on_ground, seen, rssi, messages, distance, data_source, enrichment) in columns
+        ]
+
+    def to_dicts(self) -> List[dict]:
+        """Serialize rows with the same keys as AircraftRecord.to_dict()"""
+        return [record.to_dict() for record in self.to_records()]
@@ -1,20 +1,220 @@
 import logging
+import numpy as np
 import pandas as pd
 from typing import Dict, Optional, List
 import os
+import time
+from collections import OrderedDict
+from datetime import datetime
 from pathlib import Path
 
+from .aircraft_registry import AircraftRegistry, icao_to_key, write_registry
+
 logger = logging.getLogger(__name__)
 
+# Compact Redis layout: records are packed into hash buckets keyed by ICAO prefix
+# (aircraft_db:b:{first 4 hex chars} -> {last 2 hex chars: packed record}), so ~500k
+# aircraft live in at most 65536 small listpack-encoded hashes instead of one hash each.
+REDIS_DB_VERSION = "2"
+REDIS_META_KEY = "aircraft_db:meta"
+REDIS_BUCKET_PREFIX = "aircraft_db:b:"
+BUCKET_PREFIX_LENGTH = 4
+
+# Record fields in packed order, joined with the ASCII unit separator
+AIRCRAFT_INFO_FIELDS = (
+    'registration', 'manufacturerName', 'model', 'icaoAircraftClass',
+    'typecode', 'operator', 'owner'
+)
+FIELD_SEPARATOR = '\x1f'
+
+
+def normalize_icao(hex_code: str) -> str:
+    """Normalize a hex code for database lookups"""
+    return hex_code.upper().replace('~', '').strip()
+
+
+def bucket_location(icao: str):
+    """Redis bucket key and field for a normalized ICAO hex code"""
+    return REDIS_BUCKET_PREFIX + icao[:BUCKET_PREFIX_LENGTH], icao[BUCKET_PREFIX_LENGTH:]
+
+
+def pack_aircraft_info(info: Dict[str, str]) -> str:
+    """Pack an aircraft info dict into a single string"""
+    return FIELD_SEPARATOR.join(
+        (info.get(field) or '').replace(FIELD_SEPARATOR, ' ') for field in AIRCRAFT_INFO_FIELDS
+    )
+
+
+def unpack_aircraft_info(packed: str) -> Dict[str, str]:
+    """Unpack a string produced by pack_aircraft_info"""
+    values = packed.split(FIELD_SEPARATOR)
+    values += [''] * (len(AIRCRAFT_INFO_FIELDS) - len(values))
+    return dict(zip(AIRCRAFT_INFO_FIELDS, values))
+
+
+# Binary registry compiled from the CSV by scripts/load_aircraft_db.py --build-registry
+REGISTRY_FILENAME = "aircraftRegistry.bin"
+
+# CSV column candidates for each record field, in order of preference
+FIELD_COLUMNS = {
+    'registration': ['registration', 'Registration', 'reg'],
+    'manufacturerName': ['manufacturerName', 'manufacturerIcao', 'manufacturer', 'Manufacturer', 'mfr'],
+    'model': ['model', 'Model', 'type'],
+    'icaoAircraftClass': ['icaoAircraftClass', 'typecode', 'TypeCode', 'aircraft_type'],
+    'typecode': ['typecode', 'TypeCode', 'type_code'],
+    'operator': ['operator', 'Operator', 'airline'],
+    'owner': ['owner', 'Owner', 'registered_owner']
+}
+
+
+def read_aircraft_csv(db_file) -> Optional[pd.DataFrame]:
+    """Parse the aircraft database CSV into a DataFrame indexed by upper-case ICAO hex"""
+    # Parse CSV with flexible quoting
+    parse_attempts = [
+        {'sep': ',', 'quoting': 1, 'skipinitialspace': True, 'on_bad_lines': 'skip'},
+        {'sep': ',', 'quoting': 0, 'skipinitialspace': True, 'on_bad_lines': 'skip'},
+        {'sep': ',', 'quoting': 1, 'skipinitialspace': True, 'encoding': 'utf-8-sig', 'on_bad_lines': 'skip'}
+    ]
+    
+    df = None
+    for params in parse_attempts:
+        try:
+            df = pd.read_csv(db_file, dtype=str, **params)
+            break
+        except Exception:
+            continue
+    
+    if df is None:
+        logger.error("Failed to parse aircraft database CSV")
+        return None
+    
+    # Clean column names and single-quoted values (OpenSky quotes every field with ')
+    df.columns = [col.strip().strip("'").strip('"') for col in df.columns]
+    for col in df.columns:
+        df[col] = df[col].str.strip("'")
+    
+    # Find ICAO column
+    icao_col = None
+    for col in ['icao24', 'ICAO24', 'icao', 'ICAO', 'hex', 'HEX']:
+        if col in df.columns:
+            icao_col = col
+            break
+    
+    if not icao_col:
+        logger.error("No ICAO column found in aircraft database")
+        return None
+    
+    # Clean and index by ICAO
+    df[icao_col] = df[icao_col].astype(str).str.upper().str.strip()
+    df = df[df[icao_col].notna()]
+    df = df[df[icao_col] != '']
+    df = df[df[icao_col] != 'NAN']
+    df.set_index(icao_col, inplace=True)
+    return df
+
+
+def extract_aircraft_fields(df: pd.DataFrame) -> pd.DataFrame:
+    """Resolve every record field column-wise (first non-empty candidate column wins)"""
+    fields = pd.DataFrame(index=df.index)
+    for field, candidates in FIELD_COLUMNS.items():
+        values = pd.Series('', index=df.index, dtype=object)
+        for column in reversed(candidates):
+            if column in df.columns:
+                candidate = df[column].fillna('').astype(str).str.strip()
+                values = candidate.where(candidate != '', values)
+        fields[field] = values
+    return fields
+
+
+def pack_aircraft_frame(df: pd.DataFrame) -> pd.Series:
+    """Packed record strings for every row of a parsed aircraft CSV"""
+    fields = extract_aircraft_fields(df)
+    packed = fields[list(AIRCRAFT_INFO_FIELDS)[0]].str.replace(FIELD_SEPARATOR, ' ', regex=False)
+    for field in AIRCRAFT_INFO_FIELDS[1:]:
+        packed = packed + FIELD_SEPARATOR + fields[field].str.replace(FIELD_SEPARATOR, ' ', regex=False)
+    return packed
+
+
+def build_registry(csv_file, output_file) -> int:
+    """Compile the aircraft CSV into a sorted, memory-mappable binary registry"""
+    df = read_aircraft_csv(csv_file)
+    if df is None:
+        return 0
+    
+    packed = pack_aircraft_frame(df)
+    keys = np.array([icao_to_key(icao) for icao in packed.index], dtype=np.int64)
+    valid = keys >= 0
+    if not valid.all():
+        logger.info(f"Skipping {int((~valid).sum())} rows with invalid ICAO addresses")
+    
+    return write_registry(output_file, keys[valid], packed.to_numpy()[valid].tolist())
+
+
+class LookupCache:
+    """Bounded LRU cache of lookup results with separate TTLs for hits and misses"""
+    
+    def __init__(self, max_size: int = 10000, ttl: float = 3600, negative_ttl: float = 300):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'negative_hits': 0, 'evictions': 0, 'expirations': 0}
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Dict[str, str]]:
+        """Cached result for a key, or None on a miss (counts hits/misses)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        
+        result, expires_at, negative = entry
+        if (now if now is not None else time.monotonic()) >= expires_at:
+            del self.entries[key]
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return None
+        
+        self.entries.move_to_end(key)
+        self.stats['hits'] += 1
+        if negative:
+            self.stats['negative_hits'] += 1
+        return result
+    
+    def put(self, key: str, result: Dict[str, str], now: Optional[float] = None):
+        """Store a result; empty results are cached as negatives with the shorter TTL"""
+        negative = not any(result.values())
+        ttl = self.negative_ttl if negative else self.ttl
+        if ttl <= 0:
+            return
+        
+        now = now if now is not None else time.monotonic()
+        self.entries[key] = (result, now + ttl, negative)
+        self.entries.move_to_end(key)
+        
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+    
+    def clear(self):
+        self.entries.clear()
+
 
 class AircraftDatabase:
     """Service for looking up aircraft information by ICAO hex code"""
     
-    def __init__(self, redis_service=None):
+    def __init__(self, redis_service=None, cache_config: Optional[Dict] = None):
         self.redis_service = redis_service
-        self.aircraft_cache = {}
-        self.cache_stats = {'hits': 0, 'misses': 0}
+        cache_config = cache_config or {}
+        self.aircraft_cache = LookupCache(
+            max_size=cache_config.get('cache_size', 10000),
+            ttl=cache_config.get('cache_ttl', 3600),
+            negative_ttl=cache_config.get('negative_cache_ttl', 300)
+        )
         self.aircraft_db = None
+        self.registry: Optional[AircraftRegistry] = None
         
         # Try multiple possible paths for the CSV file
         possible_paths = [
@@ -30,6 +230,14 @@ class AircraftDatabase:
                 self.db_file = path
                 break
         
+        # The compiled registry lives next to the CSV
+        self.registry_file = None
+        for path in possible_paths:
+            registry_path = path.with_name(REGISTRY_FILENAME)
+            if registry_path.exists():
+                self.registry_file = registry_path
+                break
+        
         if not self.db_file:
             logger.warning(f"Aircraft database CSV not found in any of these locations: {[str(p) for p in possible_paths]}")
         else:
@@ -39,12 +247,23 @@ class AircraftDatabase:
         self.setup_database()
     
     def setup_database(self):
-        """Setup aircraft database - try Redis first, then fallback to CSV"""
+        """Setup aircraft database - try Redis first, then the binary registry, then CSV"""
+        # The mmap registry is cheap to open and backs Redis if it goes away
+        self._open_registry()
+        
         # Check if we have aircraft data in Redis
         if self.redis_service and self._check_redis_database():
             logger.info("✅ Using aircraft database from Redis")
             return
         
+        if self.registry is not None:
+            if self.redis_service:
+                logger.info("📤 Importing aircraft registry to Redis for faster lookups")
+                self._import_to_redis()
+            else:
+                logger.info("✅ Aircraft database served from binary registry (Redis not available)")
+            return
+        
         # Otherwise, load from CSV and optionally import to Redis
         if self._load_csv_database():
             if self.redis_service:
@@ -56,13 +275,41 @@ class AircraftDatabase:
             logger.warning("⚠️  No aircraft database available - aircraft enrichment will be limited")
             logger.warning("   Flight tracking will continue but without registration, model, operator data")
     
+    def _open_registry(self):
+        """Memory-map the compiled registry if present and not older than the CSV"""
+        if not self.registry_file:
+            if self.db_file:
+                logger.warning(f"No aircraft registry next to {self.db_file} - lookups will load the CSV "
+                              f"(build it with scripts/load_aircraft_db.py --build-registry)")
+            return
+        
+        try:
+            if self.db_file and self.db_file.stat().st_mtime > self.registry_file.stat().st_mtime:
+                logger.warning(f"Aircraft registry {self.registry_file} is older than {self.db_file} - "
+                              f"ignoring it (rebuild with scripts/load_aircraft_db.py --build-registry)")
+                return
+            
+            self.registry = AircraftRegistry(self.registry_file)
+            logger.info(f"Mapped aircraft registry with {len(self.registry)} records from {self.registry_file}")
+        except Exception as e:
+            logger.error(f"Error opening aircraft registry: {e}")
+            self.registry = None
+    
     def _check_redis_database(self) -> bool:
-        """Check if aircraft database exists in Redis"""
+        """Check if aircraft database exists in Redis (O(1) sentinel read, no KEYS)"""
         try:
-            # Check for aircraft keys
-            aircraft_keys = self.redis_service.redis_client.keys("aircraft_db:*")
-            if len(aircraft_keys) > 1000:  # Threshold for valid database
-                logger.info(f"Found {len(aircraft_keys)} aircraft records in Redis")
+            meta = self.redis_service.redis_client.hgetall(REDIS_META_KEY)
+            if not meta:
+                return False
+            
+            if meta.get('version') != REDIS_DB_VERSION:
+                logger.info(f"Aircraft database in Redis has layout version {meta.get('version')}, "
+                           f"expected {REDIS_DB_VERSION} - reimporting")
+                return False
+            
+            records = int(meta.get('records', 0))
+            if records > 1000:  # Threshold for valid database
+                logger.info(f"Found {records} aircraft records in Redis (imported {meta.get('imported_at', 'unknown')})")
                 return True
             return False
         except Exception as e:
@@ -79,46 +326,10 @@ class AircraftDatabase:
             
             logger.info(f"Loading aircraft database from {self.db_file}")
             
-            # Parse CSV with flexible quoting
-            parse_attempts = [
-                {'sep': ',', 'quoting': 1, 'skipinitialspace': True, 'on_bad_lines': 'skip'},
-                {'sep': ',', 'quoting': 0, 'skipinitialspace': True, 'on_bad_lines': 'skip'},
-                {'sep': ',', 'quoting': 1, 'skipinitialspace': True, 'encoding': 'utf-8-sig', 'on_bad_lines': 'skip'}
-            ]
-            
-            df = None
-            for params in parse_attempts:
-                try:
-                    df = pd.read_csv(self.db_file, dtype=str, **params)
-                    break
-                except Exception:
-                    continue
-            
+            df = read_aircraft_csv(self.db_file)
             if df is None:
-                logger.error("Failed to parse aircraft database CSV")
-                return False
-            
-            # Clean column names
-            df.columns = [col.strip().strip("'").strip('"') for col in df.columns]
-            
-            # Find ICAO column
-            icao_col = None
-            for col in ['icao24', 'ICAO24', 'icao', 'ICAO', 'hex', 'HEX']:
-                if col in df.columns:
-                    icao_col = col
-                    break
-            
-            if not icao_col:
-                logger.error("No ICAO column found in aircraft database")
                 return False
             
-            # Clean and index by ICAO
-            df[icao_col] = df[icao_col].astype(str).str.upper().str.strip()
-            df = df[df[icao_col].notna()]
-            df = df[df[icao_col] != '']
-            df = df[df[icao_col] != 'NAN']
-            df.set_index(icao_col, inplace=True)
-            
             self.aircraft_db = df
             logger.info(f"Loaded aircraft database with {len(df)} records")
             return True
@@ -128,60 +339,90 @@ class AircraftDatabase:
             return False
     
     def _import_to_redis(self):
-        """Import CSV database to Redis"""
-        if self.aircraft_db is None or not self.redis_service:
+        """Import the aircraft database to Redis as packed prefix buckets plus a version sentinel"""
+        if not self.redis_service or (self.aircraft_db is None and self.registry is None):
             return
         
         try:
-            imported = 0
-            batch_size = 1000
-            pipeline = self.redis_service.redis_client.pipeline()
+            if self.registry is not None:
+                records = self.registry.iter_records()
+            else:
+                records = pack_aircraft_frame(self.aircraft_db).items()
             
-            for icao, row in self.aircraft_db.iterrows():
-                # Create aircraft data
-                aircraft_data = {
-                    'registration': str(row.get('registration', '')).strip(),
-                    'manufacturerName': str(row.get('manufacturerName', '') or 
-                                          row.get('manufacturerIcao', '') or 
-                                          row.get('manufacturer', '')).strip(),
-                    'model': str(row.get('model', '')).strip(),
-                    'icaoAircraftClass': str(row.get('icaoAircraftClass', '') or 
-                                           row.get('typecode', '')).strip(),
-                    'typecode': str(row.get('typecode', '')).strip(),
-                    'operator': str(row.get('operator', '')).strip(),
-                    'owner': str(row.get('owner', '')).strip()
-                }
-                
-                # Add to Redis pipeline
-                key = f"aircraft_db:{icao}"
-                pipeline.hset(key, mapping=aircraft_data)
-                imported += 1
+            # Group packed records by bucket
+            buckets: Dict[str, Dict[str, str]] = {}
+            for icao, packed in records:
+                icao = normalize_icao(str(icao))
+                if len(icao) <= BUCKET_PREFIX_LENGTH:
+                    continue
                 
-                # Execute batch
-                if imported % batch_size == 0:
-                    pipeline.execute()
-                    pipeline = self.redis_service.redis_client.pipeline()
+                bucket_key, field = bucket_location(icao)
+                buckets.setdefault(bucket_key, {})[field] = packed
             
-            # Execute remaining
-            if imported % batch_size != 0:
-                pipeline.execute()
+            self.import_buckets(buckets)
             
-            logger.info(f"Imported {imported} aircraft to Redis")
+            # Remove per-aircraft hashes left over from the old layout
+            self.purge_legacy_keys()
             
         except Exception as e:
             logger.error(f"Aircraft database import to Redis failed: {e}")
     
+    def import_buckets(self, buckets: Dict[str, Dict[str, str]], batch_size: int = 500):
+        """Write packed buckets to Redis, then the version/record-count sentinel"""
+        client = self.redis_service.redis_client
+        imported = 0
+        
+        pipeline = client.pipeline(transaction=False)
+        for count, (bucket_key, records) in enumerate(buckets.items(), start=1):
+            pipeline.delete(bucket_key)
+            pipeline.hset(bucket_key, mapping=records)
+            imported += len(records)
+            
+            # Execute batch
+            if count % batch_size == 0:
+                pipeline.execute()
+                pipeline = client.pipeline(transaction=False)
+        pipeline.execute()
+        
+        # Sentinel is written last so a partial import is never trusted
+        client.hset(REDIS_META_KEY, mapping={
+            'version': REDIS_DB_VERSION,
+            'records': imported,
+            'buckets': len(buckets),
+            'imported_at': datetime.utcnow().isoformat()
+        })
+        
+        logger.info(f"Imported {imported} aircraft to Redis in {len(buckets)} buckets")
+    
+    def purge_legacy_keys(self, batch_size: int = 1000) -> int:
+        """Delete per-aircraft aircraft_db:{icao} hashes from the old layout (incremental SCAN)"""
+        client = self.redis_service.redis_client
+        removed = 0
+        pending = []
+        
+        for key in client.scan_iter(match="aircraft_db:*", count=batch_size):
+            if key == REDIS_META_KEY or key.startswith(REDIS_BUCKET_PREFIX):
+                continue
+            pending.append(key)
+            if len(pending) >= batch_size:
+                removed += client.unlink(*pending)
+                pending = []
+        
+        if pending:
+            removed += client.unlink(*pending)
+        
+        logger.info(f"Removed {removed} legacy aircraft_db keys")
+        return removed
+    
     def lookup_aircraft(self, hex_code: str) -> Dict[str, str]:
         """Look up aircraft information by hex code"""
         if not hex_code:
             return self._empty_result()
         
         # Check cache first
-        if hex_code in self.aircraft_cache:
-            self.cache_stats['hits'] += 1
-            return self.aircraft_cache[hex_code]
-        
-        self.cache_stats['misses'] += 1
+        cached = self.aircraft_cache.get(normalize_icao(hex_code))
+        if cached is not None:
+            return cached
         
         # Try Redis lookup
         if self.redis_service:
@@ -190,6 +431,13 @@ class AircraftDatabase:
                 self._cache_result(hex_code, result)
                 return result
         
+        # Fallback to the memory-mapped registry
+        if self.registry is not None:
+            packed = self.registry.get(normalize_icao(hex_code))
+            result = unpack_aircraft_info(packed) if packed is not None else self._empty_result()
+            self._cache_result(hex_code, result)
+            return result
+        
         # Fallback to pandas
         if self.aircraft_db is not None:
             result = self._pandas_lookup(hex_code)
@@ -203,34 +451,59 @@ class AircraftDatabase:
     
     def batch_lookup_aircraft(self, hex_codes: List[str]) -> Dict[str, Dict[str, str]]:
         """Batch lookup aircraft information for multiple hex codes"""
-        if not hex_codes:
-            return {}
+        results, missing_codes = self._batch_cache_lookup(hex_codes)
         
+        # Batch Redis lookup for missing codes
+        if missing_codes and self.redis_service:
+            missing_codes = self._merge_found(results, missing_codes, self._batch_redis_lookup(missing_codes))
+        
+        return self._batch_local_lookup(hex_codes, results, missing_codes)
+    
+    async def abatch_lookup_aircraft(self, hex_codes: List[str]) -> Dict[str, Dict[str, str]]:
+        """Async batch lookup (Redis round trip does not block the event loop)"""
+        results, missing_codes = self._batch_cache_lookup(hex_codes)
+        
+        if missing_codes and self.redis_service:
+            missing_codes = self._merge_found(results, missing_codes, await self._abatch_redis_lookup(missing_codes))
+        
+        return self._batch_local_lookup(hex_codes, results, missing_codes)
+    
+    def _batch_cache_lookup(self, hex_codes: List[str]):
+        """Split hex codes into cached results and codes still to look up"""
         results = {}
         missing_codes = []
         
         # Check cache first for all codes
-        for hex_code in hex_codes:
+        for hex_code in hex_codes or []:
             if not hex_code:
                 continue
-            if hex_code in self.aircraft_cache:
-                results[hex_code] = self.aircraft_cache[hex_code]
-                self.cache_stats['hits'] += 1
+            cached = self.aircraft_cache.get(normalize_icao(hex_code))
+            if cached is not None:
+                results[hex_code] = cached
             else:
                 missing_codes.append(hex_code)
-                self.cache_stats['misses'] += 1
         
-        if not missing_codes:
-            return results
-        
-        # Batch Redis lookup for missing codes
-        if self.redis_service:
-            redis_results = self._batch_redis_lookup(missing_codes)
-            for hex_code, result in redis_results.items():
-                if result:
-                    results[hex_code] = result
-                    self._cache_result(hex_code, result)
-                    missing_codes.remove(hex_code)
+        return results, missing_codes
+    
+    def _merge_found(self, results: Dict, missing_codes: List[str], found: Dict[str, Dict[str, str]]) -> List[str]:
+        """Cache and merge found results, returning the codes still missing"""
+        for hex_code, result in found.items():
+            if result:
+                results[hex_code] = result
+                self._cache_result(hex_code, result)
+        return [hex_code for hex_code in missing_codes if hex_code not in results]
+    
+    def _batch_local_lookup(self, hex_codes: List[str], results: Dict, missing_codes: List[str]) -> Dict[str, Dict[str, str]]:
+        """Resolve remaining codes from the registry / pandas and fill empty results"""
+        # Fallback to the memory-mapped registry for remaining codes
+        if missing_codes and self.registry is not None:
+            registry_results = self.registry.get_many([normalize_icao(h) for h in missing_codes])
+            found = {}
+            for hex_code in missing_codes:
+                packed = registry_results.get(normalize_icao(hex_code))
+                if packed is not None:
+                    found[hex_code] = unpack_aircraft_info(packed)
+            missing_codes = self._merge_found(results, missing_codes, found)
         
         # Fallback to pandas for remaining codes
         if missing_codes and self.aircraft_db is not None:
@@ -240,8 +513,8 @@ class AircraftDatabase:
                 self._cache_result(hex_code, result)
         
         # Fill in empty results for any remaining missing codes
-        for hex_code in hex_codes:
-            if hex_code not in results:
+        for hex_code in hex_codes or []:
+            if hex_code and hex_code not in results:
                 results[hex_code] = self._empty_result()
                 self._cache_result(hex_code, results[hex_code])
         
@@ -250,20 +523,11 @@ class AircraftDatabase:
     def _redis_lookup(self, hex_code: str) -> Optional[Dict[str, str]]:
         """Look up aircraft in Redis"""
         try:
-            hex_upper = hex_code.upper().replace('~', '').strip()
-            redis_key = f"aircraft_db:{hex_upper}"
-            redis_data = self.redis_service.redis_client.hgetall(redis_key)
+            bucket_key, field = bucket_location(normalize_icao(hex_code))
+            packed = self.redis_service.redis_client.hget(bucket_key, field)
             
-            if redis_data:
-                return {
-                    'registration': redis_data.get('registration', ''),
-                    'manufacturerName': redis_data.get('manufacturerName', ''),
-                    'model': redis_data.get('model', ''),
-                    'icaoAircraftClass': redis_data.get('icaoAircraftClass', ''),
-                    'typecode': redis_data.get('typecode', ''),
-                    'operator': redis_data.get('operator', ''),
-                    'owner': redis_data.get('owner', '')
-                }
+            if packed is not None:
+                return unpack_aircraft_info(packed)
             return None
         except Exception as e:
             logger.error(f"Redis lookup error for {hex_code}: {e}")
@@ -280,15 +544,7 @@ class AircraftDatabase:
                 if isinstance(aircraft_info, pd.DataFrame):
                     aircraft_info = aircraft_info.iloc[0]
                 
-                return {
-                    'registration': self._safe_get(aircraft_info, ['registration', 'Registration', 'reg']),
-                    'manufacturerName': self._safe_get(aircraft_info, ['manufacturerName', 'manufacturerIcao', 'manufacturer', 'Manufacturer', 'mfr']),
-                    'model': self._safe_get(aircraft_info, ['model', 'Model', 'type']),
-                    'icaoAircraftClass': self._safe_get(aircraft_info, ['icaoAircraftClass', 'typecode', 'TypeCode', 'aircraft_type']),
-                    'typecode': self._safe_get(aircraft_info, ['typecode', 'TypeCode', 'type_code']),
-                    'operator': self._safe_get(aircraft_info, ['operator', 'Operator', 'airline']),
-                    'owner': self._safe_get(aircraft_info, ['owner', 'Owner', 'registered_owner'])
-                }
+                return self._extract_aircraft_info(aircraft_info)
         except Exception as e:
             logger.error(f"Pandas lookup error for {hex_code}: {e}")
         
@@ -301,33 +557,39 @@ class AircraftDatabase:
             if not self.redis_service or not self.redis_service.redis_client:
                 return results
                 
-            pipeline = self.redis_service.redis_client.pipeline()
+            pipeline = self.redis_service.redis_client.pipeline(transaction=False)
             
             # Queue all lookups
-            redis_keys = []
             for hex_code in hex_codes:
-                hex_upper = hex_code.upper().replace('~', '').strip()
-                redis_key = f"aircraft_db:{hex_upper}"
-                redis_keys.append((hex_code, redis_key))
-                pipeline.hgetall(redis_key)
+                pipeline.hget(*bucket_location(normalize_icao(hex_code)))
             
             # Execute all lookups at once
             pipeline_results = pipeline.execute()
             
             # Process results
-            for i, (original_hex, redis_key) in enumerate(redis_keys):
-                redis_data = pipeline_results[i] if i < len(pipeline_results) else {}
-                
-                if redis_data:
-                    results[original_hex] = {
-                        'registration': redis_data.get('registration', ''),
-                        'manufacturerName': redis_data.get('manufacturerName', ''),
-                        'model': redis_data.get('model', ''),
-                        'icaoAircraftClass': redis_data.get('icaoAircraftClass', ''),
-                        'typecode': redis_data.get('typecode', ''),
-                        'operator': redis_data.get('operator', ''),
-                        'owner': redis_data.get('owner', '')
-                    }
+            for hex_code, packed in zip(hex_codes, pipeline_results):
+                if packed is not None:
+                    results[hex_code] = unpack_aircraft_info(packed)
+                    
+        except Exception as e:
+            logger.error(f"Batch Redis lookup error: {e}")
+            
+        return results
+    
+    async def _abatch_redis_lookup(self, hex_codes: List[str]) -> Dict[str, Dict[str, str]]:
+        """Async _batch_redis_lookup on the shared async pool"""
+        results = {}
+        try:
+            if not self.redis_service or not getattr(self.redis_service, 'async_client', None):
+                return self._batch_redis_lookup(hex_codes)
+            
+            pipeline = self.redis_service.async_client.pipeline(transaction=False)
+            for hex_code in hex_codes:
+                pipeline.hget(*bucket_location(normalize_icao(hex_code)))
+            
+            for hex_code, packed in zip(hex_codes, await pipeline.execute()):
+                if packed is not None:
+                    results[hex_code] = unpack_aircraft_info(packed)
                     
         except Exception as e:
             logger.error(f"Batch Redis lookup error: {e}")
@@ -373,13 +635,8 @@ class AircraftDatabase:
     def _extract_aircraft_info(self, aircraft_info) -> Dict[str, str]:
         """Extract aircraft information from pandas row/series"""
         return {
-            'registration': self._safe_get(aircraft_info, ['registration', 'Registration', 'reg']),
-            'manufacturerName': self._safe_get(aircraft_info, ['manufacturerName', 'manufacturerIcao', 'manufacturer', 'Manufacturer', 'mfr']),
-            'model': self._safe_get(aircraft_info, ['model', 'Model', 'type']),
-            'icaoAircraftClass': self._safe_get(aircraft_info, ['icaoAircraftClass', 'typecode', 'TypeCode', 'aircraft_type']),
-            'typecode': self._safe_get(aircraft_info, ['typecode', 'TypeCode', 'type_code']),
-            'operator': self._safe_get(aircraft_info, ['operator', 'Operator', 'airline']),
-            'owner': self._safe_get(aircraft_info, ['owner', 'Owner', 'registered_owner'])
+            field: self._safe_get(aircraft_info, columns)
+            for field, columns in FIELD_COLUMNS.items()
         }
     
     def _safe_get(self, data, possible_keys):
@@ -403,24 +660,22 @@ class AircraftDatabase:
     
     def _cache_result(self, hex_code: str, result: Dict[str, str]):
         """Cache lookup result"""
-        self.aircraft_cache[hex_code] = result
-        
-        # Prevent cache from growing too large
-        if len(self.aircraft_cache) > 1000:
-            # Remove oldest entries (first 200)
-            keys_to_remove = list(self.aircraft_cache.keys())[:200]
-            for key in keys_to_remove:
-                del self.aircraft_cache[key]
+        self.aircraft_cache.put(normalize_icao(hex_code), result)
     
     def get_cache_stats(self) -> Dict[str, any]:
         """Get cache statistics"""
-        total_requests = self.cache_stats['hits'] + self.cache_stats['misses']
-        hit_rate = (self.cache_stats['hits'] / total_requests * 100) if total_requests > 0 else 0
+        stats = self.aircraft_cache.stats
+        total_requests = stats['hits'] + stats['misses']
+        hit_rate = (stats['hits'] / total_requests * 100) if total_requests > 0 else 0
         
         return {
-            'hits': self.cache_stats['hits'],
-            'misses': self.cache_stats['misses'],
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'negative_hits': stats['negative_hits'],
+            'evictions': stats['evictions'],
+            'expirations': stats['expirations'],
             'total_requests': total_requests,
             'hit_rate': hit_rate,
-            'cache_size': len(self.aircraft_cache)
-        }
\ No newline at end of file
+            'cache_size': len(self.aircraft_cache),
+            'max_size': self.aircraft_cache.max_size
+        }
@@ -0,0 +1,143 @@
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# File layout (little endian):
+#   header   MAGIC (8 bytes) | record count (uint32) | reserved (uint32)
+#   keys     uint32[count]    sorted 24-bit ICAO addresses
+#   offsets  uint32[count+1]  byte offsets of each record into the string table
+#   strings  UTF-8 packed records, concatenated
+MAGIC = b"ACREG\x00\x00\x01"
+HEADER = struct.Struct("<8sII")
+
+
+def icao_to_key(hex_code: str) -> int:
+    """Convert an ICAO hex string to its integer key (-1 if invalid)"""
+    hex_code = hex_code.replace('~', '').strip()
+    if not hex_code or len(hex_code) > 6:
+        return -1
+    try:
+        return int(hex_code, 16)
+    except ValueError:
+        return -1
+
+
+def write_registry(path, keys: np.ndarray, records: Sequence[str]) -> int:
+    """Write a registry file from integer ICAO keys and packed record strings"""
+    keys = np.asarray(keys, dtype=np.uint32)
+    order = np.argsort(keys, kind='stable')
+
+    # Keep the first record for duplicate ICAO addresses
+    sorted_keys = keys[order]
+    unique = np.ones(len(sorted_keys), dtype=bool)
+    unique[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    order = order[unique]
+    sorted_keys = sorted_keys[unique]
+
+    encoded = [records[i].encode('utf-8') for i in order]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+
+    # Write to a temp file and rename so readers never map a half-written file
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(sorted_keys), 0))
+        f.write(sorted_keys.astype('<u4').tobytes())
+        f.write(offsets.astype('<u4').tobytes())
+        f.write(b"".join(encoded))
+    os.replace(tmp_path, path)
+
+    logger.info(f"Wrote aircraft registry with {len(sorted_keys)} records to {path}")
+    return len(sorted_keys)
+
+
+class AircraftRegistry:
+    """Read-only, memory-mapped aircraft registry with binary-search lookups
+
+    The file is mapped read-only, so every worker process shares the same
+    page cache instead of holding its own copy of the database.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, count, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an aircraft registry file")
+
+        self.count = count
+        keys_start = HEADER.size
+        offsets_start = keys_start + 4 * count
+        self._strings_start = offsets_start + 4 * (count + 1)
+
+        # Zero-copy views over the mapped file
+        self.keys = np.frombuffer(self._mmap, dtype='<u4', count=count, offset=keys_start)
+        self.offsets = np.frombuffer(self._mmap, dtype='<u4', count=count + 1, offset=offsets_start)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record(self, index: int) -> str:
+        """Decode the packed record at a sorted index"""
+        start = self._strings_start + int(self.offsets[index])
+        end = self._strings_start + int(self.offsets[index + 1])
+        return self._mmap[start:end].decode('utf-8')
+
+    def get(self, hex_code: str) -> Optional[str]:
+        """Packed record for a hex code, or None if not registered"""
+        key = icao_to_key(hex_code)
+        if key < 0 or self.count == 0:
+            return None
+
+        index = int(np.searchsorted(self.keys, key))
+        if index < self.count and self.keys[index] == key:
+            return self._record(index)
+        return None
+
+    def get_many(self, hex_codes: List[str]) -> Dict[str, str]:
+        """Packed records for several hex codes (vectorized binary search)"""
+        results = {}
+        if not hex_codes or self.count == 0:
+            return results
+
+        keys = np.array([icao_to_key(h) for h in hex_codes], dtype=np.int64)
+        indices = np.searchsorted(self.keys, keys)
+        valid = (keys >= 0) & (indices < self.count)
+        found = np.zeros(len(keys), dtype=bool)
+        found[valid] = self.keys[indices[valid]] == keys[valid]
+
+        for i in np.flatnonzero(found):
+            results[hex_codes[i]] = self._record(int(indices[i]))
+        return results
+
+    def iter_records(self) -> Iterator[Tuple[str, str]]:
+        """Iterate (ICAO hex, packed record) in key order"""
+        for index in range(self.count):
+            yield f"{int(self.keys[index]):06X}", self._record(index)
+
+    def close(self):
+        """Release the memory map"""
+        # numpy views hold buffer exports; drop them before closing the map
+        self.keys = None
+        self.offsets = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            logger.debug("Aircraft registry still referenced; leaving map open")
+        finally:
+            self._file.close()
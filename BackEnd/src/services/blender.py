@@ -1,98 +1,243 @@
+import time
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
-from ..models.aircraft import Aircraft
+import numpy as np
+
+from ..models.aircraft import AircraftRecord
+from ..models.aircraft_batch import AircraftBatch
 from .aircraft_db import AircraftDatabase
 
 logger = logging.getLogger(__name__)
 
 
+# Field groups merged independently by freshness; position fields always move together
+MERGE_GROUPS = (
+    ('lat', 'lon', 'distance_miles'),
+    ('flight',),
+    ('alt_baro',),
+    ('alt_geom',),
+    ('gs',),
+    ('track',),
+    ('baro_rate',),
+    ('squawk',),
+    ('on_ground',),
+    ('rssi',),
+    ('messages',),
+)
+
+# Observations closer together than this (seconds) are treated as simultaneous,
+# so source priority decides between them
+FRESHNESS_TOLERANCE = 1.0
+
+_LOWEST_PRIORITY = 255
+_EMPTY_KEYS = np.empty(0, dtype=np.uint32)
+_EMPTY_TIMES = np.empty(0, dtype=np.float64)
+
+
+class BlendEntry:
+    """Blended state of one aircraft: the merged record plus per-field freshness"""
+    
+    __slots__ = ('record', 'field_times', 'last_received')
+    
+    def __init__(self, record: AircraftRecord, received_at: float, priority: int):
+        self.record = record
+        self.field_times: Dict[str, Tuple[float, int]] = {}
+        self.last_received = received_at
+        
+        for group in MERGE_GROUPS:
+            if self._has_value(getattr(record, group[0])):
+                self.field_times[group[0]] = (received_at, priority)
+    
+    @staticmethod
+    def _has_value(value) -> bool:
+        return value is not None and value != ''
+    
+    def merge(self, observation: AircraftRecord, received_at: float, priority: int) -> bool:
+        """Merge a newer observation field by field; returns True if anything changed"""
+        merged = False
+        
+        for group in MERGE_GROUPS:
+            field = group[0]
+            if not self._has_value(getattr(observation, field)):
+                continue
+            
+            field_time, field_priority = self.field_times.get(field, (-np.inf, _LOWEST_PRIORITY))
+            is_fresher = received_at > field_time + FRESHNESS_TOLERANCE
+            is_same_age = received_at >= field_time - FRESHNESS_TOLERANCE and priority <= field_priority
+            if not (is_fresher or is_same_age):
+                continue
+            
+            for name in group:
+                setattr(self.record, name, getattr(observation, name))
+            self.field_times[field] = (received_at, priority)
+            merged = True
+            
+            # The record is attributed to the source of its position (and takes that source's hex casing)
+            if field == 'lat':
+                self.record.data_source = observation.data_source
+                self.record.hex = observation.hex
+        
+        self.last_received = max(self.last_received, received_at)
+        return merged
+
+
+class RegionBlendState:
+    """Persistent per-region blend state keyed by ICAO hex
+    
+    Keeps the blended aircraft between cycles plus, per source, the receive
+    time of each hex it last reported, so only rows with new messages are
+    merged on the next cycle.
+    """
+    
+    def __init__(self, aircraft_timeout: float):
+        self.aircraft_timeout = aircraft_timeout
+        self.entries: Dict[int, BlendEntry] = {}
+        self.source_index: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    
+    def changed_rows(self, source: str, hex_keys: np.ndarray, received_at: np.ndarray) -> np.ndarray:
+        """Mask of rows carrying a newer message than this source last reported"""
+        prev_keys, prev_times = self.source_index.get(source, (_EMPTY_KEYS, _EMPTY_TIMES))
+        
+        if len(prev_keys):
+            pos = np.minimum(np.searchsorted(prev_keys, hex_keys), len(prev_keys) - 1)
+            previous = np.where(prev_keys[pos] == hex_keys, prev_times[pos], -np.inf)
+        else:
+            previous = np.full(len(hex_keys), -np.inf)
+        
+        changed = received_at > previous + FRESHNESS_TOLERANCE
+        
+        # Re-index this source (latest merged time per hex) for the next cycle's delta
+        times = np.where(changed, received_at, previous)
+        order = np.lexsort((times, hex_keys))
+        keys = hex_keys[order]
+        last = np.append(keys[1:] != keys[:-1], True) if len(keys) else np.empty(0, dtype=bool)
+        self.source_index[source] = (keys[last], times[order][last])
+        
+        return changed
+    
+    def retain_sources(self, sources):
+        """Forget sources that reported nothing this cycle"""
+        for source in list(self.source_index):
+            if source not in sources:
+                del self.source_index[source]
+    
+    def expire(self, now: float) -> int:
+        """Drop aircraft with no message within the timeout"""
+        cutoff = now - self.aircraft_timeout
+        expired = [key for key, entry in self.entries.items() if entry.last_received < cutoff]
+        for key in expired:
+            del self.entries[key]
+        return len(expired)
+
+
 class DataBlender:
     """Blends aircraft data from multiple sources with intelligent prioritization"""
     
-    def __init__(self, helicopter_patterns: List[dict], redis_service=None):
+    # Source priority used for blending and sorting (lower = higher priority)
+    PI_STATION_PRIORITY = 0
+    DUMP1090_PRIORITY = 1
+    OPENSKY_PRIORITY = 2
+    
+    def __init__(self, helicopter_patterns: List[dict], redis_service=None,
+                 aircraft_timeout: float = 120, aircraft_db_config: Optional[dict] = None):
         self.helicopter_patterns = helicopter_patterns
-        self.aircraft_db = AircraftDatabase(redis_service)
+        self.aircraft_db = AircraftDatabase(redis_service, aircraft_db_config)
+        self.aircraft_timeout = aircraft_timeout
+        self.region_states: Dict[str, RegionBlendState] = {}
+    
+    async def prefetch_aircraft_info(self, region: str, batches: List[AircraftBatch],
+                                     pi_station_aircraft: List[AircraftRecord]):
+        """Warm the aircraft database cache for aircraft not yet in the region's blend
+        
+        Lookups run on the async Redis pool, so the synchronous enrichment in
+        blend_aircraft_data is served from the in-process cache.
+        """
+        state = self.region_states.get(region)
+        known = state.entries if state is not None else {}
+        
+        hex_codes = []
+        for batch in batches:
+            if not batch:
+                continue
+            for key, hex_code in zip(batch.hex.tolist(), batch.hex_codes()):
+                if key not in known:
+                    hex_codes.append(hex_code)
+        hex_codes.extend(aircraft.hex for aircraft in pi_station_aircraft if aircraft.hex)
+        
+        if hex_codes:
+            await self.aircraft_db.abatch_lookup_aircraft(hex_codes)
     
     def blend_aircraft_data(self, 
-                           pi_station_aircraft: List[Aircraft],
-                           dump1090_aircraft: List[Aircraft], 
-                           opensky_aircraft: List[Aircraft]) -> List[Aircraft]:
-        """Blend aircraft data with Pi station priority - Pi stations > dump1090 > OpenSky"""
-        blended = {}
-        stats = {
-            'pi_station_priority': 0,
-            'dump1090_priority': 0,
-            'opensky_only': 0,
-            'pi_station_updated': 0,
-            'dump1090_updated': 0,
-            'total': 0
-        }
-        
-        # First pass: Add OpenSky aircraft as base data (lowest priority)
-        for aircraft in opensky_aircraft:
-            hex_code = aircraft.hex.upper()
-            if hex_code:
-                aircraft.data_source = "opensky"
-                blended[hex_code] = aircraft
-                stats['opensky_only'] += 1
-        
-        # Second pass: dump1090 aircraft override OpenSky data (medium priority)
-        for aircraft in dump1090_aircraft:
-            hex_code = aircraft.hex.upper()
-            if hex_code and self._is_quality_aircraft_data(aircraft):
-                if hex_code in blended:
-                    # Update existing OpenSky record with dump1090 data
-                    aircraft.data_source = "dump1090"
-                    blended[hex_code] = aircraft
-                    stats['dump1090_updated'] += 1
-                    stats['opensky_only'] -= 1  # No longer OpenSky-only
-                else:
-                    # New aircraft from dump1090
-                    aircraft.data_source = "dump1090"
-                    blended[hex_code] = aircraft
-                
-                stats['dump1090_priority'] += 1
-        
-        # Third pass: Pi station aircraft override all other data (highest priority)
-        for aircraft in pi_station_aircraft:
-            hex_code = aircraft.hex.upper()
-            if hex_code and self._is_quality_aircraft_data(aircraft):
-                if hex_code in blended:
-                    # Update existing record with Pi station data
-                    # Keep original Pi station data_source (e.g., "pi_station_ETEX01")
-                    blended[hex_code] = aircraft
-                    stats['pi_station_updated'] += 1
-                    # Adjust previous counts
-                    if aircraft.data_source.startswith('pi_station'):
-                        if 'dump1090_priority' in stats and stats['dump1090_priority'] > 0:
-                            stats['dump1090_priority'] -= 1
-                        elif 'opensky_only' in stats and stats['opensky_only'] > 0:
-                            stats['opensky_only'] -= 1
-                else:
-                    # New aircraft from Pi station
-                    blended[hex_code] = aircraft
-                
-                stats['pi_station_priority'] += 1
+                           pi_station_aircraft: List[AircraftRecord],
+                           dump1090_aircraft: AircraftBatch, 
+                           opensky_aircraft: AircraftBatch,
+                           region: str = "default",
+                           now: Optional[float] = None) -> List[AircraftRecord]:
+        """Incrementally blend per-source deltas into the region's persistent state
         
-        stats['total'] = len(blended)
+        Only rows with a newer message than their source last reported are
+        merged. Merging is field by field: the freshest value wins and source
+        priority (Pi stations > dump1090 > OpenSky) breaks ties between
+        simultaneous observations. Aircraft expire after aircraft_timeout.
+        """
+        now = time.time() if now is None else now
+        state = self.region_states.get(region)
+        if state is None:
+            state = self.region_states[region] = RegionBlendState(self.aircraft_timeout)
         
-        # Convert back to list and sort by priority
-        aircraft_list = list(blended.values())
-        aircraft_list.sort(key=self._get_aircraft_priority_score)
+        pi_batch = AircraftBatch.from_records(pi_station_aircraft, now)
+        combined = AircraftBatch.concat([opensky_aircraft, dump1090_aircraft, pi_batch])
+        
+        source_priority = np.array([self._get_source_priority(name) for name in combined.sources] or [0],
+                                   dtype=np.uint8)
+        priority = source_priority[combined.source]
+        received = np.where(np.isnan(combined.received_at), now, combined.received_at)
+        
+        # OpenSky is always accepted as base data; local sources need quality positions
+        eligible = (priority == self.OPENSKY_PRIORITY) | combined.has_quality_position()
+        
+        # Per-source deltas: keep only rows with new messages
+        changed = np.zeros(len(combined), dtype=bool)
+        for source_id, source_name in enumerate(combined.sources):
+            rows = np.flatnonzero((combined.source == source_id) & eligible)
+            changed[rows] = state.changed_rows(source_name, combined.hex[rows], received[rows])
+        state.retain_sources(set(combined.sources))
         
-        # Enrich with aircraft database information
-        self._enrich_aircraft_data(aircraft_list)
+        rows = np.flatnonzero(changed)
+        stats = {'added': 0, 'updated': 0, 'unchanged': int(eligible.sum()) - len(rows)}
         
-        logger.info(f"🔀 Blend Stats: {stats['pi_station_priority']} pi_stations | "
-                   f"{stats['dump1090_priority']} dump1090 | {stats['opensky_only']} opensky | "
-                   f"{stats['pi_station_updated']} pi_updated | {stats['dump1090_updated']} dump_updated | "
-                   f"{stats['total']} total")
+        new_aircraft = []
+        observations = combined.take(rows).to_records()
+        for observation, hex_key, received_at, row_priority in zip(
+                observations, combined.hex[rows].tolist(), received[rows].tolist(), priority[rows].tolist()):
+            entry = state.entries.get(hex_key)
+            if entry is None:
+                state.entries[hex_key] = BlendEntry(observation, received_at, row_priority)
+                new_aircraft.append(observation)
+                stats['added'] += 1
+            elif entry.merge(observation, received_at, row_priority):
+                stats['updated'] += 1
+        
+        stats['expired'] = state.expire(now)
+        
+        # Enrich newly seen aircraft with aircraft database information
+        self._enrich_aircraft_data(new_aircraft)
+        
+        aircraft_list = []
+        for entry in state.entries.values():
+            entry.record.seen = round(max(now - entry.last_received, 0.0), 1)
+            aircraft_list.append(entry.record)
+        aircraft_list.sort(key=self._get_aircraft_priority_score)
+        
+        logger.info(f"🔀 Blend Stats ({region}): {stats['added']} added | {stats['updated']} updated | "
+                   f"{stats['unchanged']} unchanged | {stats['expired']} expired | "
+                   f"{len(aircraft_list)} total")
         
         return aircraft_list
     
-    def identify_helicopters(self, aircraft_list: List[Aircraft]) -> List[Aircraft]:
+    def identify_helicopters(self, aircraft_list: List[AircraftRecord]) -> List[AircraftRecord]:
         """Identify helicopters based on patterns"""
         helicopters = []
         total_checked = 0
@@ -115,7 +260,7 @@ class DataBlender:
         
         return helicopters
     
-    def _is_helicopter(self, aircraft: Aircraft) -> bool:
+    def _is_helicopter(self, aircraft: AircraftRecord) -> bool:
         """Check if aircraft is a helicopter using ICAO aircraft class only"""
         # ONLY check ICAO aircraft class - most reliable method
         if aircraft.icao_aircraft_class and aircraft.icao_aircraft_class.startswith('H'):
@@ -130,17 +275,15 @@ class DataBlender:
         
         return False
     
-    def _is_quality_aircraft_data(self, aircraft: Aircraft) -> bool:
-        """Check if aircraft has high-quality position and movement data"""
-        return (
-            aircraft.lat is not None and 
-            aircraft.lon is not None and
-            aircraft.alt_baro is not None and
-            aircraft.gs is not None and
-            aircraft.track is not None
-        )
-    
-    def _get_aircraft_priority_score(self, aircraft: Aircraft) -> float:
+    def _get_source_priority(self, data_source: str) -> int:
+        """Blend priority of a data source (lower = higher priority)"""
+        if data_source.startswith('pi_station'):
+            return self.PI_STATION_PRIORITY
+        elif data_source == 'dump1090':
+            return self.DUMP1090_PRIORITY
+        return self.OPENSKY_PRIORITY
+    
+    def _get_aircraft_priority_score(self, aircraft: AircraftRecord) -> float:
         """Calculate priority score for sorting (lower = higher priority)"""
         score = 0
         
@@ -160,7 +303,7 @@ class DataBlender:
         
         return score
     
-    def _enrich_aircraft_data(self, aircraft_list: List[Aircraft]):
+    def _enrich_aircraft_data(self, aircraft_list: List[AircraftRecord]):
         """Enrich aircraft with database information using batch lookups"""
         # Batch lookup all hex codes at once
         hex_codes = [aircraft.hex for aircraft in aircraft_list if aircraft.hex]
@@ -177,17 +320,17 @@ class DataBlender:
                 
             info = aircraft_info_batch.get(aircraft.hex, {})
             
-            # Add database fields to aircraft
-            aircraft.registration = info.get('registration', '')
-            aircraft.manufacturer = info.get('manufacturerName', '') 
-            aircraft.model = info.get('model', '')
-            aircraft.typecode = info.get('typecode', '')
-            aircraft.operator = info.get('operator', '')
-            aircraft.owner = info.get('owner', '')
-            aircraft.icao_aircraft_class = info.get('icaoAircraftClass', '')
+            # Add database fields to aircraft (keeping values a Pi station sent when the database has none)
+            aircraft.registration = info.get('registration') or aircraft.registration or ''
+            aircraft.manufacturer = info.get('manufacturerName') or aircraft.manufacturer or ''
+            aircraft.model = info.get('model') or aircraft.model or ''
+            aircraft.typecode = info.get('typecode') or aircraft.typecode or ''
+            aircraft.operator = info.get('operator') or aircraft.operator or ''
+            aircraft.owner = info.get('owner') or aircraft.owner or ''
+            aircraft.icao_aircraft_class = info.get('icaoAircraftClass') or aircraft.icao_aircraft_class or ''
             
             # Also populate the aircraft_type field for compatibility
             if info.get('model'):
                 aircraft.aircraft_type = f"{info.get('manufacturerName', '')} {info.get('model', '')}".strip()
             else:
-                aircraft.aircraft_type = info.get('icaoAircraftClass', '')
\ No newline at end of file
+                aircraft.aircraft_type = aircraft.aircraft_type or aircraft.icao_aircraft_class
\ No newline at end of file
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Fields that tick every cycle and do not make an aircraft "updated" on their own
+VOLATILE_FIELDS = ('seen', 'seen_pos')
+
+HEARTBEAT_INTERVAL = 15.0  # seconds - keeps proxies from closing idle streams
+SUBSCRIBER_QUEUE_SIZE = 8   # pending deltas before a slow client is resynced
+
+
+def _sse_event(event: str, version: int, data: Dict) -> bytes:
+    """Encode one Server-Sent Event"""
+    payload = json.dumps(data, separators=(',', ':'))
+    return f"event: {event}\nid: {version}\ndata: {payload}\n\n".encode('utf-8')
+
+
+def _comparable(aircraft: Dict) -> Dict:
+    return {k: v for k, v in aircraft.items() if k not in VOLATILE_FIELDS}
+
+
+class Subscription:
+    """One connected stream client"""
+    __slots__ = ('queue', 'resync')
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.resync = False
+
+
+class ChannelState:
+    """Latest snapshot of one region/type channel and its subscribers"""
+    __slots__ = ('aircraft', 'timestamp', 'version', 'snapshot_event', 'subscribers')
+
+    def __init__(self):
+        self.aircraft: Dict[str, Dict] = {}
+        self.timestamp: Optional[str] = None
+        self.version = 0
+        self.snapshot_event: Optional[bytes] = None
+        self.subscribers: Set[Subscription] = set()
+
+
+class AircraftBroadcaster:
+    """Fans region aircraft deltas out to stream subscribers
+
+    Each collection cycle is diffed and serialized once per channel; every
+    subscriber receives the same pre-encoded bytes, so adding clients does
+    not add serialization work.
+    """
+
+    def __init__(self):
+        self.channels: Dict[str, ChannelState] = {}
+
+    def _channel(self, region: str, data_type: str) -> ChannelState:
+        key = f"{region}:{data_type}"
+        channel = self.channels.get(key)
+        if channel is None:
+            channel = self.channels[key] = ChannelState()
+        return channel
+
+    def publish_region(self, region: str, flights_data: Dict, helicopter_hexes: Set[str]):
+        """Publish one stored region snapshot to the flights and choppers channels"""
+        flights = flights_data.get('aircraft', [])
+        choppers = [record for record in flights if record.get('hex') in helicopter_hexes]
+        timestamp = flights_data.get('timestamp')
+
+        self.publish(region, "flights", flights, timestamp)
+        self.publish(region, "choppers", choppers, timestamp)
+
+    def publish(self, region: str, data_type: str, aircraft: List[Dict], timestamp: str):
+        """Diff a new snapshot against the previous one and push the delta"""
+        channel = self._channel(region, data_type)
+        current = {record['hex']: record for record in aircraft}
+        previous = channel.aircraft
+
+        added = [record for hex_code, record in current.items() if hex_code not in previous]
+        removed = [hex_code for hex_code in previous if hex_code not in current]
+        updated = [
+            record for hex_code, record in current.items()
+            if hex_code in previous and _comparable(record) != _comparable(previous[hex_code])
+        ]
+
+        channel.aircraft = current
+        channel.timestamp = timestamp
+        channel.version += 1
+        channel.snapshot_event = None  # Rebuilt lazily for new or resyncing subscribers
+
+        if not (added or updated or removed) or not channel.subscribers:
+            return
+
+        event = _sse_event("delta", channel.version, {
+            'region': region,
+            'timestamp': timestamp,
+            'added': added,
+            'updated': updated,
+            'removed': removed
+        })
+
+        for subscription in channel.subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: drop its backlog and send a fresh snapshot instead
+                subscription.resync = True
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(b"")
+
+        logger.debug(f"Stream {region}:{data_type} v{channel.version}: {len(added)} added, "
+                     f"{len(updated)} updated, {len(removed)} removed -> {len(channel.subscribers)} subscribers")
+
+    def _snapshot_event(self, region: str, data_type: str, channel: ChannelState) -> bytes:
+        if channel.snapshot_event is None:
+            channel.snapshot_event = _sse_event("snapshot", channel.version, {
+                'region': region,
+                'timestamp': channel.timestamp,
+                'aircraft_count': len(channel.aircraft),
+                'aircraft': list(channel.aircraft.values())
+            })
+        return channel.snapshot_event
+
+    async def subscribe(self, region: str, data_type: str = "flights") -> AsyncIterator[bytes]:
+        """Stream SSE bytes: the current snapshot, then deltas and heartbeats"""
+        channel = self._channel(region, data_type)
+        subscription = Subscription()
+        channel.subscribers.add(subscription)
+        logger.info(f"Stream subscriber joined {region}:{data_type} ({len(channel.subscribers)} connected)")
+
+        try:
+            yield b"retry: 5000\n\n"
+            yield self._snapshot_event(region, data_type, channel)
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+
+                if subscription.resync:
+                    subscription.resync = False
+                    yield self._snapshot_event(region, data_type, channel)
+                elif event:
+                    yield event
+        finally:
+            channel.subscribers.discard(subscription)
+            logger.info(f"Stream subscriber left {region}:{data_type} ({len(channel.subscribers)} connected)")
+
+    def get_stats(self) -> Dict:
+        """Get subscriber counts per channel"""
+        return {
+            key: {'subscribers': len(channel.subscribers), 'version': channel.version,
+                  'aircraft': len(channel.aircraft)}
+            for key, channel in self.channels.items()
+        }
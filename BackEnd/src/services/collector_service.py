@@ -1,15 +1,19 @@
 import asyncio
 import logging
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from ..config.loader import Config
 from ..collectors.opensky import OpenSkyCollector
 from ..collectors.dump1090 import Dump1090Collector
-from ..models.aircraft import Aircraft
+from ..collectors.http_client import HttpClientManager
+from ..models.aircraft import AircraftRecord
+from ..models.aircraft_batch import AircraftBatch
 from .blender import DataBlender
+from .broadcaster import AircraftBroadcaster
 from .redis_service import RedisService
+from .container import container
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +21,35 @@ logger = logging.getLogger(__name__)
 class CollectorService:
     """Main service that orchestrates data collection from multiple sources"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, redis_service: Optional[RedisService] = None):
         self.config = config
-        self.redis_service = RedisService()
-        self.blender = DataBlender(config.helicopter_patterns, redis_service=self.redis_service)
+        if redis_service is None:
+            container.configure(config)
+            redis_service = container.redis_service
+        self.redis_service = redis_service
+        self.blender = DataBlender(
+            config.helicopter_patterns,
+            redis_service=self.redis_service,
+            aircraft_timeout=config.global_config.polling.get('aircraft_timeout', 120),
+            aircraft_db_config=config.global_config.aircraft_db
+        )
+        
+        # Pushes per-cycle deltas to /{region}/stream subscribers
+        self.broadcaster = AircraftBroadcaster()
+        
+        # Hourly on-disk history of every stored cycle (global.archive)
+        self.snapshot_archive = container.snapshot_archive
+        
+        # Pooled keep-alive HTTP clients shared by every collector
+        self.http_client = HttpClientManager(config.global_config.http)
         
         # Initialize collectors for each region
         self.region_collectors = {}
         self._initialize_collectors()
         
-        # Timing control
+        # Timing control - clock supplies "now" for blending and OpenSky pacing
+        # (the replay engine substitutes recorded time)
+        self.clock = time.time
         self.last_opensky_fetch = {}  # Track per region
         self.opensky_data_cache = {}  # Cache OpenSky data per region
         self.dump1090_interval = config.global_config.polling.get('dump1090_interval', 15)
@@ -47,7 +70,7 @@ class CollectorService:
                     continue
                 
                 try:
-                    collector = self._create_collector(collector_config.dict(), region_config.dict())
+                    collector = self._create_collector(collector_config.dict(), region_config.dict(), region_name)
                     if collector:
                         collectors.append(collector)
                         logger.info(f"Initialized {collector_config.type} collector for {region_name}")
@@ -60,14 +83,14 @@ class CollectorService:
                     'config': region_config
                 }
     
-    def _create_collector(self, collector_config: dict, region_config: dict):
+    def _create_collector(self, collector_config: dict, region_config: dict, region_name: str):
         """Create a collector instance based on type"""
         collector_type = collector_config['type']
         
         if collector_type == 'opensky':
-            return OpenSkyCollector(collector_config, region_config)
+            return OpenSkyCollector(collector_config, region_config, self.http_client)
         elif collector_type == 'dump1090':
-            return Dump1090Collector(collector_config, region_config)
+            return Dump1090Collector(collector_config, region_config, self.http_client)
         else:
             logger.error(f"Unknown collector type: {collector_type}")
             return None
@@ -96,7 +119,7 @@ class CollectorService:
             collection_tasks.append(collector.fetch_data())
         
         # Handle OpenSky collection with timing control and caching
-        current_time = time.time()
+        current_time = self.clock()
         should_fetch_opensky = (
             region_name not in self.last_opensky_fetch or
             (current_time - self.last_opensky_fetch.get(region_name, 0)) >= self.opensky_interval
@@ -111,8 +134,8 @@ class CollectorService:
         collection_results = await asyncio.gather(*collection_tasks, return_exceptions=True)
         
         # Process results
-        dump1090_aircraft = []
-        opensky_aircraft = []
+        dump1090_batches = []
+        opensky_batches = []
         
         task_index = 0
         
@@ -123,8 +146,9 @@ class CollectorService:
                 if isinstance(result, Exception):
                     logger.error(f"dump1090 collection failed for {region_name}: {result}")
                 elif result:
-                    dump1090_aircraft.extend(result)
+                    dump1090_batches.append(result)
             task_index += 1
+        dump1090_aircraft = AircraftBatch.concat(dump1090_batches)
         
         # Process OpenSky results (if fetched)
         if should_fetch_opensky and opensky_collectors:
@@ -139,11 +163,14 @@ class CollectorService:
                             'aircraft': result,
                             'timestamp': current_time
                         }
-                        opensky_aircraft.extend(result)
+                        opensky_batches.append(result)
                         self.last_opensky_fetch[region_name] = current_time
                         logger.info(f"Cached {len(result)} OpenSky aircraft for region {region_name}")
                 task_index += 1
+            opensky_aircraft = AircraftBatch.concat(opensky_batches)
         else:
+            opensky_aircraft = AircraftBatch.empty()
+            
             # Use cached data if available
             if region_name in self.opensky_data_cache:
                 cached_data = self.opensky_data_cache[region_name]
@@ -155,16 +182,21 @@ class CollectorService:
         
         logger.info(f"Total collected: dump1090={len(dump1090_aircraft)}, opensky={len(opensky_aircraft)}")
         logger.info(f"Condition check: dump1090_aircraft={bool(dump1090_aircraft)}, opensky_aircraft={bool(opensky_aircraft)}")
-        logger.info(f"dump1090_aircraft type: {type(dump1090_aircraft)}, opensky_aircraft type: {type(opensky_aircraft)}")
         
         # Get Pi station data for this region
-        pi_station_aircraft = self._get_pi_station_data(region_name)
+        pi_station_aircraft = await self._get_pi_station_data(region_name)
         logger.info(f"Pi station data: {len(pi_station_aircraft)} aircraft")
         
         # Blend the data from all sources
         if dump1090_aircraft or opensky_aircraft or pi_station_aircraft:
             logger.info("Entering blending logic...")
-            blended_aircraft = self.blender.blend_aircraft_data(pi_station_aircraft, dump1090_aircraft, opensky_aircraft)
+            await self.blender.prefetch_aircraft_info(
+                region_name, [dump1090_aircraft, opensky_aircraft], pi_station_aircraft
+            )
+            blended_aircraft = self.blender.blend_aircraft_data(
+                pi_station_aircraft, dump1090_aircraft, opensky_aircraft, region=region_name,
+                now=current_time
+            )
             logger.info(f"Blending completed: {len(blended_aircraft)} aircraft")
             
             helicopters = self.blender.identify_helicopters(blended_aircraft)
@@ -178,9 +210,18 @@ class CollectorService:
             }
             
             logger.info(f"About to store data: region={region_name}, aircraft={len(blended_aircraft)}, helicopters={len(helicopters)}")
-            self.redis_service.store_region_data(region_name, blended_aircraft, helicopters, location)
+            # Stored snapshot, track points and archive rows are dated by the same (possibly replayed) clock
+            stored_at = self.clock()
+            flights_data = await self.redis_service.astore_region_data(region_name, blended_aircraft, helicopters,
+                                                                       location, now=stored_at)
             logger.info("Data storage completed")
             
+            if flights_data:
+                helicopter_hexes = {heli.hex for heli in helicopters}
+                self.broadcaster.publish_region(region_name, flights_data, helicopter_hexes)
+                await self.snapshot_archive.aarchive_region(region_name, flights_data, helicopter_hexes,
+                                                            epoch=stored_at)
+            
             total_time = time.time() - start_time
             logger.info(f"Region {region_name}: {len(blended_aircraft)} aircraft, "
                        f"{len(helicopters)} helicopters in {total_time:.2f}s")
@@ -191,50 +232,55 @@ class CollectorService:
             logger.warning(f"No data collected for region {region_name}")
             return False
     
-    def _get_pi_station_data(self, region_name: str) -> List[Aircraft]:
+    async def _get_pi_station_data(self, region_name: str) -> List[AircraftRecord]:
         """Get Pi station data for a region from Redis"""
         pi_aircraft = []
         
-        try:
-            # Get all Pi station keys for this region
-            pattern = f"pi_data:{region_name}:*"
-            keys = self.redis_service.redis_client.keys(pattern)
-            
-            for key in keys:
-                try:
-                    # Get Pi station data
-                    data = self.redis_service.redis_client.get(key)
-                    if data:
-                        import json
-                        station_data = json.loads(data)
+        # One indexed read for all live stations in the region
+        stations = await self.redis_service.aget_pi_station_data(region_name)
+        
+        for station_data in stations:
+            try:
+                # Station 'seen' values are relative to when the station submitted
+                submission_age = self._pi_submission_age(station_data)
+                
+                # Convert Pi station aircraft to records (validated at the bulk endpoint)
+                for aircraft_data in station_data.get('aircraft', []):
+                    try:
+                        aircraft = AircraftRecord.from_dict(aircraft_data)
+                        aircraft.seen = (aircraft.seen or 0.0) + submission_age
                         
-                        # Convert Pi station aircraft to Aircraft objects
-                        for aircraft_data in station_data.get('aircraft', []):
-                            try:
-                                # Create Aircraft object from Pi station data
-                                aircraft = Aircraft(**aircraft_data)
-                                
-                                # Ensure data_source is preserved (e.g., "pi_station_ETEX01")
-                                if not aircraft.data_source.startswith('pi_station'):
-                                    aircraft.data_source = aircraft_data.get('data_source', f"pi_station_{station_data.get('station_id', 'unknown')}")
-                                
-                                pi_aircraft.append(aircraft)
-                                
-                            except Exception as e:
-                                logger.warning(f"Error converting Pi station aircraft data: {e}")
-                                continue
-                                
-                except Exception as e:
-                    logger.warning(f"Error processing Pi station key {key}: {e}")
-                    continue
-                    
-            logger.debug(f"Retrieved {len(pi_aircraft)} aircraft from {len(keys)} Pi stations for region {region_name}")
-            
-        except Exception as e:
-            logger.error(f"Error fetching Pi station data for region {region_name}: {e}")
+                        # Ensure data_source is preserved (e.g., "pi_station_ETEX01")
+                        if not aircraft.data_source.startswith('pi_station'):
+                            aircraft.data_source = aircraft_data.get('data_source', f"pi_station_{station_data.get('station_id', 'unknown')}")
+                        
+                        pi_aircraft.append(aircraft)
+                        
+                    except Exception as e:
+                        logger.warning(f"Error converting Pi station aircraft data: {e}")
+                        continue
+                        
+            except Exception as e:
+                logger.warning(f"Error processing Pi station {station_data.get('station_id', 'unknown')}: {e}")
+                continue
+        
+        logger.debug(f"Retrieved {len(pi_aircraft)} aircraft from {len(stations)} Pi stations for region {region_name}")
         
         return pi_aircraft
     
+    @staticmethod
+    def _pi_submission_age(station_data: dict) -> float:
+        """Seconds since the bulk endpoint received a Pi station submission"""
+        aircraft = station_data.get('aircraft') or [{}]
+        received_at = station_data.get('received_at') or aircraft[0].get('received_at')
+        if not received_at:
+            return 0.0
+        try:
+            age = (datetime.utcnow() - datetime.fromisoformat(received_at)).total_seconds()
+        except (TypeError, ValueError):
+            return 0.0
+        return max(age, 0.0)
+    
     async def collect_all_regions(self):
         """Collect data for all enabled regions"""
         start_time = time.time()
@@ -268,12 +314,21 @@ class CollectorService:
                 logger.error(f"Error in collection loop: {e}")
                 await asyncio.sleep(5)  # Brief pause before retrying
     
+    async def close(self):
+        """Release pooled connections held by the collectors"""
+        await self.http_client.close()
+    
     def get_collector_stats(self) -> Dict:
         """Get statistics for all collectors"""
         stats = {
             'regions': {},
             'total_collectors': 0,
-            'enabled_regions': len(self.region_collectors)
+            'enabled_regions': len(self.region_collectors),
+            'http_pool': self.http_client.get_stats(),
+            'aircraft_db_cache': self.blender.aircraft_db.get_cache_stats(),
+            'streams': self.broadcaster.get_stats(),
+            'tracks': self.redis_service.tracks.get_stats(),
+            'archive': self.snapshot_archive.get_stats()
         }
         
         for region_name, region_data in self.region_collectors.items():
@@ -0,0 +1,126 @@
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from ..config.loader import Config, load_config
+from ..middleware.rate_limiter import RedisRateLimiter
+from .redis_service import RedisService
+from .response_cache import ResponseCache
+from .snapshot_archive import SnapshotArchive
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Process-wide owner of shared services
+
+    Every module that needs Redis resolves the same RedisService (and so the
+    same connection pools) from here instead of constructing its own, so the
+    connection count and startup pings no longer scale with importers.
+    """
+
+    def __init__(self):
+        self.redis_config: Optional[Dict[str, Any]] = None
+        self.track_config: Optional[Dict[str, Any]] = None
+        self.archive_config: Optional[Dict[str, Any]] = None
+        self.rate_limit_config: Optional[Dict[str, Any]] = None
+        self._redis_service: Optional[RedisService] = None
+        self._response_cache: Optional[ResponseCache] = None
+        self._snapshot_archive: Optional[SnapshotArchive] = None
+        self._rate_limiter: Optional[RedisRateLimiter] = None
+        self._lock = threading.Lock()
+
+    def configure(self, config: Config):
+        """Apply global.redis, global.tracks, global.archive and global.rate_limit settings (must happen before first use to take effect)"""
+        if self._snapshot_archive is None:
+            self.archive_config = dict(config.global_config.archive)
+        if self._rate_limiter is None:
+            self.rate_limit_config = dict(config.global_config.rate_limit)
+        if self._redis_service is not None:
+            logger.debug("Service container already initialized - keeping existing Redis pool")
+            return
+        self.redis_config = dict(config.global_config.redis)
+        self.track_config = dict(config.global_config.tracks)
+
+    def _load_redis_config(self) -> Dict[str, Any]:
+        try:
+            return dict(load_config().global_config.redis)
+        except Exception as e:
+            logger.warning(f"Could not load Redis settings from config, using defaults: {e}")
+            return {}
+
+    @property
+    def redis_service(self) -> RedisService:
+        """The shared RedisService, created on first use"""
+        if self._redis_service is None:
+            with self._lock:
+                if self._redis_service is None:
+                    settings = self.redis_config if self.redis_config is not None else self._load_redis_config()
+                    self._redis_service = RedisService(
+                        storage_mode=settings.get('storage_mode', 'snapshot'),
+                        max_connections=settings.get('max_connections', 50),
+                        health_check_interval=settings.get('health_check_interval', 30),
+                        snapshot_codec=settings.get('snapshot_codec', 'json'),
+                        track_config=self.track_config
+                    )
+        return self._redis_service
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """The shared pre-serialized response cache"""
+        if self._response_cache is None:
+            self._response_cache = ResponseCache(self.redis_service)
+        return self._response_cache
+
+    @property
+    def snapshot_archive(self) -> SnapshotArchive:
+        """The shared on-disk snapshot archive (disabled unless global.archive.enabled)"""
+        if self._snapshot_archive is None:
+            self._snapshot_archive = SnapshotArchive(self.archive_config)
+        return self._snapshot_archive
+    
+    @property
+    def rate_limiter(self) -> Optional[RedisRateLimiter]:
+        """The shared Redis rate limiter, or None unless configured and global.rate_limit.backend is redis"""
+        if self._rate_limiter is None:
+            if not self.rate_limit_config or self.rate_limit_config.get('backend', 'local') != 'redis':
+                return None
+            self._rate_limiter = RedisRateLimiter(self.redis_service, self.rate_limit_config)
+            logger.info("🚦 Rate limits shared across tasks through Redis")
+        return self._rate_limiter
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """Check shared service health (reconnects Redis if it was down)"""
+        if self._redis_service is None:
+            return {'redis': {'initialized': False}}
+        return {'redis': await self._redis_service.ahealth_check()}
+
+    async def aclose(self):
+        """Flush the archive and close shared connection pools"""
+        if self._snapshot_archive is not None:
+            await self._snapshot_archive.aflush()
+        if self._redis_service is not None:
+            await self._redis_service.aclose()
+
+
+container = ServiceContainer()
+
+
+def get_redis_service() -> RedisService:
+    """FastAPI dependency for the shared RedisService"""
+    return container.redis_service
+
+
+def get_response_cache() -> ResponseCache:
+    """FastAPI dependency for the shared response cache"""
+    return container.response_cache
+
+
+def get_snapshot_archive() -> SnapshotArchive:
+    """FastAPI dependency for the shared snapshot archive"""
+    return container.snapshot_archive
+
+
+def get_rate_limiter() -> Optional[RedisRateLimiter]:
+    """Shared Redis rate limiter for SecurityMiddleware (None = per-task limits)"""
+    return container.rate_limiter
@@ -1,100 +1,402 @@
+import asyncio
 import json
+import time
 import logging
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import redis
+import redis.asyncio as redis_async
+from redis.client import NEVER_DECODE
 from datetime import datetime
 
-from ..models.aircraft import Aircraft
+from ..models.aircraft import AircraftRecord
 from ..config.loader import get_redis_config
+from .snapshot_codec import decode_snapshot, get_codec, is_json_blob
+from .track_store import TrackStore
 
 logger = logging.getLogger(__name__)
 
+# Region data TTL (seconds)
+REGION_DATA_TTL = 300
+
+# Fields that change every cycle without new information (derived on read in delta mode)
+VOLATILE_FIELDS = ('seen',)
+
+# Minimum seconds between reconnect attempts after Redis was unreachable
+RECONNECT_INTERVAL = 30
+
+# Re-write an unchanged aircraft in delta mode once its last message moved by more than this
+SEEN_TOLERANCE = 1.0
+
+# Read snapshot blobs as bytes even though the clients decode responses
+RAW_RESPONSE = {NEVER_DECODE: True}
+
+# Region data types that delta mode stores per aircraft instead of as blobs
+DELTA_DATA_TYPES = ('flights', 'choppers')
+
 
 class RedisService:
-    """Redis service for storing and retrieving flight data"""
+    """Redis service for storing and retrieving flight data
+    
+    Async methods (prefixed with 'a') share a sized redis.asyncio connection
+    pool and are used by the API and collector so Redis round trips never
+    block the event loop. The synchronous methods remain for CLI scripts.
+    """
     
-    def __init__(self):
+    def __init__(self, storage_mode: str = "snapshot", max_connections: int = 50,
+                 health_check_interval: int = 30, snapshot_codec: str = "json",
+                 track_config: Optional[Dict] = None, redis_url: Optional[str] = None):
         self.redis_client = None
+        self.async_client = None
+        self.max_connections = max_connections
+        # Connect here instead of REDIS_HOST/REDIS_PORT/REDIS_DB (e.g. a scratch database for replays)
+        self.redis_url = redis_url
+        # Idle pooled connections are PINGed before reuse after this many seconds
+        self.health_check_interval = health_check_interval
+        self.last_connect_attempt = 0.0
         # In-memory storage when Redis is unavailable
         self.memory_store = {}
+        
+        # "snapshot": full JSON blobs per region; "delta": per-aircraft region hash,
+        # choppers as an id set, and writes only for aircraft that changed
+        self.storage_mode = storage_mode
+        self._delta_state: Dict[str, Dict] = {}
+        
+        # Serializer for snapshot-mode region blobs; readers detect any codec from the blob
+        self.codec = get_codec(snapshot_codec)
+        if storage_mode == "delta" and self.codec.name != "json":
+            logger.warning(f"Snapshot codec '{self.codec.name}' is not used in delta storage mode")
+        
+        # Per-aircraft position history appended on every region store
+        self.tracks = TrackStore(track_config)
         self._connect()
     
     def _connect(self):
         """Connect to Redis"""
+        self.last_connect_attempt = time.time()
         try:
             config = get_redis_config()
-            self.redis_client = redis.Redis(**config)
+            config['health_check_interval'] = self.health_check_interval
+            if self.redis_url:
+                # URL supplies host, port and db
+                for key in ('host', 'port', 'db'):
+                    config.pop(key)
+                sync_pool = redis.ConnectionPool.from_url(self.redis_url, max_connections=self.max_connections,
+                                                          **config)
+                async_pool = redis_async.BlockingConnectionPool.from_url(
+                    self.redis_url, max_connections=self.max_connections, timeout=5, **config
+                )
+            else:
+                sync_pool = redis.ConnectionPool(max_connections=self.max_connections, **config)
+                # Async pool waits for a free connection instead of failing when exhausted
+                async_pool = redis_async.BlockingConnectionPool(
+                    max_connections=self.max_connections, timeout=5, **config
+                )
+            self.redis_client = redis.Redis(connection_pool=sync_pool)
             self.redis_client.ping()
-            logger.info("Connected to Redis successfully")
+            self.async_client = redis_async.Redis(connection_pool=async_pool)
+            logger.info(f"Connected to Redis successfully (pool size {self.max_connections})")
         except Exception as e:
             logger.warning(f"Redis connection failed: {e}")
             logger.warning("Running without Redis - data will not be persisted")
             self.redis_client = None
+            self.async_client = None
     
-    def store_region_data(self, region: str, aircraft_list: List[Aircraft], 
-                         helicopters: List[Aircraft], location: Dict):
-        """Store aircraft data for a region"""
+    async def ahealth_check(self) -> Dict:
+        """Ping Redis on the async pool; retries the connection if Redis was unreachable"""
+        if self.async_client is None:
+            if time.time() - self.last_connect_attempt >= RECONNECT_INTERVAL:
+                logger.info("Retrying Redis connection")
+                await asyncio.to_thread(self._connect)
+            if self.async_client is None:
+                return {'connected': False, 'mode': 'memory'}
         
         try:
-            timestamp = datetime.now().isoformat()
-            
-            # Pre-serialize aircraft data once
-            enriched_aircraft = [aircraft.dict() for aircraft in aircraft_list]
-            helicopter_data = [heli.dict() for heli in helicopters]
-            
-            # Store all flights
-            flights_data = {
-                'timestamp': timestamp,
-                'aircraft_count': len(enriched_aircraft),
-                'aircraft': enriched_aircraft,
-                'location': location,
-                'region': region
-            }
-            
-            # Store helicopters only
-            choppers_data = {
-                'timestamp': timestamp,
-                'aircraft_count': len(helicopter_data),
-                'aircraft': helicopter_data,
-                'location': location,
-                'region': region
+            start = time.perf_counter()
+            await self.async_client.ping()
+            latency_ms = (time.perf_counter() - start) * 1000
+            return {
+                'connected': True,
+                'latency_ms': round(latency_ms, 2),
+                'max_connections': self.max_connections,
+                'storage_mode': self.storage_mode,
+                'snapshot_codec': self.codec.name
             }
+        except Exception as e:
+            logger.warning(f"Redis health check failed: {e}")
+            return {'connected': False, 'error': str(e)}
+    
+    async def aclose(self):
+        """Close the async connection pool"""
+        if self.async_client:
+            try:
+                await self.async_client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing async Redis pool: {e}")
+    
+    def store_region_data(self, region: str, aircraft_list: List[AircraftRecord], 
+                         helicopters: List[AircraftRecord], location: Dict,
+                         now: Optional[float] = None) -> Optional[Dict]:
+        """Store aircraft data for a region, returning the stored flights snapshot
+        
+        now (epoch seconds, default the wall clock) dates the snapshot and its track points.
+        """
+        now = now if now is not None else time.time()
+        try:
+            flights_data, choppers_data = self._build_region_snapshots(region, aircraft_list, helicopters,
+                                                                       location, now)
             
             # Store in Redis if available, otherwise in memory
             if self.redis_client:
                 pipeline = self.redis_client.pipeline()
-                
-                # Regional data
-                pipeline.setex(f"{region}:flights", 300, json.dumps(flights_data))
-                pipeline.setex(f"{region}:choppers", 300, json.dumps(choppers_data))
-                
-                # Individual aircraft for quick lookups
-                for aircraft_data in enriched_aircraft:
-                    key = f"aircraft_live:{aircraft_data['hex']}"
-                    pipeline.setex(key, 300, json.dumps(aircraft_data))
-                
-                pipeline.execute()
+                finish = self._queue_region_store(pipeline, region, flights_data, choppers_data, helicopters, now)
+                finish(pipeline.execute())
             else:
-                # Store in memory
-                self.memory_store[f"{region}:flights"] = flights_data
-                self.memory_store[f"{region}:choppers"] = choppers_data
+                self._store_region_memory(region, flights_data, choppers_data, now)
             
-            # Log closest aircraft
-            if enriched_aircraft:
-                closest = enriched_aircraft[0]
-                distance = closest.get('distance_miles', 'unknown')
-                flight = closest.get('flight', 'N/A').strip() or 'N/A'
-                registration = closest.get('registration', 'N/A') or 'N/A'
-                model = closest.get('model', 'N/A') or 'N/A'
-                altitude = closest.get('alt_baro', 'N/A')
-                
-                logger.info(f"✈️  CLOSEST AIRCRAFT: {flight} ({registration}) - {model}")
-                logger.info(f"📍 Distance: {distance} mi | Altitude: {altitude} ft | Hex: {closest.get('hex', 'N/A')}")
+            self._log_region_store(region, flights_data, choppers_data)
+            return flights_data
             
-            logger.info(f"Stored {len(enriched_aircraft)} aircraft, {len(helicopter_data)} choppers for {region}")
+        except Exception as e:
+            logger.error(f"Failed to store region data in Redis: {e}")
+            return None
+    
+    async def astore_region_data(self, region: str, aircraft_list: List[AircraftRecord],
+                                 helicopters: List[AircraftRecord], location: Dict,
+                                 now: Optional[float] = None) -> Optional[Dict]:
+        """Async store_region_data"""
+        now = now if now is not None else time.time()
+        try:
+            flights_data, choppers_data = self._build_region_snapshots(region, aircraft_list, helicopters,
+                                                                       location, now)
+            
+            if self.async_client:
+                pipeline = self.async_client.pipeline()
+                finish = self._queue_region_store(pipeline, region, flights_data, choppers_data, helicopters, now)
+                finish(await pipeline.execute())
+            else:
+                self._store_region_memory(region, flights_data, choppers_data, now)
+            
+            self._log_region_store(region, flights_data, choppers_data)
+            return flights_data
             
         except Exception as e:
             logger.error(f"Failed to store region data in Redis: {e}")
+            return None
+    
+    @staticmethod
+    def _build_region_snapshots(region: str, aircraft_list: List[AircraftRecord],
+                                helicopters: List[AircraftRecord], location: Dict, now: float):
+        """Build the flights and choppers snapshot dicts for a region"""
+        timestamp = datetime.fromtimestamp(now).isoformat()
+        
+        # Pre-serialize aircraft data once
+        enriched_aircraft = [aircraft.to_dict() for aircraft in aircraft_list]
+        helicopter_data = [heli.to_dict() for heli in helicopters]
+        
+        # Store all flights
+        flights_data = {
+            'timestamp': timestamp,
+            'aircraft_count': len(enriched_aircraft),
+            'aircraft': enriched_aircraft,
+            'location': location,
+            'region': region
+        }
+        
+        # Store helicopters only
+        choppers_data = {
+            'timestamp': timestamp,
+            'aircraft_count': len(helicopter_data),
+            'aircraft': helicopter_data,
+            'location': location,
+            'region': region
+        }
+        return flights_data, choppers_data
+    
+    def _queue_region_store(self, pipeline, region: str, flights_data: Dict, choppers_data: Dict,
+                            helicopters: List[AircraftRecord], now: float) -> Callable[[List], None]:
+        """Queue region writes on a (sync or async) pipeline; returns the result handler"""
+        timestamp = flights_data['timestamp']
+        
+        # Queued first: delta mode's result handler inspects the last results
+        self.tracks.queue_points(pipeline, region, flights_data['aircraft'], now)
+        
+        if self.storage_mode == "delta":
+            helicopter_hexes = {heli.hex.lower() for heli in helicopters}
+            return self._queue_region_delta(pipeline, region, timestamp, flights_data['aircraft'],
+                                            helicopter_hexes, flights_data['location'], now)
+        
+        # Regional data
+        pipeline.setex(f"{region}:flights", REGION_DATA_TTL, self.codec.encode(flights_data))
+        pipeline.setex(f"{region}:choppers", REGION_DATA_TTL, self.codec.encode(choppers_data))
+        
+        # Snapshot timestamps let readers detect changes without fetching the blobs
+        pipeline.setex(f"{region}:flights:timestamp", REGION_DATA_TTL, timestamp)
+        pipeline.setex(f"{region}:choppers:timestamp", REGION_DATA_TTL, timestamp)
+        
+        # Individual aircraft for quick lookups
+        for aircraft_data in flights_data['aircraft']:
+            key = f"aircraft_live:{aircraft_data['hex'].lower()}"
+            pipeline.setex(key, REGION_DATA_TTL, json.dumps(aircraft_data))
+        
+        return lambda results: None
+    
+    def _store_region_memory(self, region: str, flights_data: Dict, choppers_data: Dict, now: float):
+        """Store region snapshots in memory when Redis is unavailable"""
+        self.memory_store[f"{region}:flights"] = flights_data
+        self.memory_store[f"{region}:choppers"] = choppers_data
+        self.tracks.record_memory(region, flights_data['aircraft'], now)
+    
+    @staticmethod
+    def _log_region_store(region: str, flights_data: Dict, choppers_data: Dict):
+        """Log the closest aircraft and stored counts"""
+        enriched_aircraft = flights_data['aircraft']
+        
+        # Log closest aircraft
+        if enriched_aircraft:
+            closest = enriched_aircraft[0]
+            distance = closest.get('distance_miles', 'unknown')
+            flight = closest.get('flight', 'N/A').strip() or 'N/A'
+            registration = closest.get('registration', 'N/A') or 'N/A'
+            model = closest.get('model', 'N/A') or 'N/A'
+            altitude = closest.get('alt_baro', 'N/A')
+            
+            logger.info(f"✈️  CLOSEST AIRCRAFT: {flight} ({registration}) - {model}")
+            logger.info(f"📍 Distance: {distance} mi | Altitude: {altitude} ft | Hex: {closest.get('hex', 'N/A')}")
+        
+        logger.info(f"Stored {len(enriched_aircraft)} aircraft, {len(choppers_data['aircraft'])} choppers for {region}")
+    
+    def _queue_region_delta(self, pipeline, region: str, timestamp: str, aircraft: List[Dict],
+                            helicopter_hexes: set, location: Dict, now: float) -> Callable[[List], None]:
+        """Queue writes for only the changed aircraft into the region hash ({region}:aircraft)"""
+        state = self._delta_state.setdefault(region, {'aircraft': {}, 'choppers': None})
+        written = state['aircraft']
+        
+        changed = {}
+        current = {}
+        for aircraft_data in aircraft:
+            # Hash fields use lower-case hex like the other per-aircraft keys; dump1090 records are upper-case
+            hex_code = aircraft_data['hex'].lower()
+            seen_at = now - (aircraft_data.get('seen') or 0)
+            comparable = json.dumps({k: v for k, v in aircraft_data.items() if k not in VOLATILE_FIELDS})
+            
+            previous = written.get(hex_code)
+            if previous and previous[0] == comparable and abs(previous[1] - seen_at) <= SEEN_TOLERANCE:
+                current[hex_code] = previous
+                continue
+            
+            current[hex_code] = (comparable, seen_at)
+            changed[hex_code] = json.dumps({**aircraft_data, '_seen_at': round(seen_at, 1)})
+        
+        removed = [hex_code for hex_code in written if hex_code not in current]
+        
+        aircraft_key = f"{region}:aircraft"
+        choppers_key = f"{region}:choppers:ids"
+        meta_key = f"{region}:snapshot"
+        
+        if not written:
+            # Full write (first cycle or after a reset): drop fields a previous writer left behind
+            pipeline.delete(aircraft_key)
+        if changed:
+            pipeline.hset(aircraft_key, mapping=changed)
+        if removed:
+            pipeline.hdel(aircraft_key, *removed)
+        
+        if helicopter_hexes != state['choppers']:
+            pipeline.delete(choppers_key)
+            if helicopter_hexes:
+                pipeline.sadd(choppers_key, *helicopter_hexes)
+        
+        # Order is kept so readers get the blender's priority sort
+        pipeline.hset(meta_key, mapping={
+            'timestamp': timestamp,
+            'epoch': now,
+            'location': json.dumps(location),
+            'order': json.dumps(list(current.keys()))
+        })
+        pipeline.setex(f"{region}:flights:timestamp", REGION_DATA_TTL, timestamp)
+        pipeline.setex(f"{region}:choppers:timestamp", REGION_DATA_TTL, timestamp)
+        
+        # Snapshot-mode blobs would shadow delta data on read
+        pipeline.delete(f"{region}:flights", f"{region}:choppers")
+        
+        pipeline.expire(meta_key, REGION_DATA_TTL)
+        pipeline.expire(choppers_key, REGION_DATA_TTL)
+        pipeline.expire(aircraft_key, REGION_DATA_TTL)
+        # Queued last: the hash holds exactly the current aircraft unless it expired, was flushed or evicted
+        pipeline.hlen(aircraft_key)
+        
+        def finish(results: List):
+            # A missing or partial hash (HSET recreates it with only the changed aircraft)
+            # forces a full write next cycle
+            if results[-1] != len(current):
+                state['aircraft'] = {}
+                state['choppers'] = None
+                logger.warning(f"Region hash {aircraft_key} has {results[-1]} of {len(current)} aircraft - "
+                               f"rewriting all aircraft next cycle")
+            else:
+                state['aircraft'] = current
+                state['choppers'] = helicopter_hexes
+            
+            logger.debug(f"Delta store {region}: {len(changed)} written, {len(removed)} removed, "
+                         f"{len(current) - len(changed)} unchanged")
+        
+        return finish
+    
+    @staticmethod
+    def _queue_delta_read(pipeline, region: str):
+        """Queue the reads needed to assemble a delta-mode region snapshot"""
+        pipeline.hgetall(f"{region}:snapshot")
+        pipeline.hgetall(f"{region}:aircraft")
+        pipeline.smembers(f"{region}:choppers:ids")
+    
+    @staticmethod
+    def _assemble_delta(region: str, data_type: str, results: List) -> Optional[Dict]:
+        """Assemble a region snapshot from delta-mode storage"""
+        meta, aircraft_hash, chopper_ids = results
+        
+        if not meta:
+            return None
+        
+        epoch = float(meta.get('epoch', 0))
+        aircraft = []
+        for hex_code in json.loads(meta.get('order', '[]')):
+            if data_type == "choppers" and hex_code not in chopper_ids:
+                continue
+            raw = aircraft_hash.get(hex_code)
+            if raw is None:
+                continue
+            
+            aircraft_data = json.loads(raw)
+            seen_at = aircraft_data.pop('_seen_at', None)
+            if seen_at is not None:
+                aircraft_data['seen'] = round(max(epoch - seen_at, 0.0), 1)
+            aircraft.append(aircraft_data)
+        
+        return {
+            'timestamp': meta.get('timestamp'),
+            'aircraft_count': len(aircraft),
+            'aircraft': aircraft,
+            'location': json.loads(meta.get('location', '{}')),
+            'region': region
+        }
+    
+    def _read_region(self, region: str, data_type: str):
+        """Raw snapshot blob and delta-mode snapshot stored for a region (either may be None)"""
+        blob = self.redis_client.execute_command("GET", f"{region}:{data_type}", **RAW_RESPONSE)
+        if blob or data_type not in DELTA_DATA_TYPES:
+            return blob, None
+        pipeline = self.redis_client.pipeline(transaction=True)
+        self._queue_delta_read(pipeline, region)
+        return None, self._assemble_delta(region, data_type, pipeline.execute())
+    
+    async def _aread_region(self, region: str, data_type: str):
+        """Async _read_region"""
+        blob = await self.async_client.execute_command("GET", f"{region}:{data_type}", **RAW_RESPONSE)
+        if blob or data_type not in DELTA_DATA_TYPES:
+            return blob, None
+        pipeline = self.async_client.pipeline(transaction=True)
+        self._queue_delta_read(pipeline, region)
+        return None, self._assemble_delta(region, data_type, await pipeline.execute())
     
     def store_data(self, key: str, data: Dict, ttl: int = 300):
         """Store arbitrary data with TTL"""
@@ -112,22 +414,272 @@ class RedisService:
         key = f"{region}:{data_type}"
         self.store_data(key, data, ttl)
     
+    def store_pi_station_data(self, region: str, station_id: str, station_data: Dict, ttl: int = 300):
+        """Store a Pi station submission and index the station as live for its region
+        
+        Stations are indexed in a per-region sorted set scored by last-seen time
+        so the collector never has to scan the keyspace for pi_data:* keys.
+        """
+        try:
+            if self.redis_client:
+                pipeline = self.redis_client.pipeline(transaction=False)
+                self._queue_pi_station_store(pipeline, region, station_id, station_data, ttl)
+                pipeline.execute()
+            else:
+                self._store_pi_station_memory(region, station_id, station_data)
+            logger.debug(f"Stored Pi station data at key: pi_data:{region}:{station_id}")
+        except Exception as e:
+            logger.error(f"Failed to store Pi station data at key pi_data:{region}:{station_id}: {e}")
+    
+    async def astore_pi_station_data(self, region: str, station_id: str, station_data: Dict, ttl: int = 300):
+        """Async store_pi_station_data"""
+        try:
+            if self.async_client:
+                pipeline = self.async_client.pipeline(transaction=False)
+                self._queue_pi_station_store(pipeline, region, station_id, station_data, ttl)
+                await pipeline.execute()
+            else:
+                self._store_pi_station_memory(region, station_id, station_data)
+            logger.debug(f"Stored Pi station data at key: pi_data:{region}:{station_id}")
+        except Exception as e:
+            logger.error(f"Failed to store Pi station data at key pi_data:{region}:{station_id}: {e}")
+    
+    @staticmethod
+    def _queue_pi_station_store(pipeline, region: str, station_id: str, station_data: Dict, ttl: int):
+        """Queue a Pi station submission and its last-seen entry in the region's station index"""
+        pipeline.setex(f"pi_data:{region}:{station_id}", ttl, json.dumps(station_data))
+        pipeline.zadd(f"pi_stations:{region}", {station_id: time.time()})
+        pipeline.expire(f"pi_stations:{region}", ttl * 2)
+    
+    def _store_pi_station_memory(self, region: str, station_id: str, station_data: Dict):
+        """Store a Pi station submission in memory when Redis is unavailable"""
+        self.memory_store[f"pi_data:{region}:{station_id}"] = station_data
+        self.memory_store.setdefault(f"pi_stations:{region}", {})[station_id] = time.time()
+    
+    def get_pi_station_data(self, region: str, max_age: int = 300) -> List[Dict]:
+        """Get submissions from all Pi stations seen in the region within max_age seconds"""
+        cutoff = time.time() - max_age
+        
+        if self.redis_client:
+            try:
+                # Prune stale stations and read the live ones in one round trip
+                pipeline = self.redis_client.pipeline(transaction=False)
+                self._queue_pi_station_index(pipeline, region, cutoff)
+                _, station_ids = pipeline.execute()
+                if not station_ids:
+                    return []
+                
+                values = self.redis_client.mget(self._pi_station_keys(region, station_ids))
+                submissions, expired = self._pi_station_submissions(station_ids, values)
+                if expired:
+                    self.redis_client.zrem(f"pi_stations:{region}", *expired)
+                return submissions
+            except Exception as e:
+                logger.error(f"Failed to get Pi station data from Redis: {e}")
+                return []
+        
+        return self._get_pi_station_data_memory(region, cutoff)
+    
+    async def aget_pi_station_data(self, region: str, max_age: int = 300) -> List[Dict]:
+        """Async get_pi_station_data"""
+        cutoff = time.time() - max_age
+        
+        if self.async_client:
+            try:
+                pipeline = self.async_client.pipeline(transaction=False)
+                self._queue_pi_station_index(pipeline, region, cutoff)
+                _, station_ids = await pipeline.execute()
+                if not station_ids:
+                    return []
+                
+                values = await self.async_client.mget(self._pi_station_keys(region, station_ids))
+                submissions, expired = self._pi_station_submissions(station_ids, values)
+                if expired:
+                    await self.async_client.zrem(f"pi_stations:{region}", *expired)
+                return submissions
+            except Exception as e:
+                logger.error(f"Failed to get Pi station data from Redis: {e}")
+                return []
+        
+        return self._get_pi_station_data_memory(region, cutoff)
+    
+    @staticmethod
+    def _queue_pi_station_index(pipeline, region: str, cutoff: float):
+        """Queue pruning stations not seen since cutoff, then reading the live station ids"""
+        index_key = f"pi_stations:{region}"
+        pipeline.zremrangebyscore(index_key, "-inf", f"({cutoff}")
+        pipeline.zrange(index_key, 0, -1)
+    
+    @staticmethod
+    def _pi_station_keys(region: str, station_ids: List[str]) -> List[str]:
+        """Data keys of the given stations"""
+        return [f"pi_data:{region}:{station_id}" for station_id in station_ids]
+    
+    @staticmethod
+    def _pi_station_submissions(station_ids: List[str], values: List[Optional[str]]):
+        """Decoded submissions, and the index entries whose data key has already expired"""
+        expired = [station_id for station_id, value in zip(station_ids, values) if value is None]
+        return [json.loads(value) for value in values if value], expired
+    
+    def _get_pi_station_data_memory(self, region: str, cutoff: float) -> List[Dict]:
+        """Fallback to memory store"""
+        stations = self.memory_store.get(f"pi_stations:{region}", {})
+        return [
+            self.memory_store[f"pi_data:{region}:{station_id}"]
+            for station_id, last_seen in list(stations.items())
+            if last_seen >= cutoff and f"pi_data:{region}:{station_id}" in self.memory_store
+        ]
+    
     def get_region_data(self, region: str, data_type: str = "flights") -> Optional[Dict]:
         """Get stored aircraft data for a region"""
-        key = f"{region}:{data_type}"
-        
         # Try Redis first
         if self.redis_client:
             try:
-                data = self.redis_client.get(key)
+                blob, data = self._read_region(region, data_type)
+                if blob:
+                    return decode_snapshot(blob)
                 if data:
-                    return json.loads(data)
+                    return data
             except Exception as e:
                 logger.error(f"Failed to get region data from Redis: {e}")
         
         # Fallback to memory store
-        return self.memory_store.get(key)
+        return self.memory_store.get(f"{region}:{data_type}")
+    
+    async def aget_region_data(self, region: str, data_type: str = "flights") -> Optional[Dict]:
+        """Async get_region_data"""
+        if self.async_client:
+            try:
+                blob, data = await self._aread_region(region, data_type)
+                if blob:
+                    return decode_snapshot(blob)
+                if data:
+                    return data
+            except Exception as e:
+                logger.error(f"Failed to get region data from Redis: {e}")
+        
+        return self.memory_store.get(f"{region}:{data_type}")
+    
+    def get_region_timestamp(self, region: str, data_type: str = "flights") -> Optional[str]:
+        """Get the timestamp of the stored snapshot for a region without fetching it"""
+        if self.redis_client:
+            try:
+                pipeline = self.redis_client.pipeline(transaction=False)
+                self._queue_timestamp_read(pipeline, region, data_type)
+                timestamp, legacy_snapshot = pipeline.execute()
+                if timestamp or not legacy_snapshot:
+                    return timestamp
+                data = self.get_region_data(region, data_type)
+                return data.get('timestamp') if data else None
+            except Exception as e:
+                logger.error(f"Failed to get region timestamp from Redis: {e}")
+        
+        return self._get_region_timestamp_memory(region, data_type)
     
+    async def aget_region_timestamp(self, region: str, data_type: str = "flights") -> Optional[str]:
+        """Async get_region_timestamp"""
+        if self.async_client:
+            try:
+                pipeline = self.async_client.pipeline(transaction=False)
+                self._queue_timestamp_read(pipeline, region, data_type)
+                timestamp, legacy_snapshot = await pipeline.execute()
+                if timestamp or not legacy_snapshot:
+                    return timestamp
+                data = await self.aget_region_data(region, data_type)
+                return data.get('timestamp') if data else None
+            except Exception as e:
+                logger.error(f"Failed to get region timestamp from Redis: {e}")
+        
+        return self._get_region_timestamp_memory(region, data_type)
+    
+    @staticmethod
+    def _queue_timestamp_read(pipeline, region: str, data_type: str):
+        """Queue the snapshot timestamp read, plus an existence check for snapshots written before
+        timestamps were stored separately"""
+        pipeline.get(f"{region}:{data_type}:timestamp")
+        pipeline.exists(f"{region}:{data_type}")
+    
+    def _get_region_timestamp_memory(self, region: str, data_type: str) -> Optional[str]:
+        """Fallback to memory store"""
+        data = self.memory_store.get(f"{region}:{data_type}")
+        return data.get('timestamp') if data else None
+    
+    @staticmethod
+    def _payload_json(blob: bytes) -> bytes:
+        """JSON bytes for a stored snapshot; plain JSON blobs pass through unparsed"""
+        if is_json_blob(blob):
+            return blob
+        return json.dumps(decode_snapshot(blob)).encode('utf-8')
+    
+    def _region_payload(self, region: str, data_type: str, blob: Optional[bytes],
+                        data: Optional[Dict]) -> Optional[bytes]:
+        """Serialized JSON for a region read, falling back to the memory store"""
+        if blob:
+            return self._payload_json(blob)
+        data = data or self.memory_store.get(f"{region}:{data_type}")
+        return json.dumps(data).encode('utf-8') if data else None
+    
+    def get_region_payload(self, region: str, data_type: str = "flights") -> Optional[bytes]:
+        """Get the stored snapshot for a region as serialized JSON"""
+        if self.redis_client:
+            try:
+                return self._region_payload(region, data_type, *self._read_region(region, data_type))
+            except Exception as e:
+                logger.error(f"Failed to get region payload from Redis: {e}")
+        
+        return self._region_payload(region, data_type, None, None)
+    
+    async def aget_region_payload(self, region: str, data_type: str = "flights") -> Optional[bytes]:
+        """Async get_region_payload"""
+        if self.async_client:
+            try:
+                return self._region_payload(region, data_type, *await self._aread_region(region, data_type))
+            except Exception as e:
+                logger.error(f"Failed to get region payload from Redis: {e}")
+        
+        return self._region_payload(region, data_type, None, None)
+    
+    def get_live_aircraft(self, hex_code: str, regions: List[str]) -> Optional[Dict]:
+        """Latest stored record for one aircraft (aircraft_live key, or the delta-mode region hashes)"""
+        hex_code = hex_code.lower()
+        if self.redis_client:
+            try:
+                data = self.redis_client.get(f"aircraft_live:{hex_code}")
+                if data:
+                    return json.loads(data)
+                for region in regions:
+                    raw = self.redis_client.hget(f"{region}:aircraft", hex_code)
+                    if raw:
+                        aircraft_data = json.loads(raw)
+                        seen_at = aircraft_data.pop('_seen_at', None)
+                        if seen_at is not None:
+                            aircraft_data['seen'] = round(max(time.time() - seen_at, 0.0), 1)
+                        return aircraft_data
+            except Exception as e:
+                logger.error(f"Failed to get live aircraft from Redis: {e}")
+        
+        for region in regions:
+            data = self.memory_store.get(f"{region}:flights") or {}
+            for aircraft_data in data.get('aircraft', []):
+                if aircraft_data.get('hex', '').lower() == hex_code:
+                    return aircraft_data
+        return None
+    
+    def get_aircraft_track(self, region: str, hex_code: str, since: Optional[float] = None) -> List[Dict]:
+        """Get the recorded position history of one aircraft in a region"""
+        try:
+            return self.tracks.get_track(self.redis_client, region, hex_code, since)
+        except Exception as e:
+            logger.error(f"Failed to get aircraft track from Redis: {e}")
+            return []
+    
+    async def aget_aircraft_track(self, region: str, hex_code: str, since: Optional[float] = None) -> List[Dict]:
+        """Async get_aircraft_track"""
+        try:
+            return await self.tracks.aget_track(self.async_client, region, hex_code, since)
+        except Exception as e:
+            logger.error(f"Failed to get aircraft track from Redis: {e}")
+            return []
     
     def get_system_status(self) -> Dict:
         """Get system status information"""
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .collector_service import CollectorService
+from .redis_service import RedisService
+from ..collectors.replay import RecordedFeed, ReplayDump1090Collector, ReplayOpenSkyCollector
+from ..config.loader import Config
+
+logger = logging.getLogger(__name__)
+
+RECORDING_SUFFIXES = ('.jsonl', '.jsonl.gz')
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+
+class FakeRedisService(RedisService):
+    """RedisService on an in-process fakeredis server, so replays never touch a real Redis"""
+
+    def _connect(self):
+        import fakeredis
+
+        self.last_connect_attempt = time.time()
+        server = fakeredis.FakeServer()
+        self.redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        self.async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        logger.info("Replaying against in-process fakeredis")
+
+
+class ReplayCollectorService(CollectorService):
+    """CollectorService whose collectors serve recorded feeds on a virtual clock
+
+    Recordings are looked up as <recordings>/<region>/<collector name or type>
+    (.jsonl, .jsonl.gz or a directory of response files). Collectors without
+    a recording are left out. redis_service is required so a replay never
+    falls back to the shared (live) RedisService.
+    """
+
+    def __init__(self, config: Config, recordings_dir: Path, redis_service: RedisService):
+        self.recordings_dir = Path(recordings_dir)
+        self.virtual_time = 0.0
+        self.feeds: Dict[str, RecordedFeed] = {}
+        super().__init__(config, redis_service)
+        self.clock = self._replay_clock
+
+    def _find_recording(self, region_name: str, collector_config: dict) -> Optional[Path]:
+        region_dir = self.recordings_dir / region_name
+        for stem in filter(None, (collector_config.get('name'), collector_config['type'])):
+            for suffix in RECORDING_SUFFIXES:
+                path = region_dir / f"{stem}{suffix}"
+                if path.is_file():
+                    return path
+            if (region_dir / stem).is_dir():
+                return region_dir / stem
+        return None
+
+    def _create_collector(self, collector_config: dict, region_config: dict, region_name: str):
+        """Create a file-backed stand-in for a configured collector"""
+        collector_type = collector_config['type']
+        collector_classes = {'dump1090': ReplayDump1090Collector, 'opensky': ReplayOpenSkyCollector}
+        if collector_type not in collector_classes:
+            logger.error(f"Unknown collector type: {collector_type}")
+            return None
+
+        path = self._find_recording(region_name, collector_config)
+        if path is None:
+            logger.warning(f"⚠️ No recording for {collector_type} in {region_name} under {self.recordings_dir}")
+            return None
+
+        feed = self.feeds[f"{region_name}:{collector_config.get('name') or collector_type}"] = RecordedFeed(path)
+        logger.info(f"📼 Replaying {collector_type} for {region_name} from {path}")
+        return collector_classes[collector_type](collector_config, region_config, feed, self._replay_clock,
+                                                 self.http_client)
+
+    def _replay_clock(self) -> float:
+        return self.virtual_time
+
+
+def latency_summary(samples: List[float]) -> Dict:
+    """Latency percentiles in milliseconds"""
+    if not samples:
+        return {'count': 0}
+    values = np.asarray(samples) * 1000
+    summary = {'count': len(samples), 'mean': round(float(values.mean()), 2)}
+    for percentile, value in zip(LATENCY_PERCENTILES, np.percentile(values, LATENCY_PERCENTILES)):
+        summary[f"p{percentile}"] = round(float(value), 2)
+    summary['max'] = round(float(values.max()), 2)
+    return summary
+
+
+class ReplayEngine:
+    """Drives recorded feeds through collect_region_data at N× speed
+
+    Replay time advances by the collection interval each cycle; at a finite
+    speed the engine sleeps so replay time runs `speed` times faster than
+    wall time, and with speed=None cycles run back to back. Every region's
+    collect → blend → enrich → store latency is measured per cycle.
+    """
+
+    def __init__(self, service: ReplayCollectorService, speed: Optional[float] = 1.0,
+                 interval: Optional[float] = None, duration: Optional[float] = None):
+        self.service = service
+        self.speed = speed
+        self.interval = interval or service.dump1090_interval
+        self.duration = duration
+
+    async def _timed_region(self, region_name: str):
+        start = time.perf_counter()
+        try:
+            stored = await self.service.collect_region_data(region_name)
+        except Exception as e:
+            logger.error(f"Replay cycle failed for {region_name}: {e}")
+            stored = False
+        return region_name, time.perf_counter() - start, stored
+
+    def _region_aircraft(self, region_name: str) -> int:
+        state = self.service.blender.region_states.get(region_name)
+        return len(state.entries) if state is not None else 0
+
+    async def run(self) -> Dict:
+        """Replay every recorded feed to the end (or duration) and return a latency report"""
+        feeds = list(self.service.feeds.values())
+        start_times = [feed.start_time for feed in feeds if feed.start_time is not None]
+        if not start_times:
+            raise ValueError("No recorded frames to replay")
+
+        regions = list(self.service.region_collectors.keys())
+        replay_start = min(start_times)
+        replay_end = replay_start + self.duration if self.duration else None
+        replay_time = replay_start
+
+        cycle_latencies: List[float] = []
+        region_latencies: Dict[str, List[float]] = {region: [] for region in regions}
+        peak_aircraft: Dict[str, int] = {region: 0 for region in regions}
+        failed_cycles = 0
+
+        speed_label = f"{self.speed:g}x" if self.speed else "max speed"
+        logger.info(f"▶️ Replaying {len(feeds)} feeds for {len(regions)} regions at {speed_label}")
+        wall_start = time.perf_counter()
+
+        while not all(feed.exhausted for feed in feeds) and (replay_end is None or replay_time <= replay_end):
+            if self.speed:
+                delay = wall_start + (replay_time - replay_start) / self.speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            self.service.virtual_time = replay_time
+            cycle_start = time.perf_counter()
+            results = await asyncio.gather(*(self._timed_region(region) for region in regions))
+            cycle_latencies.append(time.perf_counter() - cycle_start)
+
+            for region_name, latency, stored in results:
+                region_latencies[region_name].append(latency)
+                peak_aircraft[region_name] = max(peak_aircraft[region_name], self._region_aircraft(region_name))
+                failed_cycles += not stored
+
+            replay_time += self.interval
+
+        wall_seconds = time.perf_counter() - wall_start
+        replayed_seconds = replay_time - replay_start
+        report = {
+            'speed': self.speed or 'max',
+            'cycles': len(cycle_latencies),
+            'failed_region_cycles': failed_cycles,
+            'replayed_seconds': round(replayed_seconds, 1),
+            'wall_seconds': round(wall_seconds, 2),
+            'effective_speed': round(replayed_seconds / wall_seconds, 1) if wall_seconds else None,
+            'frames_read': {key: feed.frames_read for key, feed in self.service.feeds.items()},
+            'cycle_latency_ms': latency_summary(cycle_latencies),
+            'regions': {
+                region: {'latency_ms': latency_summary(region_latencies[region]),
+                         'peak_aircraft': peak_aircraft[region]}
+                for region in regions
+            }
+        }
+        logger.info(f"⏹️ Replay finished: {report['cycles']} cycles in {report['wall_seconds']}s "
+                    f"(p50 {report['cycle_latency_ms'].get('p50')} ms, p99 {report['cycle_latency_ms'].get('p99')} ms)")
+        return report
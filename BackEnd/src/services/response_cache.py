@@ -0,0 +1,167 @@
+import gzip
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Brotli is optional - gzip is always available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+@dataclass(slots=True)
+class CachedPayload:
+    """Serialized region snapshot with precomputed compressed variants"""
+    timestamp: str
+    body: bytes
+    gzip: bytes
+    br: Optional[bytes] = None
+    digest: str = ""
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def build(cls, timestamp: str, payload) -> "CachedPayload":
+        body = payload.encode('utf-8') if isinstance(payload, str) else bytes(payload)
+        return cls(
+            timestamp=timestamp,
+            body=body,
+            gzip=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+            br=brotli.compress(body, quality=BROTLI_QUALITY) if BROTLI_AVAILABLE else None,
+            digest=hashlib.blake2b(body, digest_size=12).hexdigest(),
+            last_modified=parse_snapshot_timestamp(timestamp)
+        )
+
+    def etag(self, encoding: Optional[str]) -> str:
+        """Strong ETag for one encoded representation of this snapshot"""
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    @property
+    def last_modified_header(self) -> Optional[str]:
+        if self.last_modified is None:
+            return None
+        return format_datetime(self.last_modified, usegmt=True)
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """Evaluate conditional request headers (If-None-Match takes precedence)"""
+        if if_none_match:
+            for tag in if_none_match.split(','):
+                tag = tag.strip()
+                if tag == '*':
+                    return True
+                # Any encoding of the same snapshot is the same entity
+                tag = tag[2:] if tag.startswith('W/') else tag
+                if tag.strip('"').split('-', 1)[0] == self.digest:
+                    return True
+            return False
+
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified <= since
+        return False
+
+    def encoded(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Best body for an Accept-Encoding header, with its Content-Encoding"""
+        encodings = parse_accept_encoding(accept_encoding)
+        if self.br is not None and encodings.get('br', 0) > 0:
+            return self.br, 'br'
+        if encodings.get('gzip', 0) > 0:
+            return self.gzip, 'gzip'
+        return self.body, None
+
+
+def parse_snapshot_timestamp(timestamp: str) -> Optional[datetime]:
+    """Snapshot timestamp (local isoformat) as a UTC datetime truncated to seconds"""
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    return parsed.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}"""
+    encodings = {}
+    if not header:
+        return encodings
+
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[coding] = q
+
+    # A wildcard accepts any coding not listed explicitly
+    if '*' in encodings:
+        for coding in ('br', 'gzip'):
+            encodings.setdefault(coding, encodings['*'])
+    return encodings
+
+
+class ResponseCache:
+    """Per-region cache of serialized snapshot bytes, keyed by data timestamp
+
+    A request costs one small timestamp read; the snapshot blob is only
+    fetched, turned into JSON (a no-op for JSON-stored snapshots) and
+    compressed again when the collector has written a new one.
+    """
+
+    def __init__(self, redis_service):
+        self.redis_service = redis_service
+        self.entries: Dict[str, CachedPayload] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+
+    async def get(self, region: str, data_type: str) -> Optional[CachedPayload]:
+        """Current serialized snapshot for a region, or None if no data"""
+        key = f"{region}:{data_type}"
+        timestamp = await self.redis_service.aget_region_timestamp(region, data_type)
+        if timestamp is None:
+            self.entries.pop(key, None)
+            return None
+
+        entry = self.entries.get(key)
+        if entry is not None and entry.timestamp == timestamp:
+            self.stats['hits'] += 1
+            return entry
+
+        self.stats['misses'] += 1
+        payload = await self.redis_service.aget_region_payload(region, data_type)
+        if payload is None:
+            return None
+
+        entry = CachedPayload.build(timestamp, payload)
+        self.entries[key] = entry
+        return entry
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        return {
+            'hits': self.stats['hits'],
+            'misses': self.stats['misses'],
+            'entries': len(self.entries),
+            'bytes': sum(len(e.body) + len(e.gzip) + len(e.br or b'') for e in self.entries.values()),
+            'brotli': BROTLI_AVAILABLE
+        }
@@ -0,0 +1,330 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# pyarrow is optional - the archive is disabled without it
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = ds = pq = None
+    PYARROW_AVAILABLE = False
+
+# flock is POSIX-only; elsewhere only the in-process lock applies
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_ARCHIVE_PATH = "data/archive"
+DEFAULT_FLUSH_INTERVAL = 300  # seconds of cycles buffered per part file
+PART_PREFIX = "part-"
+COMPACTED_FILENAME = "data.parquet"
+# Per-hour lockfile shared with scripts/compact_archive.py, which runs in another process
+LOCK_FILENAME = ".lock"
+
+# (name, arrow type) - the cycle time, aircraft dict keys, then the chopper flag
+ARCHIVE_COLUMNS = (
+    ('t', 'timestamp'),
+    ('hex', 'string'),
+    ('flight', 'string'),
+    ('lat', 'float64'),
+    ('lon', 'float64'),
+    ('alt_baro', 'int32'),
+    ('alt_geom', 'int32'),
+    ('gs', 'float32'),
+    ('track', 'float32'),
+    ('baro_rate', 'float32'),
+    ('squawk', 'string'),
+    ('on_ground', 'bool_'),
+    ('seen', 'float32'),
+    ('distance_miles', 'float32'),
+    ('data_source', 'string'),
+    ('registration', 'string'),
+    ('model', 'string'),
+    ('operator', 'string'),
+    ('typecode', 'string'),
+    ('aircraft_type', 'string'),
+    ('icao_aircraft_class', 'string'),
+    ('helicopter', 'bool_'),
+)
+
+
+def _arrow_type(kind: str):
+    return pa.timestamp('ms', tz='UTC') if kind == 'timestamp' else getattr(pa, kind)()
+
+
+def archive_schema():
+    return pa.schema([(name, _arrow_type(kind)) for name, kind in ARCHIVE_COLUMNS])
+
+
+def hour_start(epoch: float) -> datetime:
+    """UTC hour an epoch second falls in"""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+@contextmanager
+def hour_lock(hour_dir: Path, shared: bool = False):
+    """flock an hour directory: exclusive for writing parts and compacting, shared for reading"""
+    if fcntl is None:
+        yield
+        return
+    with open(hour_dir / LOCK_FILENAME, "a") as lock_file:
+        # Released when the file is closed
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+
+
+class RegionBuffer:
+    """Rows of one region waiting to be written to the current hour's segment"""
+    __slots__ = ('hour', 'columns', 'rows', 'started', 'hour_closed')
+
+    def __init__(self, hour: datetime, started: float):
+        self.hour = hour
+        self.columns: Dict[str, List] = {name: [] for name, _ in ARCHIVE_COLUMNS}
+        self.rows = 0
+        self.started = started
+        self.hour_closed = False  # Set when a later hour started - its segment can be compacted
+
+
+class SnapshotArchive:
+    """Hourly columnar (Parquet) archive of blended aircraft per region
+
+    Cycles are buffered in memory as columns and written as part files under
+    region=<r>/date=<YYYY-MM-DD>/hour=<HH>/. When an hour is over its parts
+    are compacted into one time-sorted file, so range and bounding-box
+    queries only open the hours they cover and can skip row groups by
+    their min/max statistics.
+    """
+
+    def __init__(self, archive_config: Optional[Dict] = None):
+        archive_config = archive_config or {}
+        self.enabled = bool(archive_config.get('enabled', False))
+        if self.enabled and not PYARROW_AVAILABLE:
+            logger.warning("⚠️ Snapshot archive enabled but pyarrow is not installed - archive disabled")
+            self.enabled = False
+
+        self.path = Path(archive_config.get('path', DEFAULT_ARCHIVE_PATH))
+        self.flush_interval = archive_config.get('flush_interval', DEFAULT_FLUSH_INTERVAL)
+        self.compression = archive_config.get('compression', 'zstd')
+
+        self._buffers: Dict[str, RegionBuffer] = {}
+        self._lock = threading.Lock()  # Serializes segment writes and compaction
+        self.stats = {'rows_written': 0, 'parts_written': 0, 'hours_compacted': 0, 'write_errors': 0}
+
+    def _hour_dir(self, region: str, hour: datetime) -> Path:
+        return self.path / f"region={region}" / f"date={hour:%Y-%m-%d}" / f"hour={hour:%H}"
+
+    def append(self, region: str, aircraft: List[Dict], helicopter_hexes: Set[str],
+               epoch: Optional[float] = None) -> List[Tuple[str, RegionBuffer]]:
+        """Buffer one cycle; returns the buffers that are now due to be written"""
+        if not self.enabled:
+            return []
+
+        epoch = epoch if epoch is not None else time.time()
+        hour = hour_start(epoch)
+        due = []
+
+        buffer = self._buffers.get(region)
+        if buffer is not None and buffer.hour != hour:
+            # Never let a part file span two hours
+            buffer.hour_closed = True
+            due.append((region, buffer))
+            buffer = None
+        if buffer is None:
+            buffer = self._buffers[region] = RegionBuffer(hour, epoch)
+
+        t = int(epoch * 1000)
+        columns = buffer.columns
+        for aircraft_data in aircraft:
+            for name, _ in ARCHIVE_COLUMNS[2:-1]:
+                columns[name].append(aircraft_data.get(name))
+            hex_code = aircraft_data.get('hex')
+            columns['t'].append(t)
+            # Lowercase like the live keys and tracks, so queries by hex match
+            columns['hex'].append(hex_code.lower() if hex_code else hex_code)
+            columns['helicopter'].append(hex_code in helicopter_hexes)
+        buffer.rows += len(aircraft)
+
+        if epoch - buffer.started >= self.flush_interval:
+            # Keep an empty buffer for the hour so its rollover still triggers compaction
+            due.append((region, buffer))
+            self._buffers[region] = RegionBuffer(hour, epoch)
+        return due
+
+    def take_all(self) -> List[Tuple[str, RegionBuffer]]:
+        """Detach every pending buffer (for shutdown)"""
+        buffers = list(self._buffers.items())
+        self._buffers = {}
+        return buffers
+
+    def _buffer_table(self, buffer: RegionBuffer):
+        return pa.table(buffer.columns, schema=archive_schema())
+
+    def _buffered_columns(self, region: str) -> Optional[Dict[str, List]]:
+        """Copy of a region's buffered rows; call from the thread that appends (the event loop)"""
+        buffer = self._buffers.get(region)
+        if buffer is None or not buffer.rows:
+            return None
+        return {name: list(values) for name, values in buffer.columns.items()}
+
+    def write_buffers(self, buffers: List[Tuple[str, RegionBuffer]]):
+        """Write buffers as part files, then compact hours that are over (blocking)"""
+        with self._lock:
+            for region, buffer in buffers:
+                hour_dir = self._hour_dir(region, buffer.hour)
+                if buffer.rows == 0:
+                    if buffer.hour_closed and hour_dir.exists():
+                        with hour_lock(hour_dir):
+                            self._compact_hour(hour_dir)
+                    continue
+                try:
+                    hour_dir.mkdir(parents=True, exist_ok=True)
+                    with hour_lock(hour_dir):
+                        part = hour_dir / f"{PART_PREFIX}{int(buffer.started * 1000)}.parquet"
+                        pq.write_table(self._buffer_table(buffer), part, compression=self.compression)
+                        self.stats['rows_written'] += buffer.rows
+                        self.stats['parts_written'] += 1
+                        if buffer.hour_closed:
+                            self._compact_hour(hour_dir)
+                except Exception as e:
+                    self.stats['write_errors'] += 1
+                    logger.error(f"❌ Failed to write archive segment for {region}: {e}")
+
+    async def aarchive_region(self, region: str, flights_data: Dict, helicopter_hexes: Set[str],
+                              epoch: Optional[float] = None):
+        """Buffer a stored region snapshot, writing due segments off the event loop"""
+        due = self.append(region, flights_data.get('aircraft', []), helicopter_hexes, epoch)
+        if due:
+            await asyncio.to_thread(self.write_buffers, due)
+
+    async def aflush(self):
+        """Write every pending buffer (called on shutdown)"""
+        if self.enabled and any(buffer.rows for buffer in self._buffers.values()):
+            await asyncio.to_thread(self.write_buffers, self.take_all())
+
+    def _compact_hour(self, hour_dir: Path) -> bool:
+        """Merge an hour's part files (and any previous compacted file) into one sorted file
+
+        Callers hold the hour's lock.
+        """
+        parts = sorted(hour_dir.glob(f"{PART_PREFIX}*.parquet"))
+        if not parts:
+            return False
+
+        compacted = hour_dir / COMPACTED_FILENAME
+        sources = ([compacted] if compacted.exists() else []) + parts
+        try:
+            table = pa.concat_tables(pq.read_table(source, schema=archive_schema()) for source in sources)
+            table = table.sort_by([('t', 'ascending'), ('hex', 'ascending')])
+            tmp = hour_dir / f".{COMPACTED_FILENAME}.tmp"
+            pq.write_table(table, tmp, compression=self.compression, row_group_size=64 * 1024)
+            tmp.replace(compacted)
+        except Exception as e:
+            logger.error(f"❌ Failed to compact archive hour {hour_dir}: {e}")
+            return False
+
+        for part in parts:
+            part.unlink(missing_ok=True)
+        self.stats['hours_compacted'] += 1
+        logger.info(f"🗜️ Compacted {len(parts)} archive parts into {compacted} ({table.num_rows} rows)")
+        return True
+
+    def compact(self, before: Optional[datetime] = None) -> int:
+        """Compact every archived hour that ended before `before` (default: the current hour)"""
+        if not PYARROW_AVAILABLE or not self.path.exists():
+            return 0
+
+        before = before or hour_start(time.time())
+        compacted = 0
+        with self._lock:
+            for hour_dir in sorted(self.path.glob("region=*/date=*/hour=*")):
+                hour = datetime.strptime(f"{hour_dir.parent.name[5:]} {hour_dir.name[5:]}",
+                                         "%Y-%m-%d %H").replace(tzinfo=timezone.utc)
+                if hour >= before:
+                    continue
+                with hour_lock(hour_dir):
+                    if self._compact_hour(hour_dir):
+                        compacted += 1
+        return compacted
+
+    def query(self, region: str, start: datetime, end: datetime,
+              bbox: Optional[Tuple[float, float, float, float]] = None,
+              hex_code: Optional[str] = None, limit: Optional[int] = None):
+        """Archived rows of a region in [start, end), optionally inside bbox (min_lat, min_lon, max_lat, max_lon)
+
+        Returns a pyarrow Table sorted by time; rows still buffered in memory are included.
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required to query the snapshot archive")
+        return self._query(region, start, end, bbox, hex_code, limit, self._buffered_columns(region))
+
+    async def aquery(self, region: str, start: datetime, end: datetime,
+                     bbox: Optional[Tuple[float, float, float, float]] = None,
+                     hex_code: Optional[str] = None, limit: Optional[int] = None):
+        """Async query: buffered rows are copied on the event loop, the files are read in a thread"""
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required to query the snapshot archive")
+        buffered = self._buffered_columns(region)
+        return await asyncio.to_thread(self._query, region, start, end, bbox, hex_code, limit, buffered)
+
+    def _query(self, region: str, start: datetime, end: datetime,
+               bbox: Optional[Tuple[float, float, float, float]], hex_code: Optional[str],
+               limit: Optional[int], buffered: Optional[Dict[str, List]]):
+        """Query the part and compacted files, plus a copy of the buffered rows"""
+
+        start = start.astimezone(timezone.utc)
+        end = end.astimezone(timezone.utc)
+
+        condition = (ds.field('t') >= pa.scalar(start, pa.timestamp('ms', tz='UTC'))) & \
+                    (ds.field('t') < pa.scalar(end, pa.timestamp('ms', tz='UTC')))
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            condition &= (ds.field('lat') >= min_lat) & (ds.field('lat') <= max_lat) & \
+                         (ds.field('lon') >= min_lon) & (ds.field('lon') <= max_lon)
+        if hex_code:
+            condition &= ds.field('hex') == hex_code.lower()
+
+        tables = []
+        # Files are listed and read under the locks, so compaction (in this or another
+        # process) cannot unlink parts between listing and reading
+        with self._lock:
+            # Only hour partitions that overlap the range are opened
+            hour = start.replace(minute=0, second=0, microsecond=0)
+            while hour < end:
+                hour_dir = self._hour_dir(region, hour)
+                hour += timedelta(hours=1)
+                if not hour_dir.exists():
+                    continue
+                with hour_lock(hour_dir, shared=True):
+                    files = [str(path) for path in sorted(hour_dir.glob("*.parquet"))]
+                    if files:
+                        dataset = ds.dataset(files, schema=archive_schema(), format="parquet")
+                        tables.append(dataset.to_table(filter=condition))
+
+        if buffered is not None:
+            tables.append(pa.table(buffered, schema=archive_schema()).filter(condition))
+
+        table = pa.concat_tables(tables) if tables else archive_schema().empty_table()
+        table = table.sort_by([('t', 'ascending'), ('hex', 'ascending')])
+        if limit is not None:
+            table = table.slice(0, limit)
+        return table
+
+    def get_stats(self) -> Dict:
+        """Get archive statistics"""
+        return {
+            'enabled': self.enabled,
+            'path': str(self.path),
+            'rows_buffered': sum(buffer.rows for buffer in self._buffers.values()),
+            **self.stats
+        }
@@ -0,0 +1,149 @@
+import json
+import logging
+import zlib
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional codec libraries
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# Version byte written before every binary snapshot. Plain JSON snapshots
+# start with '{' and carry no header, so older blobs still decode.
+VERSION_COLUMNAR_JSON_ZLIB = 0x01
+VERSION_COLUMNAR_MSGPACK = 0x02
+VERSION_COLUMNAR_MSGPACK_ZSTD = 0x03
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def to_columnar(snapshot: Dict) -> Dict:
+    """Replace the aircraft list of dicts with column names plus per-column values"""
+    aircraft = snapshot.get('aircraft', [])
+    columns: List[str] = list(aircraft[0].keys()) if aircraft else []
+    for record in aircraft[1:]:
+        if len(record) != len(columns):
+            columns.extend(key for key in record if key not in columns)
+
+    encoded = {key: value for key, value in snapshot.items() if key != 'aircraft'}
+    encoded['columns'] = columns
+    encoded['values'] = [[record.get(column) for record in aircraft] for column in columns]
+    return encoded
+
+
+def from_columnar(encoded: Dict) -> Dict:
+    """Inverse of to_columnar"""
+    columns = encoded.pop('columns', [])
+    values = encoded.pop('values', [])
+    encoded['aircraft'] = [dict(zip(columns, row)) for row in zip(*values)] if columns else []
+    return encoded
+
+
+class SnapshotCodec:
+    """Serializer for stored region snapshots"""
+
+    def __init__(self, name: str, version: Optional[int],
+                 encode: Callable[[Dict], bytes], decode: Callable[[bytes], Dict]):
+        self.name = name
+        self.version = version
+        self._encode = encode
+        self._decode = decode
+
+    def encode(self, snapshot: Dict) -> bytes:
+        body = self._encode(snapshot)
+        return body if self.version is None else bytes([self.version]) + body
+
+    def decode(self, blob: bytes) -> Dict:
+        return self._decode(blob if self.version is None else blob[1:])
+
+
+def _json_encode(snapshot: Dict) -> bytes:
+    return json.dumps(snapshot).encode('utf-8')
+
+
+def _json_zlib_encode(snapshot: Dict) -> bytes:
+    return zlib.compress(json.dumps(to_columnar(snapshot), separators=(',', ':')).encode('utf-8'), ZLIB_LEVEL)
+
+
+def _json_zlib_decode(body: bytes) -> Dict:
+    return from_columnar(json.loads(zlib.decompress(body)))
+
+
+def _msgpack_encode(snapshot: Dict) -> bytes:
+    return msgpack.packb(to_columnar(snapshot), use_bin_type=True)
+
+
+def _msgpack_decode(body: bytes) -> Dict:
+    return from_columnar(msgpack.unpackb(body, raw=False))
+
+
+def _msgpack_zstd_encode(snapshot: Dict) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(_msgpack_encode(snapshot))
+
+
+def _msgpack_zstd_decode(body: bytes) -> Dict:
+    return _msgpack_decode(zstandard.ZstdDecompressor().decompress(body))
+
+
+JSON_CODEC = SnapshotCodec("json", None, _json_encode, json.loads)
+
+CODECS = {
+    VERSION_COLUMNAR_JSON_ZLIB: SnapshotCodec("json-zlib", VERSION_COLUMNAR_JSON_ZLIB,
+                                              _json_zlib_encode, _json_zlib_decode),
+    VERSION_COLUMNAR_MSGPACK: SnapshotCodec("msgpack", VERSION_COLUMNAR_MSGPACK,
+                                            _msgpack_encode, _msgpack_decode),
+    VERSION_COLUMNAR_MSGPACK_ZSTD: SnapshotCodec("msgpack-zstd", VERSION_COLUMNAR_MSGPACK_ZSTD,
+                                                 _msgpack_zstd_encode, _msgpack_zstd_decode),
+}
+
+_REQUIREMENTS = {
+    "msgpack": MSGPACK_AVAILABLE,
+    "msgpack-zstd": MSGPACK_AVAILABLE and ZSTD_AVAILABLE,
+}
+
+
+def get_codec(name: str) -> SnapshotCodec:
+    """Codec by config name, falling back to json-zlib when its libraries are missing"""
+    if name == "json":
+        return JSON_CODEC
+
+    codec = next((c for c in CODECS.values() if c.name == name), None)
+    if codec is None:
+        logger.warning(f"Unknown snapshot codec '{name}' - using json")
+        return JSON_CODEC
+
+    if not _REQUIREMENTS.get(name, True):
+        logger.warning(f"Snapshot codec '{name}' needs msgpack/zstandard - using json-zlib")
+        return CODECS[VERSION_COLUMNAR_JSON_ZLIB]
+    return codec
+
+
+def is_json_blob(blob: bytes) -> bool:
+    """True for plain JSON snapshots (no version byte)"""
+    return blob[:1] == b'{'
+
+
+def decode_snapshot(blob) -> Dict:
+    """Decode a stored snapshot of any codec, detected from its first byte"""
+    if isinstance(blob, str):
+        return json.loads(blob)
+    if is_json_blob(blob):
+        return json.loads(blob)
+
+    codec = CODECS.get(blob[0])
+    if codec is None:
+        raise ValueError(f"Unknown snapshot codec version byte: {blob[0]:#04x}")
+    return codec.decode(blob)
@@ -0,0 +1,152 @@
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRACK_KEY_PREFIX = "track:"
+TRACK_FIELDS = ('t', 'lat', 'lon', 'alt', 'gs', 'track')
+POINT_SEPARATOR = ','
+
+DEFAULT_MAX_POINTS = 240   # 1 hour at a 15s collection interval
+DEFAULT_TTL = 3600         # seconds - history of aircraft that left the region
+DEFAULT_MAX_GAP = 60       # seconds - stationary aircraft still get a point this often
+
+Point = Tuple[float, float, float, object, Optional[float], Optional[float]]
+
+
+def track_key(region: str, hex_code: str) -> str:
+    return f"{TRACK_KEY_PREFIX}{region}:{hex_code.lower()}"
+
+
+def pack_point(point: Point) -> str:
+    """Encode one track point as a short delimited string"""
+    return POINT_SEPARATOR.join('' if value is None else str(value) for value in point)
+
+
+def _parse_value(value: str):
+    if value == '':
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return value  # e.g. alt_baro "ground"
+    return int(number) if number.is_integer() and '.' not in value else number
+
+
+def unpack_point(packed: str) -> Dict:
+    """Decode a packed track point into a dict keyed by TRACK_FIELDS"""
+    return dict(zip(TRACK_FIELDS, (_parse_value(value) for value in packed.split(POINT_SEPARATOR))))
+
+
+class TrackStore:
+    """Bounded per-aircraft position history fed from each stored snapshot
+
+    Every aircraft gets a Redis list used as a ring buffer (RPUSH + LTRIM),
+    so a track read is a single LRANGE with no snapshot scanning. Points are
+    only appended when the position changed or max_gap seconds passed, so
+    parked aircraft do not fill their buffer with duplicates.
+    """
+
+    def __init__(self, track_config: Optional[Dict] = None):
+        track_config = track_config or {}
+        self.enabled = track_config.get('enabled', True)
+        self.max_points = track_config.get('max_points', DEFAULT_MAX_POINTS)
+        self.ttl = track_config.get('ttl', DEFAULT_TTL)
+        self.max_gap = track_config.get('max_gap', DEFAULT_MAX_GAP)
+
+        # region -> hex -> (lat, lon, alt, t) of the last appended point
+        self._last: Dict[str, Dict[str, Tuple]] = {}
+        # Used when Redis is unavailable
+        self._memory: Dict[str, Deque[Point]] = {}
+        self.stats = {'points_written': 0, 'points_skipped': 0}
+
+    def _new_points(self, region: str, aircraft: List[Dict], now: float) -> List[Tuple[str, Point]]:
+        """Points that should be appended this cycle"""
+        previous = self._last.get(region, {})
+        current = {}
+        points = []
+
+        for aircraft_data in aircraft:
+            lat, lon = aircraft_data.get('lat'), aircraft_data.get('lon')
+            if lat is None or lon is None:
+                continue
+
+            hex_code = aircraft_data['hex'].lower()
+            t = round(now - (aircraft_data.get('seen') or 0), 1)
+            alt = aircraft_data.get('alt_baro')
+
+            last = previous.get(hex_code)
+            if last and last[:3] == (lat, lon, alt) and t - last[3] < self.max_gap:
+                current[hex_code] = last
+                self.stats['points_skipped'] += 1
+                continue
+
+            current[hex_code] = (lat, lon, alt, t)
+            points.append((hex_code, (t, lat, lon, alt, aircraft_data.get('gs'), aircraft_data.get('track'))))
+
+        # Aircraft that left the region are dropped; their Redis history expires on its own
+        self._last[region] = current
+        self.stats['points_written'] += len(points)
+        return points
+
+    def queue_points(self, pipeline, region: str, aircraft: List[Dict], now: Optional[float] = None):
+        """Queue ring-buffer appends for a region snapshot on a (sync or async) pipeline"""
+        if not self.enabled:
+            return
+
+        now = now if now is not None else time.time()
+        for hex_code, point in self._new_points(region, aircraft, now):
+            key = track_key(region, hex_code)
+            pipeline.rpush(key, pack_point(point))
+            pipeline.ltrim(key, -self.max_points, -1)
+            pipeline.expire(key, self.ttl)
+
+    def record_memory(self, region: str, aircraft: List[Dict], now: Optional[float] = None):
+        """Append a region snapshot to the in-memory history (no Redis)"""
+        if not self.enabled:
+            return
+
+        now = now if now is not None else time.time()
+        for hex_code, point in self._new_points(region, aircraft, now):
+            key = track_key(region, hex_code)
+            history = self._memory.get(key)
+            if history is None:
+                history = self._memory[key] = deque(maxlen=self.max_points)
+            history.append(point)
+
+        # Forget in-memory history that has outlived the TTL
+        cutoff = now - self.ttl
+        for key in [key for key, history in self._memory.items() if history[-1][0] < cutoff]:
+            del self._memory[key]
+
+    @staticmethod
+    def _filter(points: List[Dict], since: Optional[float]) -> List[Dict]:
+        if since is None:
+            return points
+        return [point for point in points if point['t'] >= since]
+
+    def get_track(self, redis_client, region: str, hex_code: str, since: Optional[float] = None) -> List[Dict]:
+        """Position history for one aircraft, oldest first"""
+        key = track_key(region, hex_code)
+        if redis_client is not None:
+            return self._filter([unpack_point(packed) for packed in redis_client.lrange(key, 0, -1)], since)
+        return self._filter([dict(zip(TRACK_FIELDS, point)) for point in self._memory.get(key, ())], since)
+
+    async def aget_track(self, async_client, region: str, hex_code: str,
+                         since: Optional[float] = None) -> List[Dict]:
+        """Async get_track"""
+        key = track_key(region, hex_code)
+        if async_client is not None:
+            return self._filter([unpack_point(packed) for packed in await async_client.lrange(key, 0, -1)], since)
+        return self._filter([dict(zip(TRACK_FIELDS, point)) for point in self._memory.get(key, ())], since)
+
+    def get_stats(self) -> Dict:
+        """Get track store statistics"""
+        return {
+            'enabled': self.enabled,
+            'max_points': self.max_points,
+            'tracked_aircraft': sum(len(hexes) for hexes in self._last.values()),
+            **self.stats
+        }
@@ -0,0 +1,11 @@
+"""
+Unit tests for the collector backend
+
+Run from BackEnd/:
+    pytest tests
+"""
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,123 @@
+"""AircraftBatch parsing of collector feeds and record round trips"""
+import math
+
+from src.collectors.dump1090 import Dump1090Collector
+from src.collectors.http_client import HttpClientManager
+from src.collectors.opensky import OpenSkyCollector
+from src.models.aircraft import AircraftRecord
+from src.models.aircraft_batch import INT_MISSING, AircraftBatch, format_hex, parse_hex
+from src.services.blender import DataBlender
+
+NOW = 1_700_000_000.0
+REGION = {'center': {'lat': 32.35, 'lon': -95.30}, 'radius_miles': 150}
+
+
+def dump1090_row(hex_code="a1b2c3", **fields):
+    return {'hex': hex_code, 'flight': "UAL123  ", 'lat': 32.4, 'lon': -95.3, 'alt_baro': 12000,
+            'gs': 250.0, 'track': 90.0, 'seen': 1.0, **fields}
+
+
+def opensky_state(hex_code="abc123", **overrides):
+    state = [hex_code, "SWA42   ", "United States", NOW - 2, NOW - 1, -95.3, 32.4, 3000.0, False,
+             100.0, 180.0, 0.0, None, 3100.0, "1200", False, 0]
+    for index, value in overrides.items():
+        state[int(index[1:])] = value
+    return state
+
+
+def test_hex_round_trip_is_lowercase():
+    assert format_hex(parse_hex("A1B2C3")) == "a1b2c3"
+    assert format_hex(parse_hex("~00ff0A")) == "~00ff0a"
+    assert parse_hex("zzz") == -1
+
+
+def test_output_hex_casing_follows_source():
+    # dump1090 aircraft have always been published with upper-case hex; other sources with lower-case
+    dump1090 = AircraftBatch.from_dump1090([dump1090_row("a1b2c3"), dump1090_row("~00ff0a")], NOW)
+    opensky = AircraftBatch.from_opensky([opensky_state("ABC123")], NOW)
+
+    assert [a['hex'] for a in dump1090.to_dicts()] == ["A1B2C3", "~00FF0A"]
+    assert [a['hex'] for a in opensky.to_dicts()] == ["abc123"]
+    assert [r.hex for r in AircraftBatch.concat([opensky, dump1090]).to_records()] == ["abc123", "A1B2C3", "~00FF0A"]
+    # Lookup keys stay lower-case
+    assert dump1090.hex_codes() == ["a1b2c3", "~00ff0a"]
+
+
+def test_blended_hex_casing_follows_position_source():
+    blender = DataBlender([], redis_service=None)
+    opensky = AircraftBatch.from_opensky([opensky_state("a1b2c3")], NOW)
+    [aircraft] = blender.blend_aircraft_data([], AircraftBatch.from_dump1090([], NOW), opensky, "test", NOW)
+    assert aircraft.hex == "a1b2c3"
+
+    dump1090 = AircraftBatch.from_dump1090([dump1090_row("a1b2c3", seen=0.0)], NOW + 5)
+    [aircraft] = blender.blend_aircraft_data([], dump1090, AircraftBatch.from_opensky([], NOW + 5), "test", NOW + 5)
+    assert (aircraft.hex, aircraft.data_source) == ("A1B2C3", "dump1090")
+
+
+def test_dump1090_malformed_fields_only_affect_their_row():
+    batch = AircraftBatch.from_dump1090([
+        dump1090_row("a00001"),
+        dump1090_row("a00002", flight=5),
+        dump1090_row("a00003", alt_baro=1e12, gs=1e300, track="east", lat=[1]),
+        dump1090_row("a00004", alt_baro="ground"),
+        "not an aircraft",
+        {'flight': "NOHEX"},
+    ], NOW)
+
+    assert batch.hex_codes() == ["a00001", "a00002", "a00003", "a00004"]
+    assert batch.flight.tolist() == ["UAL123", "", "UAL123", "UAL123"]
+    assert batch.alt_baro[2] == INT_MISSING
+    assert math.isnan(batch.gs[2]) and math.isnan(batch.track[2]) and math.isnan(batch.lat[2])
+    assert bool(batch.on_ground[3]) and batch.alt_baro[3] == INT_MISSING
+
+
+def test_dump1090_collector_keeps_cycle_with_bad_rows():
+    collector = Dump1090Collector({'type': 'dump1090', 'url': "http://receiver", 'name': "test"}, REGION, HttpClientManager())
+    batch = collector._convert_dump1090_data({'aircraft': [dump1090_row(flight=5), dump1090_row("a00002", alt_baro=1e12)]}, NOW)
+    assert len(batch) == 2
+
+
+def test_opensky_malformed_states_only_affect_their_row():
+    batch = AircraftBatch.from_opensky([
+        opensky_state("abc001"),
+        opensky_state("abc002", s1=7, s4="yesterday", s7=1e308, s14=1200),
+        opensky_state("abc003", s6=None),  # no position
+        ["short"],
+        None,
+    ], NOW)
+
+    assert batch.hex_codes() == ["abc001", "abc002"]
+    assert batch.flight.tolist() == ["SWA42", ""]
+    assert batch.alt_baro[1] == INT_MISSING
+    assert batch.squawk.tolist() == ["1200", None]
+    assert batch.received_at[1] == NOW
+
+
+def test_opensky_collector_handles_overflow():
+    collector = OpenSkyCollector({'type': 'opensky', 'url': "https://opensky", 'name': "test"}, REGION, HttpClientManager())
+    batch = collector._convert_opensky_data({'states': [opensky_state(s7=10 ** 400)]}, NOW)
+    assert len(batch) == 1 and batch.alt_baro[0] == INT_MISSING
+
+
+def test_records_round_trip_keeps_station_enrichment():
+    record = AircraftRecord(
+        hex="A1B2C3", flight="N123", lat=32.4, lon=-95.3, alt_baro=1500, gs=110.0, track=45.0,
+        seen=2.0, data_source="pi_station_1", registration="N123AB", model="EC135",
+        operator="Air Evac", manufacturer="Airbus", typecode="EC35", owner="Air Evac",
+        aircraft_type="Airbus EC135", icao_aircraft_class="H2T"
+    )
+    [result] = AircraftBatch.from_records([record], NOW).to_records()
+
+    assert result.hex == "a1b2c3"
+    assert result.data_source == "pi_station_1"
+    for field in ("registration", "model", "operator", "manufacturer", "typecode",
+                  "owner", "aircraft_type", "icao_aircraft_class"):
+        assert getattr(result, field) == getattr(record, field)
+
+
+def test_concat_keeps_enrichment_columns_aligned():
+    dump1090 = AircraftBatch.from_dump1090([dump1090_row("a00001")], NOW)
+    stations = AircraftBatch.from_records([AircraftRecord(hex="a00002", icao_aircraft_class="H1P")], NOW)
+    combined = AircraftBatch.concat([dump1090, stations])
+    assert combined.icao_aircraft_class.tolist() == [None, "H1P"]
+    assert [r.icao_aircraft_class for r in combined.to_records()] == [None, "H1P"]
@@ -0,0 +1,110 @@
+"""CloudFrontIPRanges loading, refresh and retry backoff"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.middleware import ip_ranges as ip_ranges_module
+from src.middleware.ip_ranges import CloudFrontIPRanges
+
+EMPTY = {'syncToken': None, 'createDate': None, 'prefixes': [], 'ipv6_prefixes': []}
+PUBLISHED = {
+    'syncToken': "1700000000",
+    'createDate': "2023-11-14-22-13-20",
+    'prefixes': [
+        {'ip_prefix': "192.0.2.0/24", 'region': "GLOBAL", 'service': "CLOUDFRONT", 'network_border_group': "GLOBAL"},
+        {'ip_prefix': "198.51.100.0/24", 'region': "us-east-1", 'service': "EC2", 'network_border_group': "us-east-1"},
+    ],
+    'ipv6_prefixes': [
+        {'ipv6_prefix': "2001:db8::/32", 'region': "GLOBAL", 'service': "CLOUDFRONT", 'network_border_group': "GLOBAL"},
+    ],
+}
+
+
+@pytest.fixture
+def bundled(tmp_path):
+    path = tmp_path / "bundled.json"
+    path.write_text(json.dumps(EMPTY))
+    return path
+
+
+def ranges(tmp_path, bundled, **options):
+    return CloudFrontIPRanges(cache_path=str(tmp_path / "cache.json"), bundled_path=bundled, **options)
+
+
+def serve(monkeypatch, responses):
+    """Answer downloads from responses in order (an exception entry fails that download)"""
+    responses = iter(responses)
+
+    def handler(request):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return httpx.Response(200, json=response)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(ip_ranges_module.httpx, "AsyncClient",
+                        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs))
+
+
+def test_shipped_bundled_copy_has_cloudfront_ranges(tmp_path):
+    cloudfront = ranges(tmp_path, ip_ranges_module.BUNDLED_PATH)
+    assert cloudfront.source == "bundled"
+    assert cloudfront.sync_token
+    assert cloudfront.contains("54.192.0.1")
+    assert cloudfront.contains("2600:9000:3000::1")
+    # Prefixes the hard-coded list used to include that are not CloudFront
+    assert not cloudfront.contains("13.54.0.1")
+
+
+def test_empty_bundled_copy_matches_nothing_and_logs_error(tmp_path, bundled, caplog):
+    cloudfront = ranges(tmp_path, bundled)
+    assert cloudfront.source == "none"
+    assert not cloudfront.contains("192.0.2.1")
+    assert any(record.levelname == "ERROR" for record in caplog.records)
+
+
+def test_cache_wins_over_bundled_copy(tmp_path, bundled):
+    (tmp_path / "cache.json").write_text(json.dumps(ip_ranges_module.filter_ip_ranges(PUBLISHED)))
+    cloudfront = ranges(tmp_path, bundled)
+    assert cloudfront.source == "cache"
+    assert cloudfront.contains("192.0.2.1")
+    assert cloudfront.contains("2001:db8::1")
+    assert not cloudfront.contains("198.51.100.1")
+
+
+@pytest.mark.asyncio
+async def test_refresh_downloads_caches_and_swaps_matcher(tmp_path, bundled, monkeypatch):
+    serve(monkeypatch, [PUBLISHED, PUBLISHED])
+    cloudfront = ranges(tmp_path, bundled)
+
+    assert await cloudfront.arefresh()
+    assert cloudfront.source == "download"
+    assert cloudfront.contains("192.0.2.1")
+    assert json.loads((tmp_path / "cache.json").read_text())['syncToken'] == "1700000000"
+    # Same syncToken on a forced refresh: nothing changes
+    assert not await cloudfront.arefresh(force=True)
+
+
+@pytest.mark.asyncio
+async def test_failed_downloads_retry_with_backoff(tmp_path, bundled, monkeypatch):
+    failure = httpx.ConnectError("unreachable")
+    serve(monkeypatch, [failure, failure, failure, failure, EMPTY, PUBLISHED])
+    cloudfront = ranges(tmp_path, bundled, refresh_interval=600, retry_interval=60)
+
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 6:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(ip_ranges_module.asyncio, "sleep", sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await cloudfront.run_refresh()
+
+    # An empty download counts as a failure too; the first success goes back to the refresh interval
+    assert delays == [60, 120, 240, 480, 600, 600]
+    assert cloudfront.failures == 0
+    assert cloudfront.contains("192.0.2.1")
@@ -0,0 +1,60 @@
+"""LookupCache eviction order and positive/negative TTLs"""
+from src.services.aircraft_db import LookupCache
+
+HIT = {'registration': "N123AB", 'model': "AS350"}
+MISS = {'registration': "", 'model': ""}
+
+
+def test_evicts_least_recently_used():
+    cache = LookupCache(max_size=2, ttl=60, negative_ttl=10)
+    cache.put("A00001", HIT, now=0)
+    cache.put("A00002", HIT, now=0)
+    # Reading A00001 makes A00002 the oldest entry
+    assert cache.get("A00001", now=1) == HIT
+    cache.put("A00003", HIT, now=1)
+
+    assert len(cache) == 2
+    assert cache.get("A00002", now=1) is None
+    assert cache.get("A00001", now=1) == HIT
+    assert cache.get("A00003", now=1) == HIT
+    assert cache.stats['evictions'] == 1
+
+
+def test_rewriting_a_key_refreshes_its_position():
+    cache = LookupCache(max_size=2, ttl=60, negative_ttl=10)
+    cache.put("A00001", HIT, now=0)
+    cache.put("A00002", HIT, now=0)
+    cache.put("A00001", HIT, now=0)
+    cache.put("A00003", HIT, now=0)
+
+    assert cache.get("A00001", now=0) == HIT
+    assert cache.get("A00002", now=0) is None
+
+
+def test_positive_and_negative_results_expire_separately():
+    cache = LookupCache(max_size=10, ttl=60, negative_ttl=10)
+    cache.put("A00001", HIT, now=0)
+    cache.put("A00002", MISS, now=0)
+
+    assert cache.get("A00001", now=9) == HIT
+    assert cache.get("A00002", now=9) == MISS
+    assert cache.stats['negative_hits'] == 1
+
+    # The miss expires after negative_ttl, the hit only after ttl
+    assert cache.get("A00002", now=10) is None
+    assert cache.get("A00001", now=59) == HIT
+    assert cache.get("A00001", now=60) is None
+    assert cache.stats['expirations'] == 2
+    assert len(cache) == 0
+
+
+def test_zero_negative_ttl_disables_negative_caching():
+    cache = LookupCache(max_size=10, ttl=60, negative_ttl=0)
+    cache.put("A00001", MISS, now=0)
+    cache.put("A00002", HIT, now=0)
+
+    assert len(cache) == 1
+    assert cache.get("A00001", now=0) is None
+    assert cache.get("A00002", now=0) == HIT
+    assert cache.stats['hits'] == 1
+    assert cache.stats['misses'] == 1
@@ -0,0 +1,74 @@
+"""TokenBucketLimiter burst, refill, retry_after and idle eviction"""
+import pytest
+
+from src.middleware.rate_limiter import TokenBucketLimiter
+
+NOW = 1_700_000_000.0
+IP = "198.51.100.1"
+
+
+def test_allows_a_full_burst_then_limits():
+    limiter = TokenBucketLimiter(window=60)
+    results = [limiter.check(IP, 10, NOW) for _ in range(11)]
+
+    assert [result.allowed for result in results] == [True] * 10 + [False]
+    assert [result.remaining for result in results[:10]] == list(range(9, -1, -1))
+    assert results[-1].remaining == 0
+    assert limiter.get_stats()['allowed'] == 10
+    assert limiter.get_stats()['limited'] == 1
+
+
+def test_refills_one_request_per_cost_interval():
+    limiter = TokenBucketLimiter(window=60)
+    for _ in range(10):
+        limiter.check(IP, 10, NOW)
+
+    # One request costs 60/10 = 6 seconds
+    assert not limiter.check(IP, 10, NOW + 5.9).allowed
+    assert limiter.check(IP, 10, NOW + 6).allowed
+    assert not limiter.check(IP, 10, NOW + 6).allowed
+
+    # A full window later the bucket holds the whole burst again
+    later = NOW + 6 + 60
+    assert [limiter.check(IP, 10, later).allowed for _ in range(11)] == [True] * 10 + [False]
+
+
+def test_retry_after_and_reset_on_limited_request():
+    limiter = TokenBucketLimiter(window=60)
+    for _ in range(10):
+        limiter.check(IP, 10, NOW)
+
+    result = limiter.check(IP, 10, NOW + 2)
+    assert not result.allowed
+    assert result.retry_after == pytest.approx(4.0)
+    # Bucket is full again once the TAT (now + window) is reached
+    assert result.reset == int(NOW + 60)
+    assert limiter.check(IP, 10, NOW + 2 + result.retry_after).allowed
+
+
+def test_clients_are_independent():
+    limiter = TokenBucketLimiter(window=60)
+    for _ in range(10):
+        limiter.check(IP, 10, NOW)
+    assert not limiter.check(IP, 10, NOW).allowed
+    assert limiter.check("198.51.100.2", 10, NOW).allowed
+
+
+def test_idle_clients_are_evicted_once_refilled():
+    limiter = TokenBucketLimiter(window=60)
+    limiter.check("198.51.100.1", 10, NOW)
+    limiter.check("198.51.100.2", 10, NOW + 1)
+
+    # 198.51.100.1's bucket is full again after 6s, 198.51.100.2's after 7s
+    limiter.check("198.51.100.3", 10, NOW + 6.5)
+    assert list(limiter.clients) == ["198.51.100.2", "198.51.100.3"]
+    assert limiter.get_stats()['evicted'] == 1
+
+
+def test_max_clients_evicts_least_recently_seen():
+    limiter = TokenBucketLimiter(window=60, max_clients=2)
+    for i in range(3):
+        limiter.check(f"198.51.100.{i}", 10, NOW)
+
+    assert list(limiter.clients) == ["198.51.100.1", "198.51.100.2"]
+    assert limiter.get_stats()['tracked_clients'] == 2
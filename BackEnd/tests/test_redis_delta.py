@@ -0,0 +1,83 @@
+"""Delta-mode region storage: recovery from a lost region hash and live aircraft lookups"""
+import fakeredis
+import pytest
+
+from src.models.aircraft import AircraftRecord
+from src.services.redis_service import RedisService
+
+REGION = "test"
+LOCATION = {'name': "Test", 'lat': 32.35, 'lon': -95.30}
+
+
+def records(count: int, altitude: int = 1000):
+    return [AircraftRecord(hex=f"a{i:05x}", flight=f"N{i}", lat=32.4, lon=-95.3, alt_baro=altitude,
+                           seen=0.0, data_source="dump1090") for i in range(count)]
+
+
+@pytest.fixture
+def service():
+    service = RedisService(storage_mode="delta", track_config={'enabled': False})
+    service.redis_client = fakeredis.FakeRedis(decode_responses=True)
+    return service
+
+
+def stored_hexes(service):
+    return sorted(service.redis_client.hkeys(f"{REGION}:aircraft"))
+
+
+def test_partial_hash_after_flush_is_rewritten(service):
+    aircraft = records(5)
+    service.store_region_data(REGION, aircraft, [], LOCATION)
+
+    # Hash lost between cycles; only one aircraft changes, so HSET recreates a one-field hash
+    service.redis_client.flushdb()
+    aircraft[0] = records(1, altitude=2000)[0]
+    service.store_region_data(REGION, aircraft, [], LOCATION)
+    assert len(stored_hexes(service)) == 1
+
+    # The short hash was detected, so the next cycle writes every aircraft again
+    service.store_region_data(REGION, aircraft, [], LOCATION)
+    assert stored_hexes(service) == sorted(a.hex for a in aircraft)
+    assert service.get_region_data(REGION)['aircraft_count'] == 5
+
+
+def test_missing_chopper_set_is_rewritten(service):
+    aircraft = records(3)
+    service.store_region_data(REGION, aircraft, aircraft[:1], LOCATION)
+    service.redis_client.flushdb()
+    service.store_region_data(REGION, aircraft, aircraft[:1], LOCATION)
+    service.store_region_data(REGION, aircraft, aircraft[:1], LOCATION)
+
+    choppers = service.get_region_data(REGION, "choppers")
+    assert [a['hex'] for a in choppers['aircraft']] == [aircraft[0].hex]
+
+
+def test_full_write_drops_stale_fields(service):
+    service.redis_client.hset(f"{REGION}:aircraft", "ffffff", "{}")
+    service.store_region_data(REGION, records(2), [], LOCATION)
+    assert stored_hexes(service) == ["a00000", "a00001"]
+
+
+def test_live_aircraft_lookup_reads_region_hash(service):
+    service.store_region_data(REGION, records(2), [], LOCATION)
+
+    aircraft = service.get_live_aircraft("A00001", [REGION])
+    assert aircraft['hex'] == "a00001"
+    assert '_seen_at' not in aircraft
+    assert service.get_live_aircraft("a00009", [REGION]) is None
+
+
+def test_live_aircraft_lookup_reads_snapshot_key(service):
+    service.storage_mode = "snapshot"
+    service.store_region_data(REGION, records(1), [], LOCATION)
+    assert service.redis_client.exists("aircraft_live:a00000")
+    assert service.get_live_aircraft("a00000", [])['flight'] == "N0"
+
+
+def test_upper_case_dump1090_hex_is_stored_under_lower_case_field(service):
+    aircraft = [AircraftRecord(hex="A1B2C3", flight="N1", lat=32.4, lon=-95.3, seen=0.0, data_source="dump1090")]
+    service.store_region_data(REGION, aircraft, aircraft, LOCATION)
+
+    assert stored_hexes(service) == ["a1b2c3"]
+    assert service.get_live_aircraft("a1b2c3", [REGION])['hex'] == "A1B2C3"
+    assert [a['hex'] for a in service.get_region_data(REGION, "choppers")['aircraft']] == ["A1B2C3"]
@@ -0,0 +1,130 @@
+"""RedisRateLimiter against fakeredis with Lua: shared quota, leases and local fallback"""
+import asyncio
+
+import fakeredis
+import pytest
+
+pytest.importorskip("lupa")
+
+from src.middleware.rate_limiter import RedisRateLimiter
+from src.middleware.security import SecurityMiddleware
+
+IP = "198.51.100.1"
+LIMIT = 10
+WINDOW = 60
+
+
+class RedisHandle:
+    """Stands in for RedisService: the limiter only needs async_client"""
+
+    def __init__(self, async_client):
+        self.async_client = async_client
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def limiter(server, **config):
+    return RedisRateLimiter(RedisHandle(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)), config)
+
+
+class FailingScript:
+    def __init__(self, error=None, delay=0.0):
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, keys, args):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [1, "0", "0", "0"]
+
+
+class FailingClient:
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, source):
+        return self.script
+
+
+@pytest.mark.asyncio
+async def test_two_limiters_share_one_quota(server):
+    first = limiter(server, lease_fraction=0)
+    second = limiter(server, lease_fraction=0)
+
+    allowed = 0
+    for i in range(2 * LIMIT):
+        result = await (first if i % 2 else second).acheck(IP, LIMIT, WINDOW)
+        allowed += result.allowed
+
+    assert allowed == LIMIT
+    assert not (await first.acheck(IP, LIMIT, WINDOW)).allowed
+    # Once Redis limited a client, each replica rejects it locally until its retry time
+    assert first.get_stats()['local_denies'] > 0
+
+
+@pytest.mark.asyncio
+async def test_leases_never_exceed_the_shared_quota(server):
+    first = limiter(server, lease_fraction=0.25)
+    second = limiter(server, lease_fraction=0.25)
+
+    results = [await limiter_.acheck(IP, LIMIT, WINDOW)
+               for _ in range(LIMIT) for limiter_ in (first, second)]
+    assert 0 < sum(result.allowed for result in results) <= LIMIT
+    assert first.get_stats()['lease_hits'] + second.get_stats()['lease_hits'] > 0
+
+
+@pytest.mark.asyncio
+async def test_lease_is_spent_locally_until_it_expires(server):
+    shared = limiter(server, lease_fraction=0.25, lease_ttl=0.05)
+
+    # First request has no lease; the second is active and leases two more requests' budget
+    for _ in range(4):
+        assert (await shared.acheck(IP, LIMIT, WINDOW)).allowed
+    assert shared.get_stats()['redis_checks'] == 2
+    assert shared.get_stats()['lease_hits'] == 2
+
+    await asyncio.sleep(0.06)
+    assert (await shared.acheck(IP, LIMIT, WINDOW)).allowed
+    assert shared.get_stats()['redis_checks'] == 3
+
+
+@pytest.mark.asyncio
+async def test_redis_error_falls_back_and_backs_off():
+    script = FailingScript(error=ConnectionError("down"))
+    failing = RedisRateLimiter(RedisHandle(FailingClient(script)))
+
+    assert await failing.acheck(IP, LIMIT, WINDOW) is None
+    # Redis is not retried until REDIS_RETRY_INTERVAL has passed
+    assert await failing.acheck(IP, LIMIT, WINDOW) is None
+    assert script.calls == 1
+    assert failing.get_stats()['fallbacks'] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_timeout_falls_back():
+    script = FailingScript(delay=0.2)
+    slow = RedisRateLimiter(RedisHandle(FailingClient(script)), {'timeout_ms': 10})
+    assert await slow.acheck(IP, LIMIT, WINDOW) is None
+    assert slow.get_stats()['fallbacks'] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_redis_client_falls_back():
+    assert await RedisRateLimiter(RedisHandle(None)).acheck(IP, LIMIT, WINDOW) is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_uses_local_limits_when_redis_fails():
+    failing = RedisRateLimiter(RedisHandle(FailingClient(FailingScript(error=ConnectionError("down")))))
+    middleware = SecurityMiddleware(None, rate_limit_requests=LIMIT, rate_limit_window=WINDOW,
+                                    distributed_limiter=lambda: failing)
+
+    results = [await middleware._check_rate_limit(IP, "/api/v1/other", False) for _ in range(LIMIT + 1)]
+    assert [result.allowed for result in results] == [True] * LIMIT + [False]
+    assert middleware.rate_limiter.get_stats()['allowed'] == LIMIT
@@ -0,0 +1,106 @@
+"""RedisService Pi station and region reads (sync and async paths) and region stores"""
+import json
+from datetime import datetime
+
+import fakeredis
+import pytest
+
+from src.models.aircraft import AircraftRecord
+from src.services.redis_service import RedisService
+from src.services.replay_engine import FakeRedisService
+
+REGION = "test"
+
+
+@pytest.fixture
+def service():
+    service = RedisService(snapshot_codec="json-zlib", track_config={'enabled': False})
+    server = fakeredis.FakeServer()
+    service.redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    service.async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return service
+
+
+@pytest.fixture
+def memory_service():
+    service = RedisService(track_config={'enabled': False})
+    service.redis_client = None
+    service.async_client = None
+    return service
+
+
+def store_snapshot(service, data_type="flights"):
+    data = {'timestamp': "2024-01-01T00:00:00", 'aircraft_count': 1, 'aircraft': [{'hex': "a00001"}]}
+    service.redis_client.set(f"{REGION}:{data_type}", service.codec.encode(data))
+    return data
+
+
+@pytest.mark.asyncio
+async def test_pi_station_round_trip_sync_and_async(service):
+    service.store_pi_station_data(REGION, "pi1", {'station': "pi1"})
+    await service.astore_pi_station_data(REGION, "pi2", {'station': "pi2"})
+
+    expected = [{'station': "pi1"}, {'station': "pi2"}]
+    assert sorted(service.get_pi_station_data(REGION), key=str) == expected
+    assert sorted(await service.aget_pi_station_data(REGION), key=str) == expected
+
+
+@pytest.mark.asyncio
+async def test_pi_station_reads_prune_expired_stations(service):
+    service.store_pi_station_data(REGION, "pi1", {'station': "pi1"})
+    service.store_pi_station_data(REGION, "pi2", {'station': "pi2"})
+    service.redis_client.delete(f"pi_data:{REGION}:pi2")
+
+    assert await service.aget_pi_station_data(REGION) == [{'station': "pi1"}]
+    assert service.redis_client.zrange(f"pi_stations:{REGION}", 0, -1) == ["pi1"]
+    assert service.get_pi_station_data(REGION, max_age=-1) == []
+
+
+@pytest.mark.asyncio
+async def test_pi_station_memory_fallback(memory_service):
+    memory_service.store_pi_station_data(REGION, "pi1", {'station': "pi1"})
+    await memory_service.astore_pi_station_data(REGION, "pi2", {'station': "pi2"})
+    assert len(memory_service.get_pi_station_data(REGION)) == 2
+    assert len(await memory_service.aget_pi_station_data(REGION)) == 2
+
+
+@pytest.mark.asyncio
+async def test_region_timestamp_and_legacy_snapshot(service):
+    data = store_snapshot(service)
+    # Snapshot written before timestamps were stored separately
+    assert service.get_region_timestamp(REGION) == data['timestamp']
+    assert await service.aget_region_timestamp(REGION) == data['timestamp']
+
+    service.redis_client.set(f"{REGION}:flights:timestamp", "2024-01-01T00:00:15")
+    assert service.get_region_timestamp(REGION) == "2024-01-01T00:00:15"
+    assert await service.aget_region_timestamp(REGION) == "2024-01-01T00:00:15"
+    assert await service.aget_region_timestamp(REGION, "choppers") is None
+
+
+@pytest.mark.asyncio
+async def test_region_payload_decodes_compressed_snapshots(service):
+    data = store_snapshot(service)
+    assert json.loads(service.get_region_payload(REGION)) == data
+    assert json.loads(await service.aget_region_payload(REGION)) == data
+    assert await service.aget_region_data(REGION) == data
+    assert service.get_region_payload(REGION, "choppers") is None
+
+
+@pytest.mark.asyncio
+async def test_region_reads_fall_back_to_memory(memory_service):
+    memory_service.memory_store[f"{REGION}:flights"] = {'timestamp': "t", 'aircraft': []}
+    assert json.loads(memory_service.get_region_payload(REGION)) == {'timestamp': "t", 'aircraft': []}
+    assert json.loads(await memory_service.aget_region_payload(REGION)) == {'timestamp': "t", 'aircraft': []}
+    assert await memory_service.aget_region_timestamp(REGION) == "t"
+    assert memory_service.get_region_timestamp(REGION) == "t"
+
+
+def test_store_dates_snapshot_and_tracks_with_the_given_clock():
+    service = FakeRedisService(track_config={'enabled': True})
+    replayed = 1_700_000_000.0
+    record = AircraftRecord(hex="a00001", flight="N1", lat=32.4, lon=-95.3, alt_baro=1500, seen=2.0, data_source="dump1090")
+    flights = service.store_region_data(REGION, [record], [], {'name': "Test"}, now=replayed)
+
+    assert flights['timestamp'] == datetime.fromtimestamp(replayed).isoformat()
+    [point] = service.get_aircraft_track(REGION, "a00001")
+    assert point['t'] == replayed - 2.0
@@ -0,0 +1,97 @@
+"""RequestScanner target scoping, overlapping signatures, rules loading and hit counters"""
+import pytest
+
+from src.middleware.request_scanner import DEFAULT_RULES, RequestScanner, load_rules
+
+UA = "Mozilla/5.0"
+
+
+@pytest.fixture
+def scanner():
+    return RequestScanner(DEFAULT_RULES)
+
+
+def test_request_signatures_match_path_and_query_case_insensitively(scanner):
+    assert scanner.scan("/.ENV", "", UA) == "Suspicious pattern detected: .env"
+    assert scanner.scan("/api/v1/etex/flights", "file=../../etc/passwd", UA) == "Suspicious pattern detected: ../"
+    assert scanner.scan("/index", "XDEBUG_SESSION_START=1", UA) == "Suspicious pattern detected: XDEBUG"
+    assert scanner.scan("/api/v1/etex/flights", "format=json", UA) is None
+
+
+def test_user_agent_signature_in_path_does_not_match(scanner):
+    assert scanner.scan("/api/v1/aircraft/nmap", "q=sqlmap", UA) is None
+    assert scanner.scan("/api/v1/status", "", "sqlmap/1.7") == "Vulnerability scanner detected: sqlmap/1.7"
+
+
+def test_request_signature_in_user_agent_does_not_match(scanner):
+    assert scanner.scan("/api/v1/status", "", "curl/8.0 (.env; wp-admin; ../)") is None
+
+
+def test_signatures_do_not_match_across_path_query_and_user_agent(scanner):
+    # ".e" + "nv" and "nm" + "ap" only form signatures if the parts are joined
+    assert scanner.scan("/.e", "nv", UA) is None
+    assert scanner.scan("/api/v1/status", "x=nm", "ap") is None
+
+
+def test_longest_overlapping_signature_is_reported():
+    scanner = RequestScanner({'request': ["admin", "admin.php", "php"], 'user_agent': []})
+    assert scanner.scan("/admin.php", "", UA) == "Suspicious pattern detected: admin.php"
+    assert scanner.scan("/admin.ph", "", UA) == "Suspicious pattern detected: admin"
+    assert scanner.scan("/min.php", "", UA) == "Suspicious pattern detected: php"
+
+
+def test_shorter_signature_applies_when_longer_one_is_for_the_other_target():
+    scanner = RequestScanner({'request': ["admin"], 'user_agent': ["admin-bot"]})
+    assert scanner.scan("/admin-bot", "", UA) == "Suspicious pattern detected: admin"
+    assert scanner.scan("/status", "", "admin-bot/2.0") == "Vulnerability scanner detected: admin-bot/2.0"
+    assert scanner.scan("/status", "", "admin/2.0") is None
+
+
+def test_signature_in_both_targets_matches_either():
+    both = RequestScanner({'request': ["nikto"], 'user_agent': ["nikto"]})
+    assert both.scan("/nikto", "", UA) == "Suspicious pattern detected: nikto"
+    assert both.scan("/", "", "Nikto/2.5") == "Vulnerability scanner detected: nikto/2.5"
+
+
+def test_hit_counters(scanner):
+    scanner.scan("/.env", "", UA)
+    scanner.scan("/.ENV", "", UA)
+    scanner.scan("/", "", "sqlmap/1.7")
+    scanner.scan("/api/v1/status", "", UA)
+
+    stats = scanner.get_stats()
+    assert stats['signatures'] == len(DEFAULT_RULES['request']) + len(DEFAULT_RULES['user_agent'])
+    assert stats['scanned'] == 4
+    assert stats['flagged'] == 3
+    assert stats['hits'] == {'request:.env': 2, 'user_agent:sqlmap': 1}
+    assert list(stats['hits']) == ['request:.env', 'user_agent:sqlmap']
+
+
+def test_empty_rules_match_nothing():
+    scanner = RequestScanner({'request': [], 'user_agent': []})
+    assert scanner.scan("/.env", "", "sqlmap") is None
+    assert scanner.get_stats()['scanned'] == 1
+
+
+def test_load_rules_from_file(tmp_path, monkeypatch):
+    rules_file = tmp_path / "rules.yaml"
+    rules_file.write_text("request:\n  - \"/secret\"\nuser_agent:\n  - evilbot\n")
+    assert load_rules(rules_file) == {'request': ["/secret"], 'user_agent': ["evilbot"]}
+
+    monkeypatch.setenv("SECURITY_RULES_FILE", str(rules_file))
+    scanner = RequestScanner()
+    assert scanner.scan("/Secret/key", "", UA) == "Suspicious pattern detected: /secret"
+    assert scanner.scan("/.env", "", UA) is None
+
+
+def test_load_rules_falls_back_to_defaults(tmp_path):
+    assert load_rules(tmp_path / "missing.yaml") is DEFAULT_RULES
+
+    invalid = tmp_path / "invalid.yaml"
+    invalid.write_text("request: [unterminated\n")
+    assert load_rules(invalid) is DEFAULT_RULES
+
+
+def test_shipped_rules_file_matches_defaults(monkeypatch):
+    monkeypatch.delenv("SECURITY_RULES_FILE", raising=False)
+    assert load_rules() == DEFAULT_RULES
@@ -0,0 +1,86 @@
+"""SnapshotArchive writes, compaction and queries"""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.services.snapshot_archive import SnapshotArchive, fcntl, hour_lock
+
+HOUR = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+EPOCH = HOUR.timestamp()
+
+
+def aircraft(hex_code, lat=32.4):
+    return {'hex': hex_code, 'flight': "N1", 'lat': lat, 'lon': -95.3, 'alt_baro': 1500, 'seen': 1.0}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return SnapshotArchive({'enabled': True, 'path': str(tmp_path), 'flush_interval': 60})
+
+
+def hexes(table):
+    return table.column('hex').to_pylist()
+
+
+def test_query_by_hex_matches_written_and_buffered_rows(archive):
+    # Written part file, then rows still in the buffer
+    due = archive.append("etex", [aircraft("A1B2C3"), aircraft("a00001")], set(), epoch=EPOCH)
+    due += archive.append("etex", [aircraft("a1b2c3")], set(), epoch=EPOCH + 60)
+    archive.write_buffers(due)
+    archive.append("etex", [aircraft("A1B2C3")], set(), epoch=EPOCH + 90)
+
+    table = archive.query("etex", HOUR, HOUR + timedelta(hours=1), hex_code="A1B2C3")
+    assert hexes(table) == ["a1b2c3", "a1b2c3", "a1b2c3"]
+    assert hexes(archive.query("etex", HOUR, HOUR + timedelta(hours=1), hex_code="a00001")) == ["a00001"]
+
+
+def test_compacted_hour_is_queryable(archive):
+    archive.write_buffers(archive.append("etex", [aircraft("a00001")], {"a00001"}, epoch=EPOCH + 60)
+                          + archive.append("etex", [aircraft("a00002")], set(), epoch=EPOCH + 120))
+    # First cycle of the next hour closes and compacts this one
+    archive.write_buffers(archive.append("etex", [aircraft("a00003")], set(), epoch=EPOCH + 3600))
+
+    hour_dir = archive._hour_dir("etex", HOUR)
+    assert [path.name for path in hour_dir.glob("*.parquet")] == ["data.parquet"]
+    table = archive.query("etex", HOUR, HOUR + timedelta(hours=1), bbox=(32, -96, 33, -95))
+    assert hexes(table) == ["a00001", "a00002"]
+    assert table.column('helicopter').to_pylist() == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_aquery_reads_a_copy_of_the_buffer(archive, monkeypatch):
+    archive.append("etex", [aircraft("a00001")], set(), epoch=EPOCH)
+    buffer = archive._buffers["etex"]
+    original_query = archive._query
+
+    def query_after_append(*args):
+        # The event loop appending while the thread reads must not change the result
+        buffer.columns['hex'].append("a00002")
+        return original_query(*args)
+
+    monkeypatch.setattr(archive, "_query", query_after_append)
+    table = await archive.aquery("etex", HOUR, HOUR + timedelta(hours=1))
+    assert hexes(table) == ["a00001"]
+
+
+@pytest.mark.skipif(fcntl is None, reason="flock is POSIX-only")
+def test_compaction_waits_for_another_holder_of_the_hour_lock(archive):
+    archive.write_buffers(archive.append("etex", [aircraft("a00001")], set(), epoch=EPOCH + 60)
+                          + archive.append("etex", [aircraft("a00002")], set(), epoch=EPOCH + 120))
+    hour_dir = archive._hour_dir("etex", HOUR)
+    # Same archive path opened separately, as scripts/compact_archive.py does
+    script = SnapshotArchive({'enabled': True, 'path': str(archive.path)})
+
+    with hour_lock(hour_dir):
+        compaction = threading.Thread(target=script.compact)
+        compaction.start()
+        compaction.join(0.2)
+        assert compaction.is_alive()
+        assert len(list(hour_dir.glob("part-*.parquet"))) == 1
+
+    compaction.join(5)
+    assert [path.name for path in hour_dir.glob("*.parquet")] == ["data.parquet"]
+    assert hexes(archive.query("etex", HOUR, HOUR + timedelta(hours=1))) == ["a00001", "a00002"]
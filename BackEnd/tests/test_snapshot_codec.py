@@ -0,0 +1,93 @@
+"""Snapshot codec round trips and version byte detection"""
+import gzip
+import json
+
+import pytest
+
+from src.services import snapshot_codec
+from src.services.response_cache import CachedPayload
+from src.services.snapshot_codec import (CODECS, JSON_CODEC, VERSION_COLUMNAR_JSON_ZLIB, VERSION_COLUMNAR_MSGPACK,
+                                         VERSION_COLUMNAR_MSGPACK_ZSTD, decode_snapshot, get_codec)
+
+SNAPSHOT = {
+    'timestamp': "2024-01-01T00:00:00",
+    'aircraft_count': 3,
+    'aircraft': [
+        {'hex': "a00001", 'flight': "N1", 'alt_baro': 1500, 'lat': 32.4, 'on_ground': False},
+        {'hex': "a00002", 'flight': "", 'alt_baro': None, 'lat': 32.5, 'on_ground': True},
+        # Records may carry keys the first one lacks
+        {'hex': "a00003", 'flight': "N3", 'alt_baro': 900, 'lat': 32.6, 'on_ground': False, 'squawk': "1200"},
+    ],
+    'location': {'name': "Test", 'lat': 32.35, 'lon': -95.3},
+    'region': "test"
+}
+
+LIBRARIES = {
+    "json-zlib": (),
+    "msgpack": ("msgpack",),
+    "msgpack-zstd": ("msgpack", "zstandard"),
+}
+
+
+def expected(snapshot):
+    columns = {key for record in snapshot['aircraft'] for key in record}
+    return {**snapshot, 'aircraft': [{key: record.get(key) for key in columns} for record in snapshot['aircraft']]}
+
+
+@pytest.mark.parametrize("version", sorted(CODECS), ids=lambda version: CODECS[version].name)
+def test_binary_codec_round_trip(version):
+    codec = CODECS[version]
+    for library in LIBRARIES[codec.name]:
+        pytest.importorskip(library)
+
+    blob = codec.encode(SNAPSHOT)
+    assert blob[0] == version
+    assert not blob.startswith(b'{')
+    assert codec.decode(blob) == expected(SNAPSHOT)
+    assert decode_snapshot(blob) == expected(SNAPSHOT)
+
+
+def test_version_bytes_are_distinct_and_stable():
+    assert {version: codec.name for version, codec in CODECS.items()} == {
+        VERSION_COLUMNAR_JSON_ZLIB: "json-zlib",
+        VERSION_COLUMNAR_MSGPACK: "msgpack",
+        VERSION_COLUMNAR_MSGPACK_ZSTD: "msgpack-zstd",
+    }
+    assert (VERSION_COLUMNAR_JSON_ZLIB, VERSION_COLUMNAR_MSGPACK, VERSION_COLUMNAR_MSGPACK_ZSTD) == (1, 2, 3)
+
+
+def test_plain_json_round_trip():
+    blob = JSON_CODEC.encode(SNAPSHOT)
+    assert json.loads(blob) == SNAPSHOT
+    assert decode_snapshot(blob) == SNAPSHOT
+    assert decode_snapshot(blob.decode('utf-8')) == SNAPSHOT
+
+
+def test_empty_snapshot_round_trip():
+    empty = {**SNAPSHOT, 'aircraft_count': 0, 'aircraft': []}
+    for name in ("json", "json-zlib", "msgpack", "msgpack-zstd"):
+        assert decode_snapshot(get_codec(name).encode(empty)) == empty
+
+
+def test_unknown_version_byte_is_rejected():
+    with pytest.raises(ValueError):
+        decode_snapshot(b'\x7f' + b'payload')
+
+
+def test_unknown_codec_name_uses_json():
+    assert get_codec("bson") is JSON_CODEC
+
+
+def test_missing_libraries_fall_back_to_json_zlib(monkeypatch):
+    monkeypatch.setitem(snapshot_codec._REQUIREMENTS, "msgpack-zstd", False)
+    assert get_codec("msgpack-zstd").name == "json-zlib"
+
+
+def test_cached_payload_compressed_variants_round_trip():
+    body = json.dumps(SNAPSHOT).encode('utf-8')
+    payload = CachedPayload.build(SNAPSHOT['timestamp'], body)
+    assert gzip.decompress(payload.gzip) == body
+
+    brotli = pytest.importorskip("brotli")
+    assert brotli.decompress(payload.br) == body
+    assert payload.encoded("gzip, br") == (payload.br, 'br')